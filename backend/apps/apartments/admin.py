@@ -1,5 +1,13 @@
 from django.contrib import admin
-from .models import Apartment
+from . import images
+from .models import Apartment, ApartmentImage
+
+
+class ApartmentImageInline(admin.TabularInline):
+    model = ApartmentImage
+    extra = 0
+    fields = ("original", "position", "status", "width", "height")
+    readonly_fields = ("status", "width", "height")
 
 
 @admin.register(Apartment)
@@ -15,7 +23,24 @@ class ApartmentAdmin(admin.ModelAdmin):
     )
     list_filter = ("availability", "number_of_rooms", "price")
     search_fields = ("name", "description")
-    prepopulated_fields = {"slug": ("name",)}
     date_hierarchy = "created_at"
     ordering = ("-created_at",)
-    readonly_fields = ("created_at", "updated_at")
+    readonly_fields = ("slug", "created_at", "updated_at")
+    inlines = [ApartmentImageInline]
+
+    def save_formset(self, request, form, formset, change):
+        """
+        Saves the inline images and queues the thumbnails of the uploaded ones,
+        like the `images` action of the API does.
+        """
+        if formset.model is not ApartmentImage:
+            return super().save_formset(request, form, formset, change)
+        for image_form in formset.forms:
+            if "original" in image_form.changed_data:
+                image_form.instance.status = ApartmentImage.Status.PENDING
+        super().save_formset(request, form, formset, change)
+        for image in formset.new_objects:
+            images.schedule_thumbnails(image)
+        for image, changed in formset.changed_objects:
+            if "original" in changed:
+                images.schedule_thumbnails(image)
@@ -0,0 +1,15 @@
+from django.urls import path
+
+from apps.apartments.api.async_views import (
+    AsyncApartmentDetailView,
+    AsyncApartmentListView,
+)
+
+urlpatterns = [
+    path("", AsyncApartmentListView.as_view(), name="async-apartments-list"),
+    path(
+        "<str:slug>/",
+        AsyncApartmentDetailView.as_view(),
+        name="async-apartments-detail",
+    ),
+]
@@ -0,0 +1,190 @@
+from django.db import transaction
+from django.http import Http404, HttpResponse
+from django.views import View
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.views import exception_handler
+
+from apps.apartments import cache as apartment_cache
+from apps.apartments import conditional
+from apps.apartments import facets as apartment_facets
+from apps.apartments import geo
+from apps.apartments import images as apartment_images
+from apps.apartments import warming as apartment_warming
+from apps.apartments.models import Apartment
+from apps.apartments.api.fieldsets import Fieldset
+from apps.apartments.api.views import ApartmentViewSet, row_serializer
+from config import db_router
+from config.instrumentation_middleware import measure
+
+
+class AsyncApartmentView(View):
+    """
+    Base class of the async, read-only apartment endpoints.
+
+    The endpoints reuse the filter backends, paginators, renderer and cache
+    keys of `ApartmentViewSet`, so they accept the same query parameters and
+    return the same responses, but they await the ORM and the cache instead of
+    blocking a worker. They are meant to be served by the ASGI application
+    (`config.asgi`); under WSGI Django runs them in a per-request event loop.
+
+    Filter backends without an `afilter_queryset` method must not query the
+    database, since they are called from the event loop.
+    """
+
+    viewset_class = ApartmentViewSet
+    http_method_names = ["get", "head", "options"]
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Django cannot wrap async views in ATOMIC_REQUESTS transactions, and
+        # these views only read.
+        return transaction.non_atomic_requests(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            with db_router.replica_reads(db_router.read_database(request)):
+                return await super().dispatch(request, *args, **kwargs)
+        except (APIException, Http404) as exc:
+            response = exception_handler(exc, {"view": self, "request": request})
+            return self.render(response.data, response.status_code, response.headers)
+
+    def get_viewset(self, request, action):
+        """
+        Returns an `ApartmentViewSet` set up for `request`, used for its
+        queryset, filters and paginator.
+        """
+        viewset = self.viewset_class(
+            action=action, args=self.args, kwargs=self.kwargs, format_kwarg=None
+        )
+        viewset.request = Request(request)
+        viewset.headers = {}
+        return viewset
+
+    async def filter_queryset(self, viewset, queryset):
+        for backend_class in viewset.filter_backends:
+            backend = backend_class()
+            if hasattr(backend, "afilter_queryset"):
+                queryset = await backend.afilter_queryset(
+                    viewset.request, queryset, viewset
+                )
+            else:
+                queryset = backend.filter_queryset(viewset.request, queryset, viewset)
+        return queryset
+
+    def render(self, data, status=200, headers=None):
+        renderer = self.viewset_class().get_renderers()[0]
+        response = HttpResponse(
+            renderer.render(data), status=status, content_type=renderer.media_type
+        )
+        for name, value in (headers or {}).items():
+            if name.lower() != "content-type":
+                response[name] = value
+        return response
+
+
+class AsyncApartmentListView(AsyncApartmentView):
+    """
+    Async equivalent of `ApartmentViewSet.list`.
+    """
+
+    async def get(self, request):
+        viewset = self.get_viewset(request, "list")
+        facets = viewset.get_facets(viewset.request)
+        fieldset = Fieldset.from_request(viewset.request)
+        await apartment_warming.arecord_access(viewset.request, "list")
+        key = await apartment_cache.alist_key(viewset.request)
+        modified_at = await apartment_cache.aget_collection_modified()
+        validators = conditional.list_validators(viewset.request, key, modified_at)
+        not_modified = conditional.evaluate(viewset.request, *validators)
+        if not_modified is not None:
+            return not_modified
+        with measure("cache"):
+            data = await apartment_cache.aget_data(key, "list")
+        if data is None:
+
+            async def compute():
+                with db_router.fresh_reads(modified_at):
+                    return await self.get_data(viewset, facets, fieldset)
+
+            data = await apartment_cache.asingle_flight(key, compute)
+        return conditional.with_validators(self.render(data), *validators)
+
+    async def get_data(self, viewset, facets, fieldset):
+        queryset = await self.filter_queryset(viewset, viewset.get_queryset())
+        rows = fieldset.annotate(queryset).values(
+            *viewset.get_list_columns(fieldset, queryset)
+        )
+        paginator = viewset.paginator
+        page = None
+        if paginator is not None:
+            page = await paginator.apaginate_queryset(
+                rows, viewset.request, view=viewset
+            )
+        if page is None:
+            rows = [row async for row in rows]
+        with measure("serializer"):
+            data = fieldset.serialize_many(rows if page is None else page)
+            if geo.has_distance(queryset):
+                geo.add_distances(data, rows if page is None else page)
+        if fieldset.images:
+            await apartment_images.aattach_images(viewset.request, data)
+        fieldset.finalize(data)
+        if page is not None:
+            data = paginator.get_paginated_response(data).data
+        if facets:
+            if page is None:
+                data = {"results": data}
+            data["facets"] = await apartment_facets.acompute_facets(queryset, facets)
+        return data
+
+
+class AsyncApartmentDetailView(AsyncApartmentView):
+    """
+    Async equivalent of `ApartmentViewSet.retrieve`.
+    """
+
+    async def get(self, request, slug):
+        viewset = self.get_viewset(request, "retrieve")
+        await apartment_warming.arecord_access(viewset.request, "detail")
+        key = await apartment_cache.adetail_key(viewset.request, slug)
+        with measure("cache"):
+            data = await apartment_cache.aget_data(key, "detail")
+        if data is not None:
+            updated_at = data["updated_at"]
+        else:
+            updated_at = (
+                await Apartment.objects.filter(slug=slug)
+                .values_list("updated_at", flat=True)
+                .afirst()
+            )
+        if updated_at is not None:
+            not_modified = conditional.evaluate(
+                viewset.request,
+                *conditional.detail_validators(viewset.request, updated_at),
+            )
+            if not_modified is not None:
+                return not_modified
+        if data is None:
+
+            async def compute():
+                modified_at = await apartment_cache.aget_collection_modified()
+                with db_router.fresh_reads(modified_at):
+                    return await self.get_data(viewset, slug)
+
+            data = await apartment_cache.asingle_flight(key, compute)
+        return conditional.with_validators(
+            self.render(data),
+            *conditional.detail_validators(viewset.request, data["updated_at"]),
+        )
+
+    async def get_data(self, viewset, slug):
+        queryset = await self.filter_queryset(viewset, viewset.get_queryset())
+        try:
+            row = await queryset.values(*row_serializer.columns).aget(slug=slug)
+        except Apartment.DoesNotExist:
+            raise Http404("No Apartment matches the given query.")
+        with measure("serializer"):
+            data = row_serializer.to_representation(row)
+        await apartment_images.aattach_images(viewset.request, [data])
+        return data
@@ -0,0 +1,210 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from apps.apartments import cache as apartment_cache
+from apps.apartments import outbox, stats
+from apps.apartments.api.serializers import ApartmentSerializer
+from apps.apartments.models import Apartment, ApartmentChange
+from apps.apartments.slugs import allocate_slugs
+
+# The owner of bulk rows is always the requesting user, so the per-row query that
+# validates the foreign key is skipped. Slugs are unique by construction.
+CLEAN_EXCLUDE = ["owner"]
+SUCCESS_STATUSES = ("created", "updated", "deleted")
+
+
+def _error(index, errors, slug=None):
+    result = {"index": index, "status": "error", "errors": errors}
+    if slug is not None:
+        result["slug"] = slug
+    return result
+
+
+def _model_errors(instance, exclude=()):
+    """
+    Runs the model validation of `Apartment.save` without per-row queries.
+    """
+    try:
+        instance.full_clean(
+            exclude=[*CLEAN_EXCLUDE, *exclude],
+            validate_unique=False,
+            validate_constraints=False,
+        )
+    except ValidationError as e:
+        return e.message_dict
+    return None
+
+
+def _on_commit_invalidate(slugs):
+    transaction.on_commit(lambda: apartment_cache.invalidate_apartments(slugs))
+
+
+def _permitted(request, view, instance):
+    return all(
+        permission.has_object_permission(request, view, instance)
+        for permission in view.get_permissions()
+    )
+
+
+def _row_slug(row):
+    if isinstance(row, str):
+        return row
+    if isinstance(row, dict) and isinstance(row.get("slug"), str):
+        return row["slug"]
+    return None
+
+
+def bulk_create(request, rows):
+    """
+    Validates `rows` together and inserts the valid ones with `bulk_create`.
+
+    Returns one result per row, in input order.
+    """
+    results = [None] * len(rows)
+    pending = []
+    context = {"request": request}
+    for index, row in enumerate(rows):
+        serializer = ApartmentSerializer(data=row, context=context)
+        if not serializer.is_valid():
+            results[index] = _error(index, serializer.errors)
+            continue
+        instance = Apartment(owner=request.user, **serializer.validated_data)
+        errors = _model_errors(instance, exclude=["slug"])
+        if errors:
+            results[index] = _error(index, errors)
+            continue
+        instance.update_geo_cell()
+        pending.append((index, instance))
+
+    slugs = allocate_slugs(instance.name for _, instance in pending)
+    for (_, instance), slug in zip(pending, slugs):
+        instance.slug = slug
+
+    with transaction.atomic():
+        Apartment.objects.bulk_create(
+            [instance for _, instance in pending],
+            batch_size=settings.APARTMENT_BULK_CHUNK_SIZE,
+        )
+        _on_commit_invalidate([])
+        # bulk_create sends no post_save signals.
+        stats.schedule_refresh(stats.group_of(instance) for _, instance in pending)
+        outbox.record(
+            [instance for _, instance in pending], ApartmentChange.Action.CREATED
+        )
+    for index, instance in pending:
+        results[index] = {
+            "index": index,
+            "status": "created",
+            "id": instance.pk,
+            "slug": instance.slug,
+        }
+    return results
+
+
+def bulk_update(request, view, rows):
+    """
+    Applies partial updates keyed by `slug` and writes them with `bulk_update`.
+
+    Rows the requesting user may not change (see `IsOwnerOrReadOnly`) are reported
+    as forbidden. Returns one result per row, in input order.
+    """
+    results = [None] * len(rows)
+    slugs = [_row_slug(row) if isinstance(row, dict) else None for row in rows]
+    existing = Apartment.objects.in_bulk(
+        [slug for slug in slugs if slug], field_name="slug"
+    )
+    context = {"request": request}
+    now = timezone.now()
+    seen = set()
+    fields = {"updated_at"}
+    changed = []
+    for index, (row, slug) in enumerate(zip(rows, slugs)):
+        if slug is None:
+            results[index] = _error(index, {"slug": ["This field is required."]})
+            continue
+        if slug in seen:
+            results[index] = _error(
+                index, {"slug": ["Duplicate slug in this batch."]}, slug=slug
+            )
+            continue
+        seen.add(slug)
+        instance = existing.get(slug)
+        if instance is None:
+            results[index] = {"index": index, "status": "not_found", "slug": slug}
+            continue
+        if not _permitted(request, view, instance):
+            results[index] = {"index": index, "status": "forbidden", "slug": slug}
+            continue
+        serializer = ApartmentSerializer(
+            instance, data=row, partial=True, context=context
+        )
+        if not serializer.is_valid():
+            results[index] = _error(index, serializer.errors, slug=slug)
+            continue
+        for field, value in serializer.validated_data.items():
+            setattr(instance, field, value)
+        errors = _model_errors(instance)
+        if errors:
+            results[index] = _error(index, errors, slug=slug)
+            continue
+        instance.updated_at = now
+        instance.update_geo_cell()
+        fields.update(serializer.validated_data)
+        changed.append((index, instance))
+
+    if {"latitude", "longitude"} & fields:
+        fields.add("geo_cell")
+    with transaction.atomic():
+        Apartment.objects.bulk_update(
+            [instance for _, instance in changed],
+            sorted(fields),
+            batch_size=settings.APARTMENT_BULK_CHUNK_SIZE,
+        )
+        _on_commit_invalidate([instance.slug for _, instance in changed])
+        stats.schedule_refresh(
+            group
+            for _, instance in changed
+            for group in (instance._stats_group, stats.group_of(instance))
+        )
+        outbox.record(
+            [instance for _, instance in changed], ApartmentChange.Action.UPDATED
+        )
+    for index, instance in changed:
+        results[index] = {
+            "index": index,
+            "status": "updated",
+            "id": instance.pk,
+            "slug": instance.slug,
+        }
+    return results
+
+
+def bulk_delete(request, view, rows):
+    """
+    Deletes the apartments named by `rows` (slugs or objects with a `slug`).
+
+    Returns one result per row, in input order.
+    """
+    results = [None] * len(rows)
+    slugs = [_row_slug(row) for row in rows]
+    existing = Apartment.objects.in_bulk(
+        [slug for slug in slugs if slug], field_name="slug"
+    )
+    deletable = {}
+    for index, slug in enumerate(slugs):
+        if slug is None:
+            results[index] = _error(index, {"slug": ["This field is required."]})
+        elif slug not in existing:
+            results[index] = {"index": index, "status": "not_found", "slug": slug}
+        elif not _permitted(request, view, existing[slug]):
+            results[index] = {"index": index, "status": "forbidden", "slug": slug}
+        else:
+            deletable[slug] = existing[slug].pk
+            results[index] = {"index": index, "status": "deleted", "slug": slug}
+
+    # The deletion sends post_delete signals, which write the outbox changes.
+    with transaction.atomic():
+        Apartment.objects.filter(pk__in=deletable.values()).delete()
+    return results
@@ -0,0 +1,150 @@
+from django.conf import settings
+from django.db.models import Case, TextField, Value, When
+from django.db.models.functions import Concat, Left, Length, RTrim
+from django.db.models.lookups import GreaterThan
+from rest_framework.exceptions import ValidationError
+
+from apps.apartments.api.serializers import ApartmentRowSerializer, ApartmentSerializer
+
+# Fields of an apartment list item, in response order.
+FIELDS = (*ApartmentSerializer.Meta.fields, "images")
+# Named views of the list: the fields each returns by default.
+VIEWS = {
+    "full": FIELDS,
+    "compact": (
+        "id",
+        "name",
+        "slug",
+        "description",
+        "price",
+        "number_of_rooms",
+        "square",
+        "availability",
+        "latitude",
+        "longitude",
+        "images",
+    ),
+}
+DEFAULT_VIEW = "full"
+# Column holding the truncated description of the compact view.
+EXCERPT = "description_excerpt"
+ELLIPSIS = "…"
+
+
+class Fieldset:
+    """
+    The fields of the apartment list items a request asked for.
+
+    `?view=compact` selects the fields a listing card shows, with the
+    description truncated to `APARTMENT_COMPACT_DESCRIPTION_LENGTH` characters
+    by the database; `?fields=` replaces the fields of the view and `?omit=`
+    removes some. Only the columns of the selected fields are read, so leaving
+    out `owner_email` drops the join on users and leaving out `images` the
+    images query.
+    """
+
+    def __init__(self, fields, view=DEFAULT_VIEW):
+        self.fields = tuple(name for name in FIELDS if name in fields)
+        self.view = view
+
+    @classmethod
+    def from_request(cls, request):
+        """
+        Returns the fieldset requested with `?view=`, `?fields=` and `?omit=`.
+
+        Raises:
+            ValidationError: If the view or a field name is unknown.
+        """
+        params = request.query_params
+        view = params.get("view") or DEFAULT_VIEW
+        if view not in VIEWS:
+            raise ValidationError({"view": f"Must be one of {', '.join(VIEWS)}."})
+        fields = _names(params, "fields") or set(VIEWS[view])
+        return cls(fields.difference(_names(params, "omit")), view)
+
+    @property
+    def images(self):
+        return "images" in self.fields
+
+    @property
+    def truncated(self):
+        return self.view == "compact" and "description" in self.fields
+
+    @property
+    def row_serializer(self):
+        """
+        Returns the row serializer of the selected fields (plus `id`, which
+        images are attached by).
+        """
+        fields = [name for name in self.fields if name != "images"]
+        if self.images and "id" not in fields:
+            fields.insert(0, "id")
+        return _row_serializer(tuple(fields), self.truncated)
+
+    def get_columns(self, *required):
+        """
+        Returns the `values()` columns to read: those of the selected fields,
+        then the `required` ones (e.g. the ordering of cursor pages).
+        """
+        return list(dict.fromkeys([*self.row_serializer.columns, *required]))
+
+    def annotate(self, queryset):
+        """
+        Annotates `queryset` with the columns the selected fields read.
+        """
+        if not self.truncated:
+            return queryset
+        length = settings.APARTMENT_COMPACT_DESCRIPTION_LENGTH
+        return queryset.annotate(
+            **{
+                EXCERPT: Case(
+                    When(
+                        GreaterThan(Length("description"), length),
+                        then=Concat(
+                            RTrim(Left("description", length - len(ELLIPSIS))),
+                            Value(ELLIPSIS),
+                        ),
+                    ),
+                    default="description",
+                    output_field=TextField(),
+                )
+            }
+        )
+
+    def serialize_many(self, rows):
+        """
+        Serializes list rows into the selected fields, except `images`.
+        """
+        return self.row_serializer.serialize_many(rows)
+
+    def finalize(self, data):
+        """
+        Drops the `id` of the items once images are attached, unless selected.
+        """
+        if self.images and "id" not in self.fields:
+            for item in data:
+                del item["id"]
+        return data
+
+
+def _names(params, name):
+    names = {
+        value.strip() for value in params.get(name, "").split(",") if value.strip()
+    }
+    unknown = names.difference(FIELDS)
+    if unknown:
+        raise ValidationError({name: f"Must be a subset of {', '.join(FIELDS)}."})
+    return names
+
+
+_row_serializers = {}
+
+
+def _row_serializer(fields, truncated):
+    key = (fields, truncated)
+    serializer = _row_serializers.get(key)
+    if serializer is None:
+        serializer = _row_serializers[key] = ApartmentRowSerializer(
+            fields, {"description": EXCERPT} if truncated else None
+        )
+    return serializer
@@ -0,0 +1,137 @@
+import django_filters
+from django import forms
+from django.conf import settings
+from rest_framework import filters
+
+from apps.apartments import geo, search
+from apps.apartments.models import Apartment
+
+# Parameters of the radius search, which are only valid together.
+GEO_NEAR_PARAMS = ("lat", "lon", "radius")
+
+
+class NumberCSVFilter(django_filters.BaseCSVFilter, django_filters.NumberFilter):
+    """
+    Filter taking a comma-separated list of numbers.
+    """
+
+
+class ApartmentFilterForm(forms.Form):
+    """
+    Validates the geo parameters of `ApartmentFilter` together.
+    """
+
+    def clean(self):
+        cleaned_data = super().clean()
+        near = [cleaned_data.get(name) for name in GEO_NEAR_PARAMS]
+        if any(value is not None for value in near):
+            if any(value is None for value in near):
+                raise forms.ValidationError(
+                    "lat, lon and radius must be given together."
+                )
+            radius = cleaned_data["radius"]
+            if not 0 < radius <= settings.APARTMENT_GEO_MAX_RADIUS_KM:
+                self.add_error(
+                    "radius",
+                    "Must be greater than 0 and at most "
+                    f"{settings.APARTMENT_GEO_MAX_RADIUS_KM} km.",
+                )
+
+        bbox = cleaned_data.get("bbox")
+        if bbox is not None:
+            if len(bbox) != 4:
+                self.add_error("bbox", "Expected south,west,north,east.")
+            else:
+                south, west, north, east = bbox
+                if not (-90 <= south <= north <= 90):
+                    self.add_error(
+                        "bbox", "Latitudes must satisfy -90 <= south <= north <= 90."
+                    )
+                elif not (-180 <= west <= 180 and -180 <= east <= 180):
+                    self.add_error("bbox", "Longitudes must be between -180 and 180.")
+        return cleaned_data
+
+
+class ApartmentFilter(django_filters.FilterSet):
+    """
+    Filters apartments by availability, number of rooms, price range and
+    location.
+
+    `lat`, `lon` and `radius` (km) keep apartments within `radius` of a point,
+    nearest first, with their distance annotated (see `geo.filter_near`);
+    `bbox=south,west,north,east` keeps apartments inside a bounding box.
+
+    Shared by `ApartmentViewSet` and the `export_apartments` command.
+    """
+
+    price_min = django_filters.NumberFilter(field_name="price", lookup_expr="gte")
+    price_max = django_filters.NumberFilter(field_name="price", lookup_expr="lte")
+    lat = django_filters.NumberFilter(
+        method="filter_location", min_value=-90, max_value=90
+    )
+    lon = django_filters.NumberFilter(
+        method="filter_location", min_value=-180, max_value=180
+    )
+    radius = django_filters.NumberFilter(method="filter_location")
+    bbox = NumberCSVFilter(method="filter_location")
+
+    class Meta:
+        model = Apartment
+        form = ApartmentFilterForm
+        fields = ["availability", "number_of_rooms", "price_min", "price_max"]
+
+    def filter_location(self, queryset, name, value):
+        # The geo parameters depend on each other and are applied together in
+        # `filter_queryset`.
+        return queryset
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        data = self.form.cleaned_data
+        if data.get("bbox"):
+            queryset = geo.filter_box(queryset, *data["bbox"])
+        if data.get("lat") is not None:
+            queryset = geo.filter_near(
+                queryset, data["lat"], data["lon"], data["radius"]
+            )
+        return queryset
+
+
+class ApartmentSearchFilter(filters.SearchFilter):
+    """
+    Full-text search over the apartment name and description.
+
+    On PostgreSQL the search runs against the indexed `search_vector` column and
+    results are ordered by relevance; `?fuzzy=true` enables the trigram fallback
+    for queries that match nothing. Other databases use DRF's `icontains` search
+    over the view's `search_fields`.
+    """
+
+    fuzzy_param = "fuzzy"
+
+    def filter_queryset(self, request, queryset, view):
+        term = " ".join(self.get_search_terms(request))
+        if not term:
+            return queryset
+        if not search.is_supported(queryset):
+            return super().filter_queryset(request, queryset, view)
+        return search.search_apartments(queryset, term, fuzzy=self.get_fuzzy(request))
+
+    async def afilter_queryset(self, request, queryset, view):
+        """
+        Async variant of `filter_queryset`, for async views.
+        """
+        term = " ".join(self.get_search_terms(request))
+        if not term:
+            return queryset
+        if not search.is_supported(queryset):
+            return super().filter_queryset(request, queryset, view)
+        return await search.asearch_apartments(
+            queryset, term, fuzzy=self.get_fuzzy(request)
+        )
+
+    def get_fuzzy(self, request):
+        value = request.query_params.get(self.fuzzy_param)
+        if value is None:
+            return settings.APARTMENT_SEARCH_FUZZY
+        return value.lower() in ("1", "true", "yes")
@@ -0,0 +1,242 @@
+import json
+import operator
+from datetime import date, datetime
+from functools import reduce
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from django.core.paginator import InvalidPage
+from rest_framework.pagination import (
+    Cursor,
+    CursorPagination,
+    PageNumberPagination,
+)
+
+from apps.apartments import geo
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination that seeks on the full ordering tuple instead of an offset.
+
+    DRF's `CursorPagination` only seeks on the first ordering field and falls back
+    to OFFSET for ties. Here the cursor stores the value of every ordering field of
+    the last row, and the next page is fetched with
+    `(f1, f2, ...) < (v1, v2, ...)`, so every page costs the same index range scan
+    no matter how deep it is. The last ordering field must be unique.
+    """
+
+    ordering = ("-created_at", "-id")
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Async variant of `paginate_queryset`, for async views.
+        """
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page([row async for row in queryset])
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """
+        Returns the (unevaluated) queryset of the page rows plus one lookahead
+        row, or None if pagination is disabled.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.model = queryset.model
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse, current_position = self.get_cursor_position()
+
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if current_position is not None:
+            queryset = queryset.filter(
+                self.get_seek_filter(current_position, reverse)
+            )
+        return queryset[: self.page_size + 1]
+
+    def get_cursor_position(self):
+        if self.cursor is None:
+            return False, None
+        return self.cursor.reverse, self.cursor.position
+
+    def set_page(self, results):
+        """
+        Sets the current page from the rows fetched by `get_page_queryset`.
+        """
+        reverse, current_position = self.get_cursor_position()
+        self.page = results[: self.page_size]
+        has_following_position = len(results) > len(self.page)
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = current_position is not None
+            self.has_previous = has_following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = current_position is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_seek_filter(self, position, reverse):
+        """
+        Builds the row-value comparison that selects rows after `position`.
+
+        The redundant inclusive bound on the first field lets the database start an
+        index range scan at the cursor instead of filtering from the first row.
+        """
+        conditions = []
+        for index, order in enumerate(self.ordering):
+            field_name = order.lstrip("-")
+            descending = order.startswith("-") != reverse
+            lookup = "lt" if descending else "gt"
+            equal = {
+                self.ordering[i].lstrip("-"): position[i] for i in range(index)
+            }
+            conditions.append(
+                Q(**equal, **{f"{field_name}__{lookup}": position[index]})
+            )
+        first_field = self.ordering[0].lstrip("-")
+        bound = "lte" if self.ordering[0].startswith("-") != reverse else "gte"
+        return Q(**{f"{first_field}__{bound}": position[0]}) & reduce(
+            operator.or_, conditions
+        )
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        position = (
+            self.cursor.position
+            if self.cursor and self.cursor.reverse and not self.page
+            else self._get_position_from_instance(self.page[-1], self.ordering)
+        )
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        position = (
+            self.cursor.position
+            if self.cursor and not self.cursor.reverse and not self.page
+            else self._get_position_from_instance(self.page[0], self.ordering)
+        )
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def decode_cursor(self, request):
+        cursor = super().decode_cursor(request)
+        if cursor is None:
+            return None
+        try:
+            values = json.loads(cursor.position)
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError
+            position = tuple(
+                self.decode_position_value(request, order.lstrip("-"), value)
+                for order, value in zip(self.ordering, values)
+            )
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return Cursor(offset=0, reverse=cursor.reverse, position=position)
+
+    def encode_cursor(self, cursor):
+        values = [
+            value.isoformat() if isinstance(value, (date, datetime)) else value
+            for value in cursor.position
+        ]
+        return super().encode_cursor(
+            cursor._replace(position=json.dumps(values, separators=(",", ":")))
+        )
+
+    def decode_position_value(self, request, field_name, value):
+        """
+        Converts a cursor value back to the Python type of its ordering field.
+        """
+        try:
+            field = self.model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            return value
+        return field.to_python(value)
+
+    def get_ordering(self, request, queryset, view):
+        return tuple(self.ordering)
+
+    def _get_position_from_instance(self, instance, ordering):
+        if isinstance(instance, dict):
+            return tuple(instance[order.lstrip("-")] for order in ordering)
+        return tuple(getattr(instance, order.lstrip("-")) for order in ordering)
+
+
+def _reverse_ordering(ordering):
+    return tuple(
+        order[1:] if order.startswith("-") else f"-{order}" for order in ordering
+    )
+
+
+class ApartmentCursorPagination(KeysetPagination):
+    """
+    Keyset pagination for the apartment feed, newest first, or nearest first
+    for geo searches.
+    """
+
+    ordering = ("-created_at", "-id")
+    distance_ordering = (geo.DISTANCE, "id")
+
+    def get_ordering(self, request, queryset, view):
+        if geo.has_distance(queryset):
+            return self.distance_ordering
+        return super().get_ordering(request, queryset, view)
+
+
+class ApartmentPageNumberPagination(PageNumberPagination):
+    """
+    DRF's page-number pagination with an async variant for async views.
+    """
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Async variant of `paginate_queryset`: the count and the page rows are
+        fetched with the async ORM.
+        """
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            )
+            raise NotFound(msg)
+        self.page.object_list = [row async for row in self.page.object_list]
+
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+
+        return list(self.page)
@@ -1,5 +1,18 @@
+import decimal
+from functools import cached_property
+
+from django.conf import settings
+from django.utils import timezone
 from rest_framework import serializers
-from apps.apartments.models import Apartment
+from rest_framework.settings import ISO_8601, api_settings
+
+from apps.apartments import images
+from apps.apartments.models import (
+    Apartment,
+    ApartmentChange,
+    ApartmentImage,
+    ApartmentStats,
+)
 
 
 class ApartmentSerializer(serializers.ModelSerializer):
@@ -19,6 +32,8 @@ class ApartmentSerializer(serializers.ModelSerializer):
             "number_of_rooms",
             "square",
             "availability",
+            "latitude",
+            "longitude",
             "owner_email",
             "created_at",
             "updated_at",
@@ -43,3 +58,245 @@ class ApartmentSerializer(serializers.ModelSerializer):
         """
         validated_data.pop("owner", None)
         return super().update(instance, validated_data)
+
+
+class ApartmentImageSerializer(serializers.ModelSerializer):
+    """
+    Serializer for uploading apartment images and reading their state.
+
+    `image` is the uploaded file. Only its header is read here; decoding and
+    resizing happen in the thumbnail task.
+    """
+
+    image = serializers.FileField(source="original", write_only=True)
+    thumbnails = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ApartmentImage
+        fields = [
+            "id",
+            "image",
+            "position",
+            "status",
+            "width",
+            "height",
+            "thumbnails",
+            "created_at",
+        ]
+        read_only_fields = ("status", "width", "height", "created_at")
+
+    def validate_image(self, value):
+        if value.size > settings.APARTMENT_IMAGE_MAX_SIZE:
+            raise serializers.ValidationError(
+                f"Images must not exceed {settings.APARTMENT_IMAGE_MAX_SIZE} bytes."
+            )
+        try:
+            image_format, width, height = images.inspect_upload(value)
+        except ValueError:
+            raise serializers.ValidationError("Upload a valid image.")
+        if image_format not in images.UPLOAD_FORMATS:
+            raise serializers.ValidationError(
+                f"Supported formats: {', '.join(images.UPLOAD_FORMATS)}."
+            )
+        if width * height > settings.APARTMENT_IMAGE_MAX_PIXELS:
+            raise serializers.ValidationError(
+                f"Images must not exceed {settings.APARTMENT_IMAGE_MAX_PIXELS} pixels."
+            )
+        return value
+
+    def get_thumbnails(self, obj):
+        return images.thumbnail_urls(self.context["request"], obj.thumbnails)
+
+
+class ApartmentStatsSerializer(serializers.ModelSerializer):
+    """
+    Serializer for `ApartmentStats` rows and for the dicts built by
+    `apps.apartments.stats`, whose totals have no group (null fields).
+    """
+
+    class Meta:
+        model = ApartmentStats
+        fields = [
+            "number_of_rooms",
+            "availability",
+            "count",
+            "avg_price",
+            "median_price",
+            "min_price",
+            "max_price",
+            "avg_price_per_m2",
+        ]
+
+
+class ApartmentStatsReportSerializer(serializers.Serializer):
+    """
+    Serializer for the response of the apartment stats endpoint.
+    """
+
+    source = serializers.ChoiceField(choices=["summary", "live"])
+    refreshed_at = serializers.DateTimeField(allow_null=True)
+    total = ApartmentStatsSerializer()
+    groups = ApartmentStatsSerializer(many=True)
+
+
+class ApartmentChangeSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the apartment change feed and its publishers.
+    """
+
+    occurred_at = serializers.DateTimeField(source="created_at")
+
+    class Meta:
+        model = ApartmentChange
+        fields = [
+            "sequence",
+            "action",
+            "apartment_id",
+            "slug",
+            "payload",
+            "occurred_at",
+        ]
+
+
+class ApartmentChangeFeedSerializer(serializers.Serializer):
+    """
+    Serializer for the response of the apartment change feed.
+    """
+
+    results = ApartmentChangeSerializer(many=True)
+    next = serializers.IntegerField()
+    has_more = serializers.BooleanField()
+
+
+class ApartmentRowSerializer:
+    """
+    Read-only serializer for apartment rows fetched with `QuerySet.values()`.
+
+    Produces the same representation as `ApartmentSerializer` for every field
+    in its `Meta.fields`, but skips DRF's per-instance field machinery: a
+    converter specialised for each field is built once from the
+    `ApartmentSerializer` fields and applied to plain dict rows.
+
+    `fields` restricts the output to some of those fields, and
+    `columns_by_field` reads fields from other columns (e.g. annotations).
+    """
+
+    # `values()` column for fields whose source is not a plain model field.
+    columns_by_field = {"owner_email": "owner__email"}
+
+    def __init__(self, fields=None, columns_by_field=None):
+        self._plans = {}
+        self.field_names = fields
+        if columns_by_field:
+            self.columns_by_field = {**self.columns_by_field, **columns_by_field}
+
+    @cached_property
+    def fields(self):
+        fields = ApartmentSerializer().fields
+        if self.field_names is None:
+            return fields
+        return {name: fields[name] for name in self.field_names}
+
+    @property
+    def columns(self):
+        """
+        Returns the `values()` columns needed to serialize a row.
+        """
+        return [self.columns_by_field.get(name, name) for name in self.fields]
+
+    def get_plan(self, tz):
+        """
+        Returns the `(name, column, converter)` triples for output timezone `tz`.
+
+        Plans are built once per timezone, so the active timezone is looked up
+        once per page rather than once per datetime value.
+        """
+        plan = self._plans.get(tz)
+        if plan is None:
+            plan = self._plans[tz] = tuple(
+                (
+                    name,
+                    self.columns_by_field.get(name, name),
+                    self.build_converter(field, tz),
+                )
+                for name, field in self.fields.items()
+            )
+        return plan
+
+    def build_converter(self, field, tz):
+        """
+        Returns a function converting a non-null value like `field` does, or
+        None when the database value is already its representation.
+        """
+        if isinstance(field, serializers.DecimalField):
+            return self._decimal_converter(field)
+        if isinstance(field, serializers.DateTimeField):
+            return self._datetime_converter(field, tz)
+        if isinstance(
+            field,
+            (serializers.IntegerField, serializers.CharField, serializers.BooleanField),
+        ):
+            return None
+        return field.to_representation
+
+    def _decimal_converter(self, field):
+        coerce_to_string = getattr(
+            field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING
+        )
+        if (
+            not coerce_to_string
+            or field.localize
+            or field.normalize_output
+            or field.decimal_places is None
+        ):
+            return field.to_representation
+        exponent = decimal.Decimal(".1") ** field.decimal_places
+        context = decimal.getcontext().copy()
+        if field.max_digits is not None:
+            context.prec = field.max_digits
+        rounding = field.rounding
+
+        def convert(value):
+            if not isinstance(value, decimal.Decimal):
+                value = decimal.Decimal(str(value).strip())
+            return "{:f}".format(
+                value.quantize(exponent, rounding=rounding, context=context)
+            )
+
+        return convert
+
+    def _datetime_converter(self, field, tz):
+        output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+        if (
+            not settings.USE_TZ
+            or output_format is None
+            or output_format.lower() != ISO_8601
+            or hasattr(field, "timezone")
+        ):
+            return field.to_representation
+
+        def convert(value):
+            if value.tzinfo is None:
+                return field.to_representation(value)
+            value = value.astimezone(tz).isoformat()
+            if value.endswith("+00:00"):
+                value = value[:-6] + "Z"
+            return value
+
+        return convert
+
+    def to_representation(self, row, plan=None):
+        if plan is None:
+            plan = self.get_plan(timezone.get_current_timezone())
+        representation = {}
+        for name, column, convert in plan:
+            value = row[column]
+            representation[name] = (
+                value if value is None or convert is None else convert(value)
+            )
+        return representation
+
+    def serialize_many(self, rows):
+        plan = self.get_plan(timezone.get_current_timezone())
+        to_representation = self.to_representation
+        return [to_representation(row, plan) for row in rows]
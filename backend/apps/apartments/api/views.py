@@ -1,40 +1,134 @@
 import logging
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
 
-from rest_framework import viewsets, permissions, filters
-from rest_framework.exceptions import APIException
+from django.conf import settings
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, NotFound, ValidationError
+from rest_framework.parsers import JSONParser, MultiPartParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from django_filters import utils as filter_utils
 from django_filters.rest_framework import DjangoFilterBackend
 
-from apps.apartments.models import Apartment
-from apps.apartments.api.serializers import ApartmentSerializer
+from apps.apartments import cache as apartment_cache
+from apps.apartments import conditional
+from apps.apartments import export as apartment_export
+from apps.apartments import facets as apartment_facets
+from apps.apartments import geo
+from apps.apartments import images as apartment_images
+from apps.apartments import outbox as apartment_outbox
+from apps.apartments import stats as apartment_stats
+from apps.apartments import warming as apartment_warming
+from apps.apartments.models import Apartment, ApartmentStats
+from apps.apartments.api import bulk
+from apps.apartments.api.fieldsets import Fieldset
+from apps.apartments.api.filters import ApartmentFilter, ApartmentSearchFilter
+from apps.apartments.api.pagination import (
+    ApartmentCursorPagination,
+    ApartmentPageNumberPagination,
+)
+from apps.apartments.api.parsers import NDJSONParser
+from apps.apartments.api.renderers import ORJSONRenderer
+from apps.apartments.api.serializers import (
+    ApartmentChangeFeedSerializer,
+    ApartmentImageSerializer,
+    ApartmentRowSerializer,
+    ApartmentSerializer,
+    ApartmentStatsReportSerializer,
+    ApartmentStatsSerializer,
+)
 from apps.apartments.api.permissions import IsOwnerOrReadOnly
+from config import db_router
+from config.instrumentation_middleware import measure
 
 logger = logging.getLogger(__name__)
 
+row_serializer = ApartmentRowSerializer()
 
-@method_decorator(cache_page(60 * 5), name="list")
-@method_decorator(cache_page(60 * 5), name="retrieve")
-class ApartmentViewSet(viewsets.ModelViewSet):
+
+class ChangesExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = (
+        "Changes after this position were pruned; resynchronize from an export."
+    )
+    default_code = "changes_expired"
+
+
+class ApartmentViewSet(db_router.ReplicaReadsMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing apartments.
+
+    List and detail responses are cached under version counters that are bumped
+    whenever an apartment is saved or deleted, so they can be kept for hours
+    without serving stale data after a write.
+
+    The list supports two pagination modes: the default page-number pagination,
+    and keyset pagination on `(created_at, id)` selected with `?pagination=cursor`
+    (or by passing a `cursor`), whose cost does not grow with the page depth.
+
+    List and detail responses include the ready `images` of each apartment
+    with their thumbnail URLs, fetched in one query per page.
+
+    List pages are read with `values()` and serialized by `ApartmentRowSerializer`,
+    which yields the same output as `ApartmentSerializer` at a fraction of the CPU
+    cost, and rendered with orjson when it is installed.
+
+    `?lat=&lon=&radius=` (km) lists the apartments around a point nearest first,
+    with their `distance_km`, and `?bbox=south,west,north,east` those inside a
+    box; both look candidates up through the `geo_cell` index. Cursor pages of
+    a radius search seek on `(distance, id)`.
+
+    `?facets=number_of_rooms,availability,price` adds counts per value of those
+    fields (price in buckets) over the filtered list to the response.
+
+    `?fields=` and `?omit=` trim the fields of list items, and `?view=compact`
+    returns the fields of a listing card with a truncated description (see
+    `Fieldset`); only the columns of the selected fields are read.
+
+    Creates, updates and deletes are also written to the `ApartmentChange`
+    outbox in the same transaction; `changes/?since=` serves them as an
+    incremental feed.
+
+    When a read replica is configured, `list` and `retrieve` read from it,
+    except for clients that just wrote; for a few seconds after a change to the
+    apartments, the responses they cache are computed from the primary.
+
+    Async equivalents of `list` and `retrieve` live in `async_views`.
     """
 
     serializer_class = ApartmentSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsOwnerOrReadOnly]
     lookup_field = "slug"
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
-    filterset_fields = ["availability", "number_of_rooms"]
+    filter_backends = [DjangoFilterBackend, ApartmentSearchFilter]
+    filterset_class = ApartmentFilter
     search_fields = ["name", "description"]
+    pagination_class = ApartmentPageNumberPagination
+    cursor_pagination_class = ApartmentCursorPagination
+
+    @property
+    def paginator(self):
+        """
+        Returns the keyset paginator when the client asks for cursor pagination.
+        """
+        if not hasattr(self, "_paginator"):
+            params = self.request.query_params if self.request is not None else {}
+            if params.get("pagination") == "cursor" or "cursor" in params:
+                self._paginator = self.cursor_pagination_class()
+            else:
+                return super().paginator
+        return self._paginator
 
     def get_queryset(self):
         """
-        Returns a queryset of apartments with optional filtering by price.
+        Returns a queryset of apartments with the owner's email preloaded.
 
-        Supports filtering by minimum and maximum price through the query parameters
-        `price_min` and `price_max` respectively.
+        Filtering by availability, number of rooms and price range (`price_min`,
+        `price_max`) is done by `ApartmentFilter`.
         """
-        queryset = Apartment.objects.select_related("owner").only(
+        return Apartment.objects.select_related("owner").only(
             "id",
             "name",
             "slug",
@@ -43,17 +137,186 @@ class ApartmentViewSet(viewsets.ModelViewSet):
             "number_of_rooms",
             "square",
             "availability",
+            "latitude",
+            "longitude",
             "owner__email",
             "created_at",
             "updated_at",
         )
-        price_min = self.request.query_params.get("price_min")
-        price_max = self.request.query_params.get("price_max")
-        if price_min:
-            queryset = queryset.filter(price__gte=price_min)
-        if price_max:
-            queryset = queryset.filter(price__lte=price_max)
-        return queryset
+
+    def get_renderers(self):
+        """
+        Swaps DRF's JSON renderer for the orjson-backed one when enabled.
+        """
+        renderers = super().get_renderers()
+        if not settings.APARTMENT_ORJSON_RENDERER:
+            return renderers
+        return [
+            ORJSONRenderer() if type(renderer) is JSONRenderer else renderer
+            for renderer in renderers
+        ]
+
+    def get_facets(self, request):
+        """
+        Returns the facets requested with `?facets=`, in response order.
+        """
+        names = {
+            name.strip()
+            for name in request.query_params.get("facets", "").split(",")
+            if name.strip()
+        }
+        unknown = names.difference(apartment_facets.FACETS)
+        if unknown:
+            raise ValidationError(
+                {"facets": f"Must be a subset of {', '.join(apartment_facets.FACETS)}."}
+            )
+        return [name for name in apartment_facets.FACETS if name in names]
+
+    def get_list_columns(self, fieldset, queryset):
+        """
+        Returns the `values()` columns of the list rows: those of `fieldset`,
+        plus what cursor pages are ordered by.
+        """
+        required = [
+            order.lstrip("-") for order in getattr(self.paginator, "ordering", ())
+        ]
+        if geo.has_distance(queryset):
+            required.append(geo.DISTANCE)
+        return fieldset.get_columns(*required)
+
+    def list(self, request, *args, **kwargs):
+        """
+        Returns a page of apartments, served from the versioned cache when possible.
+
+        Concurrent misses of the same page are computed once (see
+        `apartment_cache.single_flight`), from the primary database if the
+        collection changed too recently for the replicas (see
+        `db_router.fresh_reads`). Responses carry `ETag` and
+        `Last-Modified` validators derived from the collection version, and
+        matching conditional requests get a 304 without touching the data.
+        """
+        facets = self.get_facets(request)
+        fieldset = Fieldset.from_request(request)
+        apartment_warming.record_access(request, "list")
+        key = apartment_cache.list_key(request)
+        modified_at = apartment_cache.get_collection_modified()
+        validators = conditional.list_validators(request, key, modified_at)
+        not_modified = conditional.evaluate(request, *validators)
+        if not_modified is not None:
+            return not_modified
+        with measure("cache"):
+            data = apartment_cache.get_data(key, "list")
+        if data is None:
+
+            def compute():
+                with db_router.fresh_reads(modified_at):
+                    return self.get_list_data(request, facets, fieldset)
+
+            data = apartment_cache.single_flight(key, compute)
+        return conditional.with_validators(Response(data), *validators)
+
+    def get_list_data(self, request, facets, fieldset):
+        """
+        Computes the data of a list response, with the fields of `fieldset`.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = fieldset.annotate(queryset).values(
+            *self.get_list_columns(fieldset, queryset)
+        )
+        page = self.paginate_queryset(rows)
+        with measure("serializer"):
+            data = fieldset.serialize_many(rows if page is None else page)
+            if geo.has_distance(queryset):
+                geo.add_distances(data, rows if page is None else page)
+        if fieldset.images:
+            apartment_images.attach_images(request, data)
+        fieldset.finalize(data)
+        if page is not None:
+            data = self.get_paginated_response(data).data
+        if facets:
+            if page is None:
+                data = {"results": data}
+            data["facets"] = apartment_facets.compute_facets(queryset, facets)
+        return data
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Returns a single apartment, served from the versioned cache when possible.
+
+        The `ETag` and `Last-Modified` validators come from the apartment's
+        `updated_at`, read from the cached response or with one indexed query,
+        so conditional requests get their 304 without serializing anything.
+        """
+        apartment_warming.record_access(request, "detail")
+        slug = kwargs[self.lookup_field]
+        key = apartment_cache.detail_key(request, slug)
+        with measure("cache"):
+            data = apartment_cache.get_data(key, "detail")
+        if data is not None:
+            updated_at = data["updated_at"]
+        else:
+            updated_at = (
+                Apartment.objects.filter(slug=slug)
+                .values_list("updated_at", flat=True)
+                .first()
+            )
+        if updated_at is not None:
+            not_modified = conditional.evaluate(
+                request, *conditional.detail_validators(request, updated_at)
+            )
+            if not_modified is not None:
+                return not_modified
+        if data is None:
+
+            def compute():
+                modified_at = apartment_cache.get_collection_modified()
+                with db_router.fresh_reads(modified_at):
+                    return self.get_detail_data(request)
+
+            data = apartment_cache.single_flight(key, compute)
+        return conditional.with_validators(
+            Response(data), *conditional.detail_validators(request, data["updated_at"])
+        )
+
+    def get_detail_data(self, request):
+        """
+        Computes the data of a detail response.
+        """
+        instance = self.get_object()
+        with measure("serializer"):
+            data = self.get_serializer(instance).data
+        apartment_images.attach_images(request, [data])
+        return data
+
+    def update(self, request, *args, **kwargs):
+        """
+        Updates an apartment and returns its new validators.
+
+        With `If-Match` (or `If-Unmodified-Since`), the apartment is locked and
+        only updated if it is unchanged since the client read it; otherwise the
+        request fails with 412, so concurrent edits cannot overwrite each other.
+        Permissions are checked first, so clients that may not change the
+        apartment get 403 without learning whether their validators match.
+        """
+        preconditions = ("HTTP_IF_MATCH", "HTTP_IF_UNMODIFIED_SINCE")
+        with transaction.atomic():
+            if any(header in request.META for header in preconditions):
+                self.get_object()
+                updated_at = (
+                    Apartment.objects.select_for_update()
+                    .filter(slug=kwargs[self.lookup_field])
+                    .values_list("updated_at", flat=True)
+                    .first()
+                )
+                if updated_at is not None:
+                    conditional.evaluate(
+                        request, *conditional.detail_validators(request, updated_at)
+                    )
+            response = super().update(request, *args, **kwargs)
+        return conditional.with_validators(
+            response,
+            *conditional.detail_validators(request, response.data["updated_at"]),
+        )
 
     def perform_create(self, serializer):
         """
@@ -63,7 +326,8 @@ class ApartmentViewSet(viewsets.ModelViewSet):
         Handles potential exceptions during creation.
         """
         try:
-            serializer.save(owner=self.request.user)
+            with transaction.atomic():
+                serializer.save(owner=self.request.user)
             logger.info(f"Apartment created by {self.request.user.email}")
         except Exception as e:
             logger.exception("Error creating apartment")
@@ -77,7 +341,8 @@ class ApartmentViewSet(viewsets.ModelViewSet):
         as it is set during creation.
         """
         try:
-            serializer.save()
+            with transaction.atomic():
+                serializer.save()
             logger.info(f"Apartment updated by {self.request.user.email}")
         except Exception as e:
             logger.exception("Error updating apartment")
@@ -91,7 +356,233 @@ class ApartmentViewSet(viewsets.ModelViewSet):
         """
         try:
             logger.info(f"Apartment deleted by {self.request.user.email}")
-            instance.delete()
+            with transaction.atomic():
+                instance.delete()
         except Exception as e:
             logger.exception("Error while deleting apartment")
             raise APIException("Error while deleting apartment")
+
+    @action(
+        detail=False,
+        methods=["post", "patch", "delete"],
+        url_path="bulk",
+        parser_classes=[JSONParser, NDJSONParser],
+    )
+    def bulk(self, request):
+        """
+        Creates (POST), updates (PATCH) or deletes (DELETE) apartments in bulk.
+
+        Accepts a JSON array or an NDJSON body. Rows are validated together and
+        written in chunks of `APARTMENT_BULK_CHUNK_SIZE`; the response holds one
+        result per row, in input order. Updates and deletes are keyed by `slug` and
+        only apply to apartments the user owns.
+        """
+        rows = request.data
+        if not isinstance(rows, list):
+            raise ValidationError("Expected a list of items.")
+        if len(rows) > settings.APARTMENT_BULK_MAX_ROWS:
+            raise ValidationError(
+                f"At most {settings.APARTMENT_BULK_MAX_ROWS} items are allowed per request."
+            )
+
+        if request.method == "POST":
+            results = bulk.bulk_create(request, rows)
+            success_status = status.HTTP_201_CREATED
+        elif request.method == "PATCH":
+            results = bulk.bulk_update(request, self, rows)
+            success_status = status.HTTP_200_OK
+        else:
+            results = bulk.bulk_delete(request, self, rows)
+            success_status = status.HTTP_200_OK
+        logger.info(
+            f"Bulk {request.method} of {len(rows)} apartments by {request.user.email}"
+        )
+
+        failed = sum(result["status"] not in bulk.SUCCESS_STATUSES for result in results)
+        if failed == 0:
+            response_status = success_status
+        elif failed == len(results):
+            response_status = status.HTTP_400_BAD_REQUEST
+        else:
+            response_status = status.HTTP_207_MULTI_STATUS
+        return Response({"results": results}, status=response_status)
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="export",
+        permission_classes=[permissions.IsAuthenticated],
+    )
+    def export(self, request):
+        """
+        Streams every apartment matching the list filters as NDJSON or CSV.
+
+        `?type=ndjson|csv` selects the format and `?gzip=true` compresses the
+        stream. Rows are read with a server-side cursor and written as they
+        arrive, so memory use stays flat regardless of the table size.
+        """
+        export_type = request.query_params.get("type", "ndjson")
+        if export_type not in apartment_export.EXPORT_TYPES:
+            raise ValidationError(
+                {"type": f"Must be one of {', '.join(apartment_export.EXPORT_TYPES)}."}
+            )
+        gzip = request.query_params.get("gzip", "").lower() in ("1", "true", "yes")
+
+        queryset = self.filter_queryset(self.get_queryset())
+        response = StreamingHttpResponse(
+            apartment_export.stream_export(
+                queryset,
+                export_type=export_type,
+                gzip=gzip,
+                chunk_size=settings.APARTMENT_EXPORT_CHUNK_SIZE,
+            ),
+            content_type=(
+                "application/gzip"
+                if gzip
+                else apartment_export.CONTENT_TYPES[export_type]
+            ),
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{apartment_export.filename(export_type, gzip)}"'
+        )
+        logger.info(f"Apartment export ({export_type}) started by {request.user.email}")
+        return response
+
+    @action(
+        detail=True,
+        methods=["get", "post"],
+        url_path="images",
+        parser_classes=[MultiPartParser],
+    )
+    def images(self, request, slug=None):
+        """
+        Lists (GET) or uploads (POST, multipart field `image`) the images of an
+        apartment.
+
+        Uploads are streamed to a temporary file in chunks rather than held in
+        memory (`FILE_UPLOAD_HANDLERS`) and moved into storage as is; the WebP
+        thumbnails are generated by a Celery task after the upload commits, so
+        new images start out `pending`.
+        """
+        apartment = self.get_object()
+        context = self.get_serializer_context()
+        if request.method == "GET":
+            serializer = ApartmentImageSerializer(
+                apartment.images.all(), many=True, context=context
+            )
+            return Response(serializer.data)
+
+        if apartment.images.count() >= settings.APARTMENT_IMAGE_MAX_PER_APARTMENT:
+            raise ValidationError(
+                f"Apartments can have at most "
+                f"{settings.APARTMENT_IMAGE_MAX_PER_APARTMENT} images."
+            )
+        serializer = ApartmentImageSerializer(data=request.data, context=context)
+        serializer.is_valid(raise_exception=True)
+        image = serializer.save(apartment=apartment)
+        apartment_images.schedule_thumbnails(image)
+        logger.info(f"Apartment image uploaded by {request.user.email}")
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=True, methods=["delete"], url_path=r"images/(?P<image_id>[0-9]+)")
+    def image(self, request, slug=None, image_id=None):
+        """
+        Deletes an image of an apartment; its files are deleted in the background.
+        """
+        apartment = self.get_object()
+        image = apartment.images.filter(pk=image_id).first()
+        if image is None:
+            raise NotFound("No image matches the given query.")
+        image.delete()
+        logger.info(f"Apartment image deleted by {request.user.email}")
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=False, methods=["get"], url_path="stats")
+    def stats(self, request):
+        """
+        Returns the count and the average, median, minimum and maximum price
+        and average price per m² per number of rooms and availability, plus
+        totals over the returned groups.
+
+        Accepts the list filters. With only `availability` and
+        `number_of_rooms`, the answer comes from the precomputed `ApartmentStats`
+        summary, whatever the table size; price ranges, locations and search
+        need the matching rows and are aggregated live in one grouped query.
+        """
+        live_params = (
+            "price_min",
+            "price_max",
+            "lat",
+            "lon",
+            "radius",
+            "bbox",
+            ApartmentSearchFilter.search_param,
+        )
+        if any(request.query_params.get(name) for name in live_params):
+            groups = apartment_stats.aggregate_groups(
+                self.filter_queryset(self.get_queryset())
+            )
+            source, refreshed_at = "live", timezone.now()
+        else:
+            filterset = self.filterset_class(
+                request.query_params, queryset=ApartmentStats.objects.all()
+            )
+            if not filterset.is_valid():
+                raise filter_utils.translate_validation(filterset.errors)
+            rows = list(filterset.qs)
+            groups = [
+                {
+                    field: getattr(row, field)
+                    for field in ApartmentStatsSerializer.Meta.fields
+                }
+                for row in rows
+            ]
+            source = "summary"
+            refreshed_at = min((row.refreshed_at for row in rows), default=None)
+
+        report = {
+            "source": source,
+            "refreshed_at": refreshed_at,
+            "total": apartment_stats.summarize(groups),
+            "groups": groups,
+        }
+        return Response(ApartmentStatsReportSerializer(report).data)
+
+    @action(detail=False, methods=["get"], url_path="changes")
+    def changes(self, request):
+        """
+        Returns the apartment changes published after `?since=<sequence>`, in
+        order, at most `?limit=` of them.
+
+        Consumers pass the `next` of each response as the `since` of the next
+        request, so they only read deltas; `has_more` tells whether to ask
+        again right away. Start from a full export with `since=latest`, which
+        returns no changes and the current position. Positions older than the
+        retention of the outbox return 410, after which the consumer has to
+        resynchronize.
+        """
+        since = request.query_params.get("since", "0")
+        try:
+            since = (
+                apartment_outbox.latest_sequence() if since == "latest" else int(since)
+            )
+            limit = int(
+                request.query_params.get("limit", settings.APARTMENT_CHANGES_PAGE_SIZE)
+            )
+        except ValueError:
+            raise ValidationError("`since` and `limit` must be integers.")
+        if since < 0 or not 1 <= limit <= settings.APARTMENT_CHANGES_MAX_PAGE_SIZE:
+            raise ValidationError(
+                f"`since` must not be negative and `limit` must be between 1 and "
+                f"{settings.APARTMENT_CHANGES_MAX_PAGE_SIZE}."
+            )
+        if apartment_outbox.is_expired(since):
+            raise ChangesExpired()
+
+        changes = apartment_outbox.changes_since(since, limit + 1)
+        feed = {
+            "results": changes[:limit],
+            "next": changes[:limit][-1].sequence if changes else since,
+            "has_more": len(changes) > limit,
+        }
+        return Response(ApartmentChangeFeedSerializer(feed).data)
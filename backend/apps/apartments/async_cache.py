@@ -0,0 +1,149 @@
+import asyncio
+import weakref
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+
+# Increments a key only if it exists, like django-redis's `incr`.
+INCR_IF_EXISTS_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call('INCRBY', KEYS[1], ARGV[1])
+end
+return false
+"""
+
+# Deletes a key only if it holds the given value, e.g. a lock its holder
+# releases, which may have expired and been taken by another process.
+DELETE_IF_EQUAL_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+_redis_caches = {}
+
+
+class RedisAsyncCache:
+    """
+    Async client for a django-redis cache backed by `redis.asyncio`.
+
+    Django's `cache.aget()` and friends run the sync client in a worker thread.
+    This talks to Redis directly from the event loop instead, using
+    django-redis's key format and value encoding, so entries are shared with
+    the sync cache. Only the operations the apartment cache needs are provided.
+    """
+
+    def __init__(self, alias=DEFAULT_CACHE_ALIAS):
+        self.alias = alias
+        self._clients = weakref.WeakKeyDictionary()
+
+    @property
+    def backend(self):
+        return caches[self.alias]
+
+    async def _client(self):
+        """
+        Returns the Redis client of the running event loop.
+
+        Connection pools are bound to the loop they were created on, so each
+        loop gets its own client, which is closed when the loop shuts down.
+        A long-lived ASGI loop keeps one client, while the short-lived loops
+        `async_to_sync` runs async views in under WSGI (or `warming.fetch`)
+        release their connections when they end.
+        """
+        from redis.asyncio import Redis
+
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(loop)
+        if entry is None:
+            location = settings.CACHES[self.alias]["LOCATION"]
+            if not isinstance(location, str):
+                location = location[0]
+            client = Redis.from_url(location)
+            lifetime = self._lifetime(client)
+            # Starting the generator registers it with the loop, whose
+            # shutdown (`shutdown_asyncgens`, run by `asyncio.run`) closes it.
+            await lifetime.asend(None)
+            entry = self._clients[loop] = (client, lifetime)
+        return entry[0]
+
+    async def _lifetime(self, client):
+        try:
+            yield
+        finally:
+            # Runs in the loop, which the generator must not reference: the
+            # loop is a weak key of `_clients`.
+            self._clients.pop(asyncio.get_running_loop(), None)
+            await client.aclose()
+
+    def _key(self, key):
+        return str(self.backend.client.make_key(key))
+
+    def _timeout(self, timeout):
+        return None if timeout is None else max(int(timeout * 1000), 1)
+
+    async def aget(self, key, default=None):
+        client = await self._client()
+        value = await client.get(self._key(key))
+        if value is None:
+            return default
+        return self.backend.client.decode(value)
+
+    async def aset(self, key, value, timeout):
+        client = await self._client()
+        await client.set(
+            self._key(key), self.backend.client.encode(value), px=self._timeout(timeout)
+        )
+
+    async def aadd(self, key, value, timeout):
+        client = await self._client()
+        return bool(
+            await client.set(
+                self._key(key),
+                self.backend.client.encode(value),
+                px=self._timeout(timeout),
+                nx=True,
+            )
+        )
+
+    async def adelete(self, key):
+        client = await self._client()
+        return bool(await client.delete(self._key(key)))
+
+    async def adelete_if_equal(self, key, value):
+        """
+        Atomically deletes `key` if it holds `value`; returns whether it did.
+        """
+        client = await self._client()
+        return bool(
+            await client.eval(
+                DELETE_IF_EQUAL_SCRIPT,
+                1,
+                self._key(key),
+                self.backend.client.encode(value),
+            )
+        )
+
+    async def aincr(self, key, delta=1):
+        client = await self._client()
+        value = await client.eval(INCR_IF_EXISTS_SCRIPT, 1, self._key(key), delta)
+        if value is None:
+            raise ValueError(f"Key '{key}' not found")
+        return value
+
+
+def get_cache(alias=DEFAULT_CACHE_ALIAS):
+    """
+    Returns an object with the async cache API (`aget`, `aset`, `aadd`,
+    `adelete`, `aincr`).
+
+    That is a `RedisAsyncCache` for django-redis caches, and the Django cache
+    itself, whose async methods run in a thread, for any other backend.
+    """
+    if not settings.CACHES[alias]["BACKEND"].startswith("django_redis"):
+        return caches[alias]
+    cache = _redis_caches.get(alias)
+    if cache is None:
+        cache = _redis_caches[alias] = RedisAsyncCache(alias)
+    return cache
@@ -0,0 +1,353 @@
+import asyncio
+import hashlib
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.apartments import async_cache, warming
+
+CACHE_PREFIX = "apartments"
+COLLECTION_VERSION_KEY = f"{CACHE_PREFIX}:version:collection"
+COLLECTION_MODIFIED_KEY = f"{CACHE_PREFIX}:modified:collection"
+STATS_KINDS = ("list", "detail")
+# Seconds between two looks at the cache while another process computes a
+# missing response (see `single_flight`).
+LOCK_POLL_INTERVAL = 0.05
+
+_release_script = None
+
+
+def _initial_version():
+    """
+    Returns the starting value for a version counter.
+
+    A millisecond timestamp is used instead of 1 so that a counter lost to a
+    cache flush never restarts at a value that older entries were stored under.
+    """
+    return time.time_ns() // 1_000_000
+
+
+def _apartment_version_key(slug):
+    return f"{CACHE_PREFIX}:version:apartment:{slug}"
+
+
+def _stats_key(kind, outcome):
+    return f"{CACHE_PREFIX}:stats:{kind}:{outcome}"
+
+
+def _incr(key, initial):
+    """
+    Atomically increments a counter that never expires, creating it if missing.
+    """
+    try:
+        return cache.incr(key)
+    except ValueError:
+        if cache.add(key, initial, timeout=None):
+            return initial
+        return cache.incr(key)
+
+
+async def _aincr(key, initial):
+    """
+    Async variant of `_incr`.
+    """
+    client = async_cache.get_cache()
+    try:
+        return await client.aincr(key)
+    except ValueError:
+        if await client.aadd(key, initial, timeout=None):
+            return initial
+        return await client.aincr(key)
+
+
+def get_version(key):
+    """
+    Returns the current value of the version counter stored under `key`.
+    """
+    version = cache.get(key)
+    if version is None:
+        version = _initial_version()
+        if not cache.add(key, version, timeout=None):
+            version = cache.get(key, version)
+    return version
+
+
+async def aget_version(key):
+    """
+    Async variant of `get_version`.
+    """
+    client = async_cache.get_cache()
+    version = await client.aget(key)
+    if version is None:
+        version = _initial_version()
+        if not await client.aadd(key, version, timeout=None):
+            version = await client.aget(key, version)
+    return version
+
+
+def get_collection_version():
+    """
+    Returns the version shared by every apartment list response.
+    """
+    return get_version(COLLECTION_VERSION_KEY)
+
+
+def get_apartment_version(slug):
+    """
+    Returns the version of the detail response for the apartment with `slug`.
+    """
+    return get_version(_apartment_version_key(slug))
+
+
+def get_collection_modified():
+    """
+    Returns the time (a Unix timestamp) of the last change to the apartment
+    collection.
+
+    The time is unknown after a cache flush and taken to be now, so that
+    clients revalidating an older copy get a full response.
+    """
+    modified = cache.get(COLLECTION_MODIFIED_KEY)
+    if modified is None:
+        modified = int(time.time())
+        if not cache.add(COLLECTION_MODIFIED_KEY, modified, timeout=None):
+            modified = cache.get(COLLECTION_MODIFIED_KEY, modified)
+    return modified
+
+
+async def aget_collection_modified():
+    """
+    Async variant of `get_collection_modified`.
+    """
+    client = async_cache.get_cache()
+    modified = await client.aget(COLLECTION_MODIFIED_KEY)
+    if modified is None:
+        modified = int(time.time())
+        if not await client.aadd(COLLECTION_MODIFIED_KEY, modified, timeout=None):
+            modified = await client.aget(COLLECTION_MODIFIED_KEY, modified)
+    return modified
+
+
+def bump_collection_version():
+    """
+    Invalidates every cached apartment list response.
+    """
+    cache.set(COLLECTION_MODIFIED_KEY, int(time.time()), timeout=None)
+    return _incr(COLLECTION_VERSION_KEY, _initial_version())
+
+
+def bump_apartment_version(slug):
+    """
+    Invalidates the cached detail response of the apartment with `slug`.
+    """
+    return _incr(_apartment_version_key(slug), _initial_version())
+
+
+def invalidate_apartments(slugs=()):
+    """
+    Invalidates the list responses and the detail responses of `slugs`, and
+    queues a warming run to refill the hottest ones.
+    """
+    for slug in slugs:
+        bump_apartment_version(slug)
+    bump_collection_version()
+    if settings.APARTMENT_CACHE_WARM_ON_INVALIDATE:
+        warming.schedule_warm()
+
+
+def list_key(request):
+    """
+    Builds the cache key of an apartment list response.
+
+    The absolute URI is part of the key because paginated responses embed
+    absolute `next`/`previous` links.
+    """
+    return _list_key(request, get_collection_version())
+
+
+async def alist_key(request):
+    return _list_key(request, await aget_version(COLLECTION_VERSION_KEY))
+
+
+def _list_key(request, version):
+    digest = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    return f"{CACHE_PREFIX}:list:v{version}:{digest}"
+
+
+def detail_key(request, slug):
+    """
+    Builds the cache key of an apartment detail response.
+    """
+    return _detail_key(request, slug, get_apartment_version(slug))
+
+
+async def adetail_key(request, slug):
+    return _detail_key(
+        request, slug, await aget_version(_apartment_version_key(slug))
+    )
+
+
+def _detail_key(request, slug, version):
+    digest = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    return f"{CACHE_PREFIX}:detail:{slug}:v{version}:{digest}"
+
+
+def get_data(key, kind):
+    """
+    Returns the cached response data stored under `key`, or None on a miss.
+
+    Every lookup is counted as a hit or a miss of `kind` ("list" or "detail").
+    """
+    data = cache.get(key)
+    _incr(_stats_key(kind, "hit" if data is not None else "miss"), 1)
+    return data
+
+
+async def aget_data(key, kind):
+    """
+    Async variant of `get_data`.
+    """
+    data = await async_cache.get_cache().aget(key)
+    await _aincr(_stats_key(kind, "hit" if data is not None else "miss"), 1)
+    return data
+
+
+def set_data(key, data):
+    """
+    Stores response data under `key` for `APARTMENT_CACHE_TIMEOUT` seconds.
+    """
+    cache.set(key, data, timeout=settings.APARTMENT_CACHE_TIMEOUT)
+
+
+async def aset_data(key, data):
+    await async_cache.get_cache().aset(
+        key, data, timeout=settings.APARTMENT_CACHE_TIMEOUT
+    )
+
+
+def _lock_key(key):
+    return f"{key}:lock"
+
+
+def _release_lock(lock_key, token):
+    """
+    Deletes the lock `lock_key` if it still holds `token`, so a lock taken over
+    by another process after expiring is left to it.
+
+    On Redis the check and the delete run as one script; other backends only
+    offer a get followed by a delete.
+    """
+    global _release_script
+    if not settings.CACHES["default"]["BACKEND"].startswith("django_redis"):
+        if cache.get(lock_key) == token:
+            cache.delete(lock_key)
+        return
+    if _release_script is None:
+        from django_redis import get_redis_connection
+
+        _release_script = get_redis_connection("default").register_script(
+            async_cache.DELETE_IF_EQUAL_SCRIPT
+        )
+    _release_script(
+        keys=[cache.client.make_key(lock_key)], args=[cache.client.encode(token)]
+    )
+
+
+async def _arelease_lock(client, lock_key, token):
+    """
+    Async variant of `_release_lock` for the `async_cache.get_cache()` client.
+    """
+    if isinstance(client, async_cache.RedisAsyncCache):
+        await client.adelete_if_equal(lock_key, token)
+    elif await client.aget(lock_key) == token:
+        await client.adelete(lock_key)
+
+
+def single_flight(key, compute):
+    """
+    Returns the response data stored under `key`, computing and storing it with
+    `compute()` if it is missing.
+
+    Concurrent misses for the same key are collapsed: the first one takes a
+    lock in the shared cache (an atomic `SET NX` on Redis) and computes the
+    data, while the others poll the cache for its result, for at most
+    `APARTMENT_CACHE_LOCK_WAIT` seconds before computing it themselves. The
+    lock expires after `APARTMENT_CACHE_LOCK_TIMEOUT` seconds in case its
+    holder dies.
+    """
+    lock_key = _lock_key(key)
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + settings.APARTMENT_CACHE_LOCK_WAIT
+    while not cache.add(lock_key, token, timeout=settings.APARTMENT_CACHE_LOCK_TIMEOUT):
+        time.sleep(LOCK_POLL_INTERVAL)
+        data = cache.get(key)
+        if data is not None:
+            return data
+        if time.monotonic() >= deadline:
+            return compute()
+    try:
+        # The previous holder may have stored the data since the last look.
+        data = cache.get(key)
+        if data is None:
+            data = compute()
+            set_data(key, data)
+        return data
+    finally:
+        _release_lock(lock_key, token)
+
+
+async def asingle_flight(key, compute):
+    """
+    Async variant of `single_flight`; `compute` is a coroutine function.
+    """
+    client = async_cache.get_cache()
+    lock_key = _lock_key(key)
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + settings.APARTMENT_CACHE_LOCK_WAIT
+    while not await client.aadd(
+        lock_key, token, timeout=settings.APARTMENT_CACHE_LOCK_TIMEOUT
+    ):
+        await asyncio.sleep(LOCK_POLL_INTERVAL)
+        data = await client.aget(key)
+        if data is not None:
+            return data
+        if time.monotonic() >= deadline:
+            return await compute()
+    try:
+        data = await client.aget(key)
+        if data is None:
+            data = await compute()
+            await aset_data(key, data)
+        return data
+    finally:
+        await _arelease_lock(client, lock_key, token)
+
+
+def get_stats():
+    """
+    Returns the hit/miss counters and the hit ratio for each response kind.
+    """
+    keys = [_stats_key(kind, outcome) for kind in STATS_KINDS for outcome in ("hit", "miss")]
+    values = cache.get_many(keys)
+    stats = {}
+    for kind in STATS_KINDS:
+        hits = values.get(_stats_key(kind, "hit"), 0)
+        misses = values.get(_stats_key(kind, "miss"), 0)
+        total = hits + misses
+        stats[kind] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / total, 4) if total else None,
+        }
+    return stats
+
+
+def reset_stats():
+    """
+    Resets the hit/miss counters of every response kind.
+    """
+    cache.delete_many(
+        [_stats_key(kind, outcome) for kind in STATS_KINDS for outcome in ("hit", "miss")]
+    )
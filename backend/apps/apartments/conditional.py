@@ -0,0 +1,83 @@
+import hashlib
+
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = "The apartment was changed since it was read."
+    default_code = "precondition_failed"
+
+
+def _etag(*parts):
+    return quote_etag(hashlib.md5(":".join(map(str, parts)).encode()).hexdigest())
+
+
+def _media_type(request):
+    return getattr(request, "accepted_media_type", "")
+
+
+def list_validators(request, key, modified_at):
+    """
+    Returns the `(etag, last_modified)` of an apartment list response.
+
+    Both come from the version metadata of the collection: `key` is the
+    response's cache key, which holds the collection version and the request
+    URI, and `modified_at` the time of the last change (see
+    `apartment_cache.get_collection_modified`). No query is needed, and
+    deletions and image changes are covered.
+    """
+    return _etag(key, _media_type(request)), modified_at
+
+
+def detail_validators(request, updated_at):
+    """
+    Returns the `(etag, last_modified)` of an apartment detail response, from
+    the apartment's `updated_at` (a datetime, or its serialized form).
+    """
+    if isinstance(updated_at, str):
+        updated_at = parse_datetime(updated_at)
+    return (
+        _etag(
+            request.build_absolute_uri(), _media_type(request), updated_at.timestamp()
+        ),
+        int(updated_at.timestamp()),
+    )
+
+
+def evaluate(request, etag, last_modified):
+    """
+    Evaluates the conditional headers of `request` against the validators of
+    the current representation.
+
+    Returns a 304 response (with the validators) when a GET can be answered
+    from the client's copy, and None when the request should proceed.
+
+    Raises:
+        PreconditionFailed: If an `If-Match` or `If-Unmodified-Since`
+            precondition fails.
+    """
+    validators = with_validators(HttpResponse(), etag, last_modified)
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified, response=validators
+    )
+    if response is validators:
+        return None
+    if response.status_code == status.HTTP_412_PRECONDITION_FAILED:
+        raise PreconditionFailed()
+    return response
+
+
+def with_validators(response, etag, last_modified):
+    """
+    Sets the `ETag` and `Last-Modified` headers of `response`.
+    """
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    return response
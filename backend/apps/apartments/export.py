@@ -0,0 +1,99 @@
+import csv
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+EXPORT_FIELDS = [
+    "id",
+    "name",
+    "slug",
+    "description",
+    "price",
+    "number_of_rooms",
+    "square",
+    "availability",
+    "owner__email",
+    "created_at",
+    "updated_at",
+]
+EXPORT_COLUMNS = [field.replace("owner__", "owner_") for field in EXPORT_FIELDS]
+EXPORT_TYPES = ("ndjson", "csv")
+CONTENT_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+# Encoded output is flushed in blocks of roughly this many bytes.
+BUFFER_SIZE = 64 * 1024
+
+
+class _Echo:
+    """
+    File-like object whose `write` returns the value, for `csv.writer`.
+    """
+
+    def write(self, value):
+        return value
+
+
+def iter_rows(queryset, chunk_size):
+    """
+    Yields export rows as tuples, fetching `chunk_size` rows at a time.
+
+    `iterator()` uses a server-side cursor on PostgreSQL, so only one chunk of
+    rows is in memory at any time.
+    """
+    return (
+        queryset.order_by("pk")
+        .values_list(*EXPORT_FIELDS)
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def iter_ndjson(rows):
+    encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    for row in rows:
+        yield encoder.encode(dict(zip(EXPORT_COLUMNS, row))) + "\n"
+
+
+def iter_csv(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def _buffered(lines):
+    buffer = []
+    size = 0
+    for line in lines:
+        data = line.encode()
+        buffer.append(data)
+        size += len(data)
+        if size >= BUFFER_SIZE:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def _gzipped(blocks):
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    for block in blocks:
+        data = compressor.compress(block)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream_export(queryset, export_type="ndjson", gzip=False, chunk_size=2000):
+    """
+    Returns an iterator of encoded byte blocks exporting `queryset`.
+
+    Rows are streamed from the database and encoded block by block, so memory
+    use does not depend on the number of exported rows.
+    """
+    rows = iter_rows(queryset, chunk_size)
+    lines = iter_csv(rows) if export_type == "csv" else iter_ndjson(rows)
+    blocks = _buffered(lines)
+    return _gzipped(blocks) if gzip else blocks
+
+
+def filename(export_type, gzip=False):
+    return f"apartments.{export_type}" + (".gz" if gzip else "")
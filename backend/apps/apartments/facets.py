@@ -0,0 +1,93 @@
+from django.conf import settings
+from django.db.models import Case, Count, IntegerField, Value, When
+
+# Facets the apartment list can count, in response order.
+FACETS = ("number_of_rooms", "availability", "price")
+# Column each facet groups by.
+FACET_COLUMNS = {
+    "number_of_rooms": "number_of_rooms",
+    "availability": "availability",
+    "price": "price_bucket",
+}
+
+
+def price_buckets():
+    """
+    Returns the `(min, max)` price bounds of each bucket, from the
+    `APARTMENT_PRICE_FACET_BOUNDARIES` setting. A bucket holds prices in
+    `[min, max)`; None means unbounded.
+    """
+    boundaries = sorted(settings.APARTMENT_PRICE_FACET_BOUNDARIES)
+    return list(zip([None] + boundaries, boundaries + [None]))
+
+
+def _price_bucket():
+    """
+    Returns an expression evaluating to the index of a row's price bucket.
+    """
+    boundaries = sorted(settings.APARTMENT_PRICE_FACET_BOUNDARIES)
+    return Case(
+        *(
+            When(price__lt=boundary, then=Value(index))
+            for index, boundary in enumerate(boundaries)
+        ),
+        default=Value(len(boundaries)),
+        output_field=IntegerField(),
+    )
+
+
+def facet_query(queryset, facets):
+    """
+    Returns the query counting the rows of `queryset` per combination of the
+    values of `facets`, from which every facet is rolled up.
+    """
+    queryset = queryset.order_by()
+    if "price" in facets:
+        queryset = queryset.annotate(price_bucket=_price_bucket())
+    columns = [FACET_COLUMNS[facet] for facet in facets]
+    return queryset.values(*columns).annotate(count=Count("id")).order_by()
+
+
+def build_facets(rows, facets):
+    """
+    Rolls the rows of `facet_query` up into counts per facet value.
+
+    Room and availability counts are lists of `{"value", "count"}` ordered by
+    value; price counts list every bucket, empty ones included, as
+    `{"min", "max", "count"}`.
+    """
+    counts = {facet: {} for facet in facets}
+    for row in rows:
+        for facet in facets:
+            value = row[FACET_COLUMNS[facet]]
+            counts[facet][value] = counts[facet].get(value, 0) + row["count"]
+
+    result = {}
+    for facet in facets:
+        if facet == "price":
+            result[facet] = [
+                {"min": low, "max": high, "count": counts[facet].get(index, 0)}
+                for index, (low, high) in enumerate(price_buckets())
+            ]
+        else:
+            result[facet] = [
+                {"value": value, "count": count}
+                for value, count in sorted(counts[facet].items())
+            ]
+    return result
+
+
+def compute_facets(queryset, facets):
+    """
+    Counts the apartments of `queryset` per value of each of `facets` in one
+    grouped query.
+    """
+    return build_facets(facet_query(queryset, facets), facets)
+
+
+async def acompute_facets(queryset, facets):
+    """
+    Async variant of `compute_facets`.
+    """
+    rows = [row async for row in facet_query(queryset, facets)]
+    return build_facets(rows, facets)
@@ -0,0 +1,143 @@
+import math
+
+from django.db.models import FloatField, Q, Value
+from django.db.models.functions import ASin, Cast, Cos, Least, Power, Radians, Sin, Sqrt
+
+EARTH_RADIUS_KM = 6371.0088
+# Side of a `geo_cell` grid cell in degrees (about 11 km of latitude). Changing
+# it requires recomputing `geo_cell` for every row.
+CELL_DEGREES = 0.1
+CELL_COLUMNS = round(360 / CELL_DEGREES)
+CELL_ROWS = round(180 / CELL_DEGREES)
+# Searches spanning more cells than this filter on the coordinates alone.
+MAX_CELLS = 2500
+# Name of the distance annotation (km) added by `filter_near`.
+DISTANCE = "distance"
+
+
+def cell_of(latitude, longitude):
+    """
+    Returns the id of the grid cell containing a point, or None if either
+    coordinate is missing.
+
+    Cells are `CELL_DEGREES` wide and numbered row by row from the south-west
+    corner, so points close to each other share a cell id and a bounding box
+    maps to a short list of ids that the B-tree index on `geo_cell` can look up.
+    """
+    if latitude is None or longitude is None:
+        return None
+    return _row(latitude) * CELL_COLUMNS + _column(longitude)
+
+
+def _row(latitude):
+    return min(int((float(latitude) + 90) // CELL_DEGREES), CELL_ROWS - 1)
+
+
+def _column(longitude):
+    return int((float(longitude) + 180) // CELL_DEGREES) % CELL_COLUMNS
+
+
+def cells_in_box(south, west, north, east):
+    """
+    Returns the ids of the cells overlapping a bounding box, or None when there
+    are more than `MAX_CELLS` of them.
+
+    A box with `west > east` crosses the antimeridian.
+    """
+    rows = range(_row(south), _row(north) + 1)
+    first, last = _column(west), _column(east)
+    if first <= last and west <= east:
+        columns = list(range(first, last + 1))
+    else:
+        columns = list(range(first, CELL_COLUMNS)) + list(range(0, last + 1))
+    if len(rows) * len(columns) > MAX_CELLS:
+        return None
+    return [row * CELL_COLUMNS + column for row in rows for column in columns]
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    Returns the `(south, west, north, east)` box containing every point within
+    `radius_km` of a point. `west > east` when the box crosses the antimeridian.
+    """
+    latitude, longitude = float(latitude), float(longitude)
+    angle = radius_km / EARTH_RADIUS_KM
+    delta_latitude = math.degrees(angle)
+    south, north = latitude - delta_latitude, latitude + delta_latitude
+    if south <= -90 or north >= 90 or angle >= math.pi / 2:
+        # The circle contains a pole: every longitude is in range.
+        return max(south, -90), -180, min(north, 90), 180
+
+    ratio = math.sin(angle) / math.cos(math.radians(latitude))
+    if ratio >= 1:
+        return south, -180, north, 180
+    delta_longitude = math.degrees(math.asin(ratio))
+    west = (longitude - delta_longitude + 180) % 360 - 180
+    east = (longitude + delta_longitude + 180) % 360 - 180
+    return south, west, north, east
+
+
+def filter_box(queryset, south, west, north, east):
+    """
+    Filters `queryset` down to apartments inside a bounding box, looking them
+    up by grid cell when the box is small enough.
+    """
+    south, west, north, east = map(float, (south, west, north, east))
+    condition = Q(latitude__gte=south, latitude__lte=north)
+    if west <= east:
+        condition &= Q(longitude__gte=west, longitude__lte=east)
+    else:
+        condition &= Q(longitude__gte=west) | Q(longitude__lte=east)
+    cells = cells_in_box(south, west, north, east)
+    if cells is not None:
+        condition &= Q(geo_cell__in=cells)
+    return queryset.filter(condition)
+
+
+def distance_to(latitude, longitude):
+    """
+    Returns an expression for the great-circle (haversine) distance in km
+    between each apartment and a point.
+    """
+    latitude, longitude = math.radians(latitude), math.radians(longitude)
+    row_latitude = Radians(Cast("latitude", FloatField()))
+    row_longitude = Radians(Cast("longitude", FloatField()))
+    haversine = Power(Sin((row_latitude - Value(latitude)) / 2), 2) + Value(
+        math.cos(latitude)
+    ) * Cos(row_latitude) * Power(Sin((row_longitude - Value(longitude)) / 2), 2)
+    return 2 * EARTH_RADIUS_KM * ASin(Least(Sqrt(haversine), Value(1.0)))
+
+
+def filter_near(queryset, latitude, longitude, radius_km):
+    """
+    Filters `queryset` down to apartments within `radius_km` of a point,
+    nearest first.
+
+    Candidates are found through the grid cells of the circle's bounding box;
+    the exact distance is then computed for them only and annotated as
+    `distance` (km). Ties are broken by id, so the ordering can be paginated
+    with a keyset on `(distance, id)`.
+    """
+    latitude, longitude, radius_km = map(float, (latitude, longitude, radius_km))
+    queryset = filter_box(queryset, *bounding_box(latitude, longitude, radius_km))
+    return (
+        queryset.annotate(**{DISTANCE: distance_to(latitude, longitude)})
+        .filter(**{f"{DISTANCE}__lte": radius_km})
+        .order_by(DISTANCE, "id")
+    )
+
+
+def has_distance(queryset):
+    """
+    Returns True if `queryset` was filtered by `filter_near`.
+    """
+    return DISTANCE in queryset.query.annotations
+
+
+def add_distances(data, rows):
+    """
+    Adds the `distance_km` of each row to its serialized representation.
+    """
+    for item, row in zip(data, rows):
+        item["distance_km"] = round(row[DISTANCE], 3)
+    return data
@@ -0,0 +1,147 @@
+import io
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from apps.apartments.models import ApartmentImage
+
+# Formats accepted for upload, as named by Pillow.
+UPLOAD_FORMATS = ("JPEG", "PNG", "WEBP")
+
+
+def inspect_upload(file):
+    """
+    Returns the `(format, width, height)` of an uploaded image.
+
+    Pillow only parses the header here, so this is cheap even for large files.
+
+    Raises:
+        ValueError: If the file is not an image Pillow can read.
+    """
+    try:
+        with Image.open(file) as image:
+            return image.format, image.width, image.height
+    except (UnidentifiedImageError, OSError) as e:
+        raise ValueError(str(e)) from e
+    finally:
+        file.seek(0)
+
+
+def thumbnail_name(image, size):
+    return f"apartments/thumbnails/{image.pk}/{size}.webp"
+
+
+def generate_thumbnails(image):
+    """
+    Generates the WebP thumbnails of `image` and marks it ready.
+
+    Each size in `APARTMENT_IMAGE_SIZES` bounds the longest side of its
+    thumbnail; images are never upscaled. JPEGs are decoded at the smallest
+    scale that still covers the largest thumbnail, which is much faster than
+    decoding the full-resolution photo, and each thumbnail is resized from the
+    next larger one.
+    """
+    sizes = settings.APARTMENT_IMAGE_SIZES
+    largest = max(sizes.values())
+    with image.original.open("rb") as file, Image.open(file) as source:
+        width, height = source.size
+        source.draft("RGB", (largest, largest))
+        source = ImageOps.exif_transpose(source)
+        if source.mode not in ("RGB", "RGBA"):
+            source = source.convert("RGBA" if "transparency" in source.info else "RGB")
+
+        thumbnails = {}
+        thumbnail = source
+        for size, bound in sorted(sizes.items(), key=lambda item: -item[1]):
+            thumbnail = thumbnail.copy()
+            thumbnail.thumbnail((bound, bound), Image.Resampling.LANCZOS)
+            buffer = io.BytesIO()
+            thumbnail.save(
+                buffer,
+                "WEBP",
+                quality=settings.APARTMENT_IMAGE_WEBP_QUALITY,
+                method=4,
+            )
+            name = thumbnail_name(image, size)
+            default_storage.delete(name)
+            thumbnails[size] = default_storage.save(
+                name, ContentFile(buffer.getvalue())
+            )
+
+    image.width, image.height = width, height
+    image.thumbnails = thumbnails
+    image.status = ApartmentImage.Status.READY
+    image.save(update_fields=["width", "height", "thumbnails", "status"])
+    return image
+
+
+def schedule_thumbnails(image):
+    """
+    Queues the thumbnail generation of `image` once the current transaction
+    commits.
+    """
+    from apps.apartments.tasks import generate_apartment_thumbnails
+
+    transaction.on_commit(lambda: generate_apartment_thumbnails.delay(image.pk))
+
+
+def storage_names(image):
+    """
+    Returns the storage names of the original and the thumbnails of `image`.
+    """
+    return [image.original.name, *image.thumbnails.values()]
+
+
+def thumbnail_urls(request, thumbnails):
+    """
+    Returns the absolute URL of each thumbnail in a `thumbnails` mapping.
+    """
+    return {
+        size: request.build_absolute_uri(default_storage.url(name))
+        for size, name in thumbnails.items()
+    }
+
+
+def _images_query(apartment_ids):
+    return (
+        ApartmentImage.objects.filter(
+            apartment_id__in=apartment_ids, status=ApartmentImage.Status.READY
+        )
+        .order_by("apartment_id", "position", "id")
+        .values_list("apartment_id", "id", "thumbnails")
+    )
+
+
+def _attach(request, items, rows):
+    images = {}
+    for apartment_id, image_id, thumbnails in rows:
+        images.setdefault(apartment_id, []).append(
+            {"id": image_id, "thumbnails": thumbnail_urls(request, thumbnails)}
+        )
+    for item in items:
+        item["images"] = images.get(item["id"], [])
+    return items
+
+
+def attach_images(request, items):
+    """
+    Adds the ready images of each serialized apartment in `items` (with their
+    thumbnail URLs) as `images`, fetching the images of every apartment in
+    one query.
+    """
+    if not items:
+        return items
+    return _attach(request, items, _images_query([item["id"] for item in items]))
+
+
+async def aattach_images(request, items):
+    """
+    Async variant of `attach_images`.
+    """
+    if not items:
+        return items
+    rows = [row async for row in _images_query([item["id"] for item in items])]
+    return _attach(request, items, rows)
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from apps.apartments import cache as apartment_cache
+
+
+class Command(BaseCommand):
+    help = "Shows hit/miss counters of the apartment API response cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Reset the counters after printing them.",
+        )
+
+    def handle(self, *args, **options):
+        for kind, stats in apartment_cache.get_stats().items():
+            ratio = stats["hit_ratio"]
+            self.stdout.write(
+                f"{kind}: hits={stats['hits']} misses={stats['misses']} "
+                f"hit_ratio={'n/a' if ratio is None else f'{ratio:.2%}'}"
+            )
+        if options["reset"]:
+            apartment_cache.reset_stats()
+            self.stdout.write(self.style.SUCCESS("Counters reset."))
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.apartments import search
+from apps.apartments.models import Apartment
+
+
+class Command(BaseCommand):
+    help = "Fills Apartment.search_vector for existing rows in primary-key batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of rows updated per transaction (default: 1000).",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Recompute every row instead of only rows without a vector.",
+        )
+
+    def handle(self, *args, **options):
+        queryset = Apartment.objects.all()
+        if not search.is_supported(queryset):
+            raise CommandError("Full-text search requires PostgreSQL.")
+        if not options["all"]:
+            queryset = queryset.filter(search_vector__isnull=True)
+
+        batch_size = options["batch_size"]
+        last_pk = 0
+        total = 0
+        while True:
+            pks = list(
+                queryset.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not pks:
+                break
+            with transaction.atomic():
+                total += Apartment.objects.filter(pk__in=pks).update(
+                    search_vector=search.search_vector()
+                )
+            last_pk = pks[-1]
+            self.stdout.write(f"Updated {total} rows (last id {last_pk})")
+
+        self.stdout.write(self.style.SUCCESS(f"Backfilled {total} apartments."))
@@ -0,0 +1,124 @@
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from apps.apartments.api.renderers import ORJSONRenderer, orjson
+from apps.apartments.api.serializers import ApartmentRowSerializer, ApartmentSerializer
+from apps.apartments.models import Apartment
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks ApartmentSerializer against the values()-based "
+        "ApartmentRowSerializer (and orjson rendering) per list page size. "
+        "Runs on in-memory rows and does not touch the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--page-sizes",
+            default="10,50,100,500",
+            help="Comma-separated page sizes (default: 10,50,100,500).",
+        )
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=1.0,
+            help="Seconds spent on each measurement (default: 1.0).",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            page_sizes = [int(size) for size in options["page_sizes"].split(",")]
+        except ValueError:
+            raise CommandError("--page-sizes must be comma-separated integers.")
+
+        row_serializer = ApartmentRowSerializer()
+        renderer = JSONRenderer()
+        orjson_renderer = ORJSONRenderer()
+        variants = {
+            "ApartmentSerializer + json": lambda instances, rows: renderer.render(
+                ApartmentSerializer(instances, many=True).data
+            ),
+            "ApartmentRowSerializer + json": lambda instances, rows: renderer.render(
+                row_serializer.serialize_many(rows)
+            ),
+        }
+        if orjson is not None:
+            variants["ApartmentRowSerializer + orjson"] = (
+                lambda instances, rows: orjson_renderer.render(
+                    row_serializer.serialize_many(rows)
+                )
+            )
+        else:
+            self.stdout.write("orjson is not installed; skipping orjson rendering.")
+
+        self.stdout.write(
+            f"{'page size':>9}  {'variant':<32} {'pages/s':>10} {'rows/s':>12} {'speedup':>8}"
+        )
+        for page_size in page_sizes:
+            instances, rows = self.build_page(page_size)
+            outputs = {render(instances, rows) for render in variants.values()}
+            if len(outputs) != 1:
+                raise CommandError(f"Serializer outputs differ for page size {page_size}.")
+
+            baseline = None
+            for name, render in variants.items():
+                pages_per_second = self.measure(
+                    lambda: render(instances, rows), options["duration"]
+                )
+                baseline = baseline or pages_per_second
+                self.stdout.write(
+                    f"{page_size:>9}  {name:<32} {pages_per_second:>10.1f} "
+                    f"{pages_per_second * page_size:>12.0f} "
+                    f"{pages_per_second / baseline:>7.2f}x"
+                )
+
+    def build_page(self, page_size):
+        """
+        Returns the same page as model instances and as `values()` rows.
+        """
+        columns = ApartmentRowSerializer().columns
+        owner = get_user_model()(id=1, email="owner@example.com")
+        now = timezone.now()
+        instances = []
+        rows = []
+        for i in range(page_size):
+            instance = Apartment(
+                id=i + 1,
+                name=f"Apartment {i}",
+                slug=f"apartment-{i}-abcdefgh",
+                description="Bright flat with a balcony. " * 5,
+                price=Decimal("1234.50") + i,
+                number_of_rooms=i % 5 + 1,
+                square=Decimal("54.20"),
+                availability=bool(i % 2),
+                owner=owner,
+                created_at=now - timedelta(minutes=i),
+                updated_at=now,
+            )
+            instances.append(instance)
+            row = {
+                column: getattr(instance, column)
+                for column in columns
+                if column != "owner__email"
+            }
+            row["owner__email"] = owner.email
+            rows.append(row)
+        return instances, rows
+
+    def measure(self, func, duration):
+        func()
+        iterations = 0
+        start = time.perf_counter()
+        elapsed = 0.0
+        while elapsed < duration:
+            func()
+            iterations += 1
+            elapsed = time.perf_counter() - start
+        return iterations / elapsed
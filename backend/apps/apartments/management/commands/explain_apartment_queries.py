@@ -0,0 +1,142 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from apps.apartments import search
+from apps.apartments.api.filters import ApartmentFilter
+from apps.apartments.api.pagination import ApartmentCursorPagination
+from apps.apartments.api.views import ApartmentViewSet
+from apps.apartments.models import Apartment
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs EXPLAIN on the queries behind the apartment API and reports the "
+        "indexes each one uses, and the apartment indexes none of them use."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--analyze",
+            action="store_true",
+            help="Run EXPLAIN (ANALYZE, BUFFERS) to show actual timings (PostgreSQL).",
+        )
+        parser.add_argument("--rooms", type=int, default=2)
+        parser.add_argument("--price-min", default="500")
+        parser.add_argument("--price-max", default="2000")
+        parser.add_argument("--lat", type=float, default=50.45)
+        parser.add_argument("--lon", type=float, default=30.52)
+        parser.add_argument("--radius", type=float, default=5, help="Kilometres.")
+        parser.add_argument(
+            "--search",
+            default="cozy",
+            help="Term of the full-text search shape (PostgreSQL only).",
+        )
+
+    def handle(self, *args, **options):
+        queryset = ApartmentViewSet().get_queryset()
+        connection = connections[queryset.db]
+        explain_options = {}
+        if options["analyze"]:
+            if connection.vendor != "postgresql":
+                raise CommandError("--analyze requires PostgreSQL.")
+            explain_options = {"analyze": True, "buffers": True}
+
+        indexes = self.get_index_names(connection)
+        used = set()
+        for name, sql, params in self.get_shapes(queryset, options):
+            plan = self.explain(connection, sql, params, explain_options)
+            shape_indexes = sorted(index for index in indexes if index in plan)
+            used.update(shape_indexes)
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.stdout.write(plan)
+            self.stdout.write(f"Indexes: {', '.join(shape_indexes) or 'none'}\n\n")
+
+        unused = sorted(indexes - used)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Indexes not used by any shape: {', '.join(unused) or 'none'}"
+            )
+        )
+
+    def get_shapes(self, queryset, options):
+        """
+        Yields `(name, sql, params)` for the queries `ApartmentViewSet` runs:
+        the list page and count with common filter combinations, the cursor
+        feed, the radius search, the detail lookup and, on PostgreSQL, the
+        search.
+        """
+        page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+        filters = {
+            "unfiltered": {},
+            "available": {"availability": "true"},
+            "available + rooms": {
+                "availability": "true",
+                "number_of_rooms": options["rooms"],
+            },
+            "available + price": {
+                "availability": "true",
+                "price_min": options["price_min"],
+                "price_max": options["price_max"],
+            },
+            "available + rooms + price": {
+                "availability": "true",
+                "number_of_rooms": options["rooms"],
+                "price_min": options["price_min"],
+                "price_max": options["price_max"],
+            },
+            "available + near": {
+                "availability": "true",
+                "lat": options["lat"],
+                "lon": options["lon"],
+                "radius": options["radius"],
+            },
+        }
+        for label, params in filters.items():
+            filterset = ApartmentFilter(params, queryset=queryset)
+            if not filterset.is_valid():
+                raise CommandError(filterset.errors.as_text())
+            filtered = filterset.qs
+            yield (f"list {label}", *_sql(filtered[:page_size]))
+            count_sql, count_params = _sql(filtered.order_by().values("pk"))
+            yield (
+                f"count {label}",
+                f"SELECT COUNT(*) FROM ({count_sql}) subquery",
+                count_params,
+            )
+            ordering = ApartmentCursorPagination().get_ordering(None, filtered, None)
+            yield (
+                f"cursor {label}",
+                *_sql(filtered.order_by(*ordering)[: page_size + 1]),
+            )
+
+        slug = Apartment.objects.values_list("slug", flat=True).first() or "missing"
+        yield ("detail", *_sql(queryset.filter(slug=slug)))
+        if search.is_supported(queryset):
+            yield (
+                "search",
+                *_sql(
+                    search.search_apartments(queryset, options["search"])[:page_size]
+                ),
+            )
+
+    def get_index_names(self, connection):
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, Apartment._meta.db_table
+            )
+        return {
+            name
+            for name, constraint in constraints.items()
+            if constraint["index"] and not constraint["primary_key"]
+        }
+
+    def explain(self, connection, sql, params, options):
+        prefix = connection.ops.explain_query_prefix(**options)
+        with connection.cursor() as cursor:
+            cursor.execute(f"{prefix} {sql}", params)
+            return "\n".join(str(row[-1]) for row in cursor.fetchall())
+
+
+def _sql(queryset):
+    return queryset.query.sql_with_params()
@@ -0,0 +1,67 @@
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.apartments import export, search
+from apps.apartments.api.filters import ApartmentFilter
+from apps.apartments.models import Apartment
+
+
+class Command(BaseCommand):
+    help = (
+        "Streams apartments matching the API list filters to a file or stdout "
+        "as NDJSON or CSV, optionally gzipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--type", choices=export.EXPORT_TYPES, default="ndjson")
+        parser.add_argument("--gzip", action="store_true", help="Gzip the output.")
+        parser.add_argument(
+            "--output", "-o", help="Output file path (default: stdout)."
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=settings.APARTMENT_EXPORT_CHUNK_SIZE,
+            help="Rows fetched per database round trip.",
+        )
+        parser.add_argument("--availability", choices=["true", "false"])
+        parser.add_argument("--number-of-rooms", type=int)
+        parser.add_argument("--price-min")
+        parser.add_argument("--price-max")
+        parser.add_argument("--search", help="Full-text search term (PostgreSQL).")
+
+    def handle(self, *args, **options):
+        data = {
+            "availability": options["availability"],
+            "number_of_rooms": options["number_of_rooms"],
+            "price_min": options["price_min"],
+            "price_max": options["price_max"],
+        }
+        filterset = ApartmentFilter(
+            data={key: value for key, value in data.items() if value is not None},
+            queryset=Apartment.objects.all(),
+        )
+        if not filterset.is_valid():
+            raise CommandError(filterset.errors.as_text())
+        queryset = filterset.qs
+        if options["search"]:
+            if not search.is_supported(queryset):
+                raise CommandError("--search requires PostgreSQL.")
+            queryset = search.search_apartments(queryset, options["search"])
+
+        blocks = export.stream_export(
+            queryset,
+            export_type=options["type"],
+            gzip=options["gzip"],
+            chunk_size=options["chunk_size"],
+        )
+        if options["output"]:
+            with open(options["output"], "wb") as output:
+                for block in blocks:
+                    output.write(block)
+        else:
+            for block in blocks:
+                sys.stdout.buffer.write(block)
+            sys.stdout.buffer.flush()
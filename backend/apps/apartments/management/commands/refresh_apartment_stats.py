@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.apartments import stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the apartment stats summary of every group, e.g. after "
+        "deploying it on an existing database."
+    )
+
+    def handle(self, *args, **options):
+        refreshed = stats.refresh_stats()
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {refreshed} groups."))
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from apps.apartments import warming
+
+
+class Command(BaseCommand):
+    help = (
+        "Fills the apartment API response cache for the most accessed list pages "
+        "and details, e.g. after a deploy or a cache flush."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--pages", type=int, help="Pages warmed per list (default: settings)."
+        )
+        parser.add_argument(
+            "--lists", type=int, help="Most accessed lists warmed (default: settings)."
+        )
+        parser.add_argument(
+            "--details",
+            type=int,
+            help="Most accessed details warmed (default: settings).",
+        )
+        parser.add_argument(
+            "--url",
+            action="append",
+            default=[],
+            dest="urls",
+            help="Absolute list URL to warm as well; may be repeated.",
+        )
+
+    def handle(self, *args, **options):
+        requests = warming.warm(
+            pages=options["pages"],
+            lists=options["lists"],
+            details=options["details"],
+            urls=options["urls"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Warmed the apartment cache with {requests} requests.")
+        )
@@ -0,0 +1,71 @@
+# Generated by Django 5.2 on 2026-10-18 11:13
+
+import django.contrib.postgres.search
+from django.conf import settings
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION apartments_apartment_search_vector_update()
+RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector({config}::regconfig, COALESCE(NEW.name, '')), 'A') ||
+        setweight(to_tsvector({config}::regconfig, COALESCE(NEW.description, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER apartments_apartment_search_vector_trigger
+BEFORE INSERT OR UPDATE OF name, description ON apartments_apartment
+FOR EACH ROW EXECUTE FUNCTION apartments_apartment_search_vector_update();
+
+CREATE INDEX IF NOT EXISTS apartment_search_vector_idx
+ON apartments_apartment USING gin (search_vector);
+
+CREATE INDEX IF NOT EXISTS apartment_name_trgm_idx
+ON apartments_apartment USING gin (name gin_trgm_ops);
+"""
+
+DROP_TRIGGER_SQL = """
+DROP INDEX IF EXISTS apartment_name_trgm_idx;
+DROP INDEX IF EXISTS apartment_search_vector_idx;
+DROP TRIGGER IF EXISTS apartments_apartment_search_vector_trigger ON apartments_apartment;
+DROP FUNCTION IF EXISTS apartments_apartment_search_vector_update();
+"""
+
+
+def create_search_trigger(apps, schema_editor):
+    """
+    Creates the trigger maintaining `search_vector` and the GIN indexes.
+
+    These are PostgreSQL-only and not part of the model state, so other
+    databases (e.g. SQLite in local runs) are left untouched.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    config = schema_editor.quote_value(settings.APARTMENT_SEARCH_CONFIG)
+    schema_editor.execute(TRIGGER_SQL.format(config=config))
+
+
+def drop_search_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(DROP_TRIGGER_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apartments', '0004_apartment_created_at_id_idx'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='apartment',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_trigger, drop_search_trigger),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 5.2 on 2026-10-18 11:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("apartments", "0005_apartment_search_vector"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ApartmentStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "number_of_rooms",
+                    models.PositiveIntegerField(verbose_name="Number of rooms"),
+                ),
+                ("availability", models.BooleanField(verbose_name="Availability")),
+                ("count", models.PositiveIntegerField(verbose_name="Count")),
+                (
+                    "avg_price",
+                    models.DecimalField(
+                        decimal_places=2, max_digits=10, verbose_name="Average price"
+                    ),
+                ),
+                (
+                    "median_price",
+                    models.DecimalField(
+                        decimal_places=2, max_digits=10, verbose_name="Median price"
+                    ),
+                ),
+                (
+                    "min_price",
+                    models.DecimalField(
+                        decimal_places=2, max_digits=8, verbose_name="Minimum price"
+                    ),
+                ),
+                (
+                    "max_price",
+                    models.DecimalField(
+                        decimal_places=2, max_digits=8, verbose_name="Maximum price"
+                    ),
+                ),
+                (
+                    "avg_price_per_m2",
+                    models.DecimalField(
+                        decimal_places=2,
+                        max_digits=12,
+                        verbose_name="Average price per m²",
+                    ),
+                ),
+                ("refreshed_at", models.DateTimeField(verbose_name="Refreshed at")),
+            ],
+            options={
+                "verbose_name": "Apartment stats",
+                "verbose_name_plural": "Apartment stats",
+                "ordering": ["number_of_rooms", "availability"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("number_of_rooms", "availability"),
+                        name="apartment_stats_group_unique",
+                    )
+                ],
+            },
+        ),
+    ]
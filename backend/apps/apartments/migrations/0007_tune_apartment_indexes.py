@@ -0,0 +1,60 @@
+# Generated by Django 5.2 on 2026-10-18 11:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("apartments", "0006_apartmentstats"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="apartment",
+            name="price_availability_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="apartment",
+            name="slug_idx",
+        ),
+        migrations.AlterField(
+            model_name="apartment",
+            name="availability",
+            field=models.BooleanField(default=True, verbose_name="Availability"),
+        ),
+        migrations.AlterField(
+            model_name="apartment",
+            name="name",
+            field=models.CharField(max_length=100, verbose_name="Name"),
+        ),
+        migrations.AlterField(
+            model_name="apartment",
+            name="number_of_rooms",
+            field=models.PositiveIntegerField(verbose_name="Number of rooms"),
+        ),
+        migrations.AlterField(
+            model_name="apartment",
+            name="price",
+            field=models.DecimalField(
+                decimal_places=2, max_digits=8, verbose_name="Price"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="apartment",
+            index=models.Index(
+                condition=models.Q(("availability", True)),
+                fields=["number_of_rooms", "-created_at", "-id"],
+                include=("price",),
+                name="available_rooms_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="apartment",
+            index=models.Index(
+                condition=models.Q(("availability", True)),
+                fields=["price"],
+                name="available_price_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2 on 2026-10-18 11:50
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("apartments", "0007_tune_apartment_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="apartment",
+            name="geo_cell",
+            field=models.BigIntegerField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="apartment",
+            name="latitude",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=6,
+                max_digits=9,
+                null=True,
+                validators=[
+                    django.core.validators.MinValueValidator(-90),
+                    django.core.validators.MaxValueValidator(90),
+                ],
+                verbose_name="Latitude",
+            ),
+        ),
+        migrations.AddField(
+            model_name="apartment",
+            name="longitude",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=6,
+                max_digits=9,
+                null=True,
+                validators=[
+                    django.core.validators.MinValueValidator(-180),
+                    django.core.validators.MaxValueValidator(180),
+                ],
+                verbose_name="Longitude",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="apartment",
+            index=models.Index(
+                condition=models.Q(("geo_cell__isnull", False)),
+                fields=["geo_cell", "latitude", "longitude"],
+                name="geo_cell_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,96 @@
+# Generated by Django 5.2 on 2026-10-18 11:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("apartments", "0008_apartment_location"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ApartmentImage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "original",
+                    models.FileField(
+                        upload_to="apartments/originals/%Y/%m/", verbose_name="Original"
+                    ),
+                ),
+                (
+                    "position",
+                    models.PositiveSmallIntegerField(
+                        default=0, verbose_name="Position"
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("ready", "Ready"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=10,
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "width",
+                    models.PositiveIntegerField(
+                        blank=True, null=True, verbose_name="Width"
+                    ),
+                ),
+                (
+                    "height",
+                    models.PositiveIntegerField(
+                        blank=True, null=True, verbose_name="Height"
+                    ),
+                ),
+                (
+                    "thumbnails",
+                    models.JSONField(
+                        blank=True, default=dict, verbose_name="Thumbnails"
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created at"),
+                ),
+                (
+                    "apartment",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="images",
+                        to="apartments.apartment",
+                        verbose_name="Apartment",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Apartment image",
+                "verbose_name_plural": "Apartment images",
+                "ordering": ["position", "id"],
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("status", "ready")),
+                        fields=["apartment", "position", "id"],
+                        name="apartment_ready_images_idx",
+                    )
+                ],
+            },
+        ),
+    ]
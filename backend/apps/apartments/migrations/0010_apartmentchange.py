@@ -0,0 +1,78 @@
+# Generated by Django 5.2 on 2026-10-18 11:58
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("apartments", "0009_apartmentimage"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ApartmentChange",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("apartment_id", models.BigIntegerField(verbose_name="Apartment id")),
+                ("slug", models.SlugField(db_index=False, verbose_name="Slug")),
+                (
+                    "action",
+                    models.CharField(
+                        choices=[
+                            ("created", "Created"),
+                            ("updated", "Updated"),
+                            ("deleted", "Deleted"),
+                        ],
+                        max_length=10,
+                        verbose_name="Action",
+                    ),
+                ),
+                (
+                    "payload",
+                    models.JSONField(
+                        encoder=django.core.serializers.json.DjangoJSONEncoder,
+                        null=True,
+                        verbose_name="Payload",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created at"),
+                ),
+                (
+                    "sequence",
+                    models.BigIntegerField(
+                        editable=False, null=True, unique=True, verbose_name="Sequence"
+                    ),
+                ),
+                (
+                    "published_at",
+                    models.DateTimeField(
+                        editable=False, null=True, verbose_name="Published at"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Apartment change",
+                "verbose_name_plural": "Apartment changes",
+                "ordering": ["id"],
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("sequence__isnull", True)),
+                        fields=["id"],
+                        name="apartment_change_pending_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -1,45 +1,87 @@
 from django.db import models
 from django.conf import settings
-from django.utils.text import slugify
+from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import IntegrityError, transaction
 from django.utils.translation import gettext_lazy as _
 
+from apps.apartments import geo
+from apps.apartments.slugs import SLUG_ATTEMPTS, SLUG_MAX_LENGTH, allocate_slug
+
 
 class Apartment(models.Model):
     """
     Represents an apartment available for rent.
     """
 
-    name = models.CharField(max_length=100, db_index=True, verbose_name=_("Name"))
-    slug = models.SlugField(unique=True, verbose_name=_("Slug"))
-    description = models.TextField(verbose_name=_("Description"))
-    price = models.DecimalField(
-        max_digits=8, decimal_places=2, db_index=True, verbose_name=_("Price")
-    )
-    number_of_rooms = models.PositiveIntegerField(
-        db_index=True, verbose_name=_("Number of rooms")
+    name = models.CharField(max_length=100, verbose_name=_("Name"))
+    slug = models.SlugField(
+        max_length=SLUG_MAX_LENGTH, unique=True, verbose_name=_("Slug")
     )
+    description = models.TextField(verbose_name=_("Description"))
+    price = models.DecimalField(max_digits=8, decimal_places=2, verbose_name=_("Price"))
+    number_of_rooms = models.PositiveIntegerField(verbose_name=_("Number of rooms"))
     square = models.DecimalField(
         max_digits=6, decimal_places=2, verbose_name=_("Square")
     )
-    availability = models.BooleanField(
-        default=True, db_index=True, verbose_name=_("Availability")
-    )
+    availability = models.BooleanField(default=True, verbose_name=_("Availability"))
     owner = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
         related_name="apartments",
         verbose_name=_("Owner"),
     )
+    latitude = models.DecimalField(
+        max_digits=9,
+        decimal_places=6,
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-90), MaxValueValidator(90)],
+        verbose_name=_("Latitude"),
+    )
+    longitude = models.DecimalField(
+        max_digits=9,
+        decimal_places=6,
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-180), MaxValueValidator(180)],
+        verbose_name=_("Longitude"),
+    )
+    # Grid cell of the coordinates (see `apps.apartments.geo`), kept in sync by
+    # `save()`; geo searches look candidates up by cell through `geo_cell_idx`.
+    geo_cell = models.BigIntegerField(null=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created at"))
     updated_at = models.DateTimeField(auto_now=True, verbose_name=_("Updated at"))
+    # Maintained by a database trigger on PostgreSQL (see migration 0005), which
+    # also creates its GIN index. Use `manage.py backfill_search_vector` for
+    # rows written before the trigger existed.
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
+        # Matched to the list query shapes; `manage.py explain_apartment_queries`
+        # shows the plan of each. The feed is read newest first, and filtered
+        # lists almost always ask for available apartments, so the filter
+        # indexes are partial on `availability = true`.
         indexes = [
+            models.Index(fields=["-created_at", "-id"], name="created_at_id_idx"),
+            models.Index(
+                fields=["number_of_rooms", "-created_at", "-id"],
+                include=["price"],
+                condition=models.Q(availability=True),
+                name="available_rooms_created_idx",
+            ),
+            models.Index(
+                fields=["price"],
+                condition=models.Q(availability=True),
+                name="available_price_idx",
+            ),
             models.Index(
-                fields=["price", "availability"], name="price_availability_idx"
+                fields=["geo_cell", "latitude", "longitude"],
+                condition=models.Q(geo_cell__isnull=False),
+                name="geo_cell_idx",
             ),
-            models.Index(fields=["slug"], name="slug_idx"),
         ]
         ordering = ["-created_at"]
         verbose_name = _("Apartment")
@@ -68,27 +110,65 @@ class Apartment(models.Model):
                 _("Price must be greater than or equal to zero."), code="invalid_price"
             )
 
+        if (self.latitude is None) != (self.longitude is None):
+            field = "longitude" if self.longitude is None else "latitude"
+            errors[field] = ValidationError(
+                _("Latitude and longitude must be set together."),
+                code="incomplete_location",
+            )
+
         if errors:
             raise ValidationError(errors)
 
+    def update_geo_cell(self):
+        """
+        Sets `geo_cell` from the coordinates. Called by `save()`; code writing
+        apartments with `bulk_create`/`bulk_update` must call it itself.
+        """
+        self.geo_cell = geo.cell_of(self.latitude, self.longitude)
+
     def save(self, *args, **kwargs):
         """
         Saves the apartment instance to the database.
 
-        Automatically generates a slug from the name if one is not provided.
-        Performs full validation before saving.
+        Automatically allocates a unique slug from the name if one is not provided
+        and updates the grid cell of the coordinates. Performs full validation
+        before saving.
+
+        An allocated slug is not looked up beforehand: in the unlikely event it
+        is already taken, the insert is retried in a savepoint with a new one,
+        up to `SLUG_ATTEMPTS` times.
         """
-        if not self.slug:
-            self.slug = slugify(self.name)
+        allocated = not self.slug
+        if allocated:
+            self.slug = allocate_slug(self.name)
+        self.update_geo_cell()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"latitude", "longitude"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "geo_cell"}
         try:
-            self.full_clean()
+            self.full_clean(exclude=["slug"] if allocated else None)
         except ValidationError as e:
             import logging
 
             logger = logging.getLogger(__name__)
             logger.error(f"Validation error: {e.messages}")
             raise e
-        super().save(*args, **kwargs)
+        if not allocated:
+            super().save(*args, **kwargs)
+            return
+        for attempt in range(SLUG_ATTEMPTS):
+            try:
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+                return
+            except IntegrityError:
+                if (
+                    attempt == SLUG_ATTEMPTS - 1
+                    or not Apartment.objects.filter(slug=self.slug).exists()
+                ):
+                    raise
+                self.slug = allocate_slug(self.name)
 
     def __str__(self):
         """
@@ -106,3 +186,155 @@ class Apartment(models.Model):
         from django.urls import reverse
 
         return reverse("apartment_detail", kwargs={"slug": self.slug})
+
+
+class ApartmentStats(models.Model):
+    """
+    Precomputed price statistics of the apartments with a given number of rooms
+    and availability, served by the apartment stats endpoint.
+
+    Rows are maintained by `apps.apartments.stats.refresh_stats`: the groups
+    touched by a write are recomputed shortly after it commits, and every group
+    is recomputed periodically by Celery beat.
+    """
+
+    number_of_rooms = models.PositiveIntegerField(verbose_name=_("Number of rooms"))
+    availability = models.BooleanField(verbose_name=_("Availability"))
+    count = models.PositiveIntegerField(verbose_name=_("Count"))
+    avg_price = models.DecimalField(
+        max_digits=10, decimal_places=2, verbose_name=_("Average price")
+    )
+    median_price = models.DecimalField(
+        max_digits=10, decimal_places=2, verbose_name=_("Median price")
+    )
+    min_price = models.DecimalField(
+        max_digits=8, decimal_places=2, verbose_name=_("Minimum price")
+    )
+    max_price = models.DecimalField(
+        max_digits=8, decimal_places=2, verbose_name=_("Maximum price")
+    )
+    avg_price_per_m2 = models.DecimalField(
+        max_digits=12, decimal_places=2, verbose_name=_("Average price per m²")
+    )
+    refreshed_at = models.DateTimeField(verbose_name=_("Refreshed at"))
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["number_of_rooms", "availability"],
+                name="apartment_stats_group_unique",
+            )
+        ]
+        ordering = ["number_of_rooms", "availability"]
+        verbose_name = _("Apartment stats")
+        verbose_name_plural = _("Apartment stats")
+
+    def __str__(self):
+        return f"{self.number_of_rooms} rooms, available={self.availability}"
+
+
+class ApartmentImage(models.Model):
+    """
+    A photo of an apartment.
+
+    The uploaded file is kept as `original`; WebP thumbnails in the sizes of
+    `APARTMENT_IMAGE_SIZES` are generated from it by a Celery task (see
+    `apps.apartments.images`) and their storage names recorded in `thumbnails`.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", _("Pending")
+        READY = "ready", _("Ready")
+        FAILED = "failed", _("Failed")
+
+    apartment = models.ForeignKey(
+        Apartment,
+        on_delete=models.CASCADE,
+        related_name="images",
+        verbose_name=_("Apartment"),
+    )
+    original = models.FileField(
+        upload_to="apartments/originals/%Y/%m/", verbose_name=_("Original")
+    )
+    position = models.PositiveSmallIntegerField(default=0, verbose_name=_("Position"))
+    status = models.CharField(
+        max_length=10,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name=_("Status"),
+    )
+    width = models.PositiveIntegerField(null=True, blank=True, verbose_name=_("Width"))
+    height = models.PositiveIntegerField(
+        null=True, blank=True, verbose_name=_("Height")
+    )
+    # Storage name of each thumbnail, keyed by size name.
+    thumbnails = models.JSONField(
+        default=dict, blank=True, verbose_name=_("Thumbnails")
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created at"))
+
+    class Meta:
+        ordering = ["position", "id"]
+        indexes = [
+            models.Index(
+                fields=["apartment", "position", "id"],
+                condition=models.Q(status="ready"),
+                name="apartment_ready_images_idx",
+            ),
+        ]
+        verbose_name = _("Apartment image")
+        verbose_name_plural = _("Apartment images")
+
+    def __str__(self):
+        return f"{self.apartment_id}: {self.original.name}"
+
+
+class ApartmentChange(models.Model):
+    """
+    A change to an apartment, written to this outbox table in the transaction
+    that makes it (see `apps.apartments.outbox`).
+
+    Changes are published in batches by a Celery relay task, which gives them
+    consecutive `sequence` numbers in commit order; consumers read the change
+    feed by sequence.
+    """
+
+    class Action(models.TextChoices):
+        CREATED = "created", _("Created")
+        UPDATED = "updated", _("Updated")
+        DELETED = "deleted", _("Deleted")
+
+    # Not a foreign key: changes outlive the apartments they describe.
+    apartment_id = models.BigIntegerField(verbose_name=_("Apartment id"))
+    slug = models.SlugField(
+        max_length=SLUG_MAX_LENGTH, db_index=False, verbose_name=_("Slug")
+    )
+    action = models.CharField(
+        max_length=10, choices=Action.choices, verbose_name=_("Action")
+    )
+    # The apartment's fields after the change; None for deletions.
+    payload = models.JSONField(
+        null=True, encoder=DjangoJSONEncoder, verbose_name=_("Payload")
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created at"))
+    sequence = models.BigIntegerField(
+        null=True, unique=True, editable=False, verbose_name=_("Sequence")
+    )
+    published_at = models.DateTimeField(
+        null=True, editable=False, verbose_name=_("Published at")
+    )
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(
+                fields=["id"],
+                condition=models.Q(sequence__isnull=True),
+                name="apartment_change_pending_idx",
+            ),
+        ]
+        verbose_name = _("Apartment change")
+        verbose_name_plural = _("Apartment changes")
+
+    def __str__(self):
+        return f"{self.action} {self.slug}"
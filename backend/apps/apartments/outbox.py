@@ -0,0 +1,204 @@
+import json
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from apps.apartments.models import ApartmentChange
+
+logger = logging.getLogger(__name__)
+
+# Apartment fields copied into the payload of created and updated changes.
+PAYLOAD_FIELDS = (
+    "name",
+    "slug",
+    "description",
+    "price",
+    "number_of_rooms",
+    "square",
+    "availability",
+    "latitude",
+    "longitude",
+    "owner_id",
+    "created_at",
+    "updated_at",
+)
+RELAY_PENDING_KEY = "apartments:changes:relay-pending"
+# Redis stream written by `publish_to_redis_stream`.
+REDIS_STREAM = "apartments:changes"
+
+
+def snapshot(instance):
+    """
+    Returns the payload of a change to `instance`: its `PAYLOAD_FIELDS`.
+    """
+    return {field: getattr(instance, field) for field in PAYLOAD_FIELDS}
+
+
+def record(instances, action, using=None):
+    """
+    Writes one `action` change per apartment in `instances` to the outbox.
+
+    Call it inside the transaction of the write, so the changes commit (or roll
+    back) with it; the relay is queued once the transaction commits.
+    """
+    changes = [
+        ApartmentChange(
+            apartment_id=instance.pk,
+            slug=instance.slug,
+            action=action,
+            payload=(
+                None if action == ApartmentChange.Action.DELETED else snapshot(instance)
+            ),
+        )
+        for instance in instances
+    ]
+    if not changes:
+        return
+    ApartmentChange.objects.using(using).bulk_create(
+        changes, batch_size=settings.APARTMENT_BULK_CHUNK_SIZE
+    )
+    transaction.on_commit(_enqueue_relay, using=using)
+
+
+def _enqueue_relay():
+    from apps.apartments.tasks import relay_apartment_changes
+
+    delay = settings.APARTMENT_OUTBOX_RELAY_DELAY
+    if not cache.add(RELAY_PENDING_KEY, True, timeout=delay + 60):
+        return
+    try:
+        relay_apartment_changes.apply_async(countdown=delay)
+    except Exception:
+        # The periodic relay catches up if the broker is unavailable.
+        logger.exception("Could not queue the apartment change relay")
+        clear_pending()
+
+
+def clear_pending():
+    """
+    Forgets that the relay is queued, so that changes written while it runs
+    queue it again.
+    """
+    cache.delete(RELAY_PENDING_KEY)
+
+
+def latest_sequence():
+    """
+    Returns the sequence of the last published change, or 0.
+    """
+    return ApartmentChange.objects.aggregate(last=Max("sequence"))["last"] or 0
+
+
+def get_publishers():
+    return [import_string(path) for path in settings.APARTMENT_OUTBOX_PUBLISHERS]
+
+
+def relay_batch(batch_size=None):
+    """
+    Publishes the oldest unpublished changes, at most `batch_size`
+    (`APARTMENT_OUTBOX_BATCH_SIZE` by default). Returns how many there were.
+
+    The batch is locked, numbered after the last published change and handed
+    to each of `APARTMENT_OUTBOX_PUBLISHERS` in one transaction: a publisher
+    error rolls the batch back for the next run to retry, so delivery is
+    at-least-once. Numbering at publish time rather than at insert time means
+    a change that commits late still gets a sequence above every change
+    already served by the feed.
+    """
+    batch_size = batch_size or settings.APARTMENT_OUTBOX_BATCH_SIZE
+    with transaction.atomic():
+        changes = list(
+            ApartmentChange.objects.filter(sequence__isnull=True)
+            .order_by("id")
+            .select_for_update()[:batch_size]
+        )
+        if not changes:
+            return 0
+        last = latest_sequence()
+        now = timezone.now()
+        for sequence, change in enumerate(changes, start=last + 1):
+            change.sequence = sequence
+            change.published_at = now
+        ApartmentChange.objects.bulk_update(changes, ["sequence", "published_at"])
+        for publish in get_publishers():
+            publish(changes)
+    return len(changes)
+
+
+def relay(max_batches=None):
+    """
+    Publishes unpublished changes batch by batch until none are left, or
+    `max_batches` batches were published. Returns the number of changes.
+    """
+    published = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        count = relay_batch()
+        published += count
+        batches += 1
+        if count < settings.APARTMENT_OUTBOX_BATCH_SIZE:
+            break
+    return published
+
+
+def prune():
+    """
+    Deletes the changes published more than `APARTMENT_OUTBOX_RETENTION_DAYS`
+    days ago. Returns the number deleted.
+    """
+    cutoff = timezone.now() - timedelta(days=settings.APARTMENT_OUTBOX_RETENTION_DAYS)
+    deleted, _ = ApartmentChange.objects.filter(published_at__lt=cutoff).delete()
+    return deleted
+
+
+def is_expired(since):
+    """
+    Returns True if changes after `since` were already pruned, so a consumer
+    at that position must resynchronize from a full export.
+    """
+    first = ApartmentChange.objects.aggregate(first=Min("sequence"))["first"]
+    return first is not None and first > since + 1
+
+
+def changes_since(since, limit):
+    """
+    Returns up to `limit` published changes after sequence `since`, in order.
+    """
+    return list(
+        ApartmentChange.objects.filter(sequence__gt=since).order_by("sequence")[:limit]
+    )
+
+
+def publish_to_redis_stream(changes):
+    """
+    Publisher appending each change to the `REDIS_STREAM` Redis stream, capped
+    at about `APARTMENT_OUTBOX_STREAM_MAXLEN` entries. Requires the django-redis
+    cache backend.
+    """
+    from django_redis import get_redis_connection
+
+    from apps.apartments.api.serializers import ApartmentChangeSerializer
+
+    pipeline = get_redis_connection("default").pipeline(transaction=False)
+    for change in changes:
+        pipeline.xadd(
+            REDIS_STREAM,
+            {"event": json.dumps(ApartmentChangeSerializer(change).data)},
+            maxlen=settings.APARTMENT_OUTBOX_STREAM_MAXLEN,
+            approximate=True,
+        )
+    pipeline.execute()
+
+
+def publish_to_log(changes):
+    """
+    Publisher logging each change, for development.
+    """
+    for change in changes:
+        logger.info(f"Apartment change {change.sequence}: {change}")
@@ -0,0 +1,73 @@
+from django.conf import settings
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramWordSimilarity,
+)
+from django.db import connections
+from django.db.models import F
+
+
+def is_supported(queryset):
+    """
+    Returns True if the database behind `queryset` supports full-text search.
+    """
+    return connections[queryset.db].vendor == "postgresql"
+
+
+def search_vector():
+    """
+    Returns the expression stored in `Apartment.search_vector`.
+
+    It must stay in sync with the trigger created in migration
+    0005_apartment_search_vector, which maintains the column on INSERT/UPDATE.
+    """
+    config = settings.APARTMENT_SEARCH_CONFIG
+    return SearchVector("name", weight="A", config=config) + SearchVector(
+        "description", weight="B", config=config
+    )
+
+
+def search_apartments(queryset, term, fuzzy=False):
+    """
+    Filters `queryset` down to apartments matching `term`, best matches first.
+
+    Matches are found through the GIN-indexed `search_vector` column and ranked
+    with `ts_rank`. When `fuzzy` is set and nothing matches (typically a typo),
+    the name is matched by trigram word similarity instead, which is backed by
+    a trigram GIN index.
+    """
+    results = _ranked_matches(queryset, term)
+    if not fuzzy or results.exists():
+        return results
+    return _fuzzy_matches(queryset, term)
+
+
+async def asearch_apartments(queryset, term, fuzzy=False):
+    """
+    Async variant of `search_apartments`.
+    """
+    results = _ranked_matches(queryset, term)
+    if not fuzzy or await results.aexists():
+        return results
+    return _fuzzy_matches(queryset, term)
+
+
+def _ranked_matches(queryset, term):
+    query = SearchQuery(
+        term, search_type="websearch", config=settings.APARTMENT_SEARCH_CONFIG
+    )
+    return (
+        queryset.filter(search_vector=query)
+        .annotate(search_rank=SearchRank(F("search_vector"), query))
+        .order_by("-search_rank", "-created_at")
+    )
+
+
+def _fuzzy_matches(queryset, term):
+    return (
+        queryset.filter(name__trigram_word_similar=term)
+        .annotate(search_rank=TrigramWordSimilarity(term, "name"))
+        .order_by("-search_rank", "-created_at")
+    )
@@ -0,0 +1,95 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.apartments import cache as apartment_cache
+from apps.apartments import images, outbox, stats
+from apps.apartments.models import Apartment, ApartmentChange, ApartmentImage
+
+
+@receiver(post_save, sender=Apartment)
+@receiver(post_delete, sender=Apartment)
+def invalidate_apartment_cache(sender, instance, using, **kwargs):
+    """
+    Bumps the cache versions of the changed apartment once the write commits.
+
+    Bumping before the commit would let a concurrent reader store the old row
+    under the new version.
+    """
+    transaction.on_commit(
+        lambda: apartment_cache.invalidate_apartments([instance.slug]), using=using
+    )
+
+
+@receiver(post_init, sender=Apartment)
+def remember_stats_group(sender, instance, **kwargs):
+    """
+    Remembers the stats group an apartment had when it was loaded, so a save
+    that moves it to another group refreshes both.
+    """
+    instance._stats_group = stats.group_of(instance)
+
+
+@receiver(post_save, sender=Apartment)
+@receiver(post_delete, sender=Apartment)
+def refresh_apartment_stats(sender, instance, using, created=False, **kwargs):
+    """
+    Queues a refresh of the stats groups the apartment left and joined.
+    """
+    groups = {stats.group_of(instance)}
+    if not created:
+        groups.add(instance._stats_group)
+    instance._stats_group = stats.group_of(instance)
+    stats.schedule_refresh(None if None in groups else groups, using=using)
+
+
+@receiver(post_save, sender=Apartment)
+def record_apartment_save(sender, instance, created, using, **kwargs):
+    """
+    Writes the created or updated apartment to the change outbox, in the
+    transaction of the save.
+    """
+    action = (
+        ApartmentChange.Action.CREATED if created else ApartmentChange.Action.UPDATED
+    )
+    outbox.record([instance], action, using=using)
+
+
+@receiver(post_delete, sender=Apartment)
+def record_apartment_delete(sender, instance, using, **kwargs):
+    """
+    Writes the deleted apartment to the change outbox, in the transaction of
+    the deletion.
+    """
+    outbox.record([instance], ApartmentChange.Action.DELETED, using=using)
+
+
+@receiver(post_save, sender=ApartmentImage)
+@receiver(post_delete, sender=ApartmentImage)
+def invalidate_apartment_image_cache(sender, instance, using, **kwargs):
+    """
+    Bumps the cache versions of the apartment whose images changed, since list
+    and detail responses embed the thumbnails, and its `updated_at`, which the
+    detail validators (`ETag`, `Last-Modified`) are derived from.
+    """
+    apartments = Apartment.objects.using(using).filter(pk=instance.apartment_id)
+    apartments.update(updated_at=timezone.now())
+    slug = apartments.values_list("slug", flat=True).first()
+    transaction.on_commit(
+        lambda: apartment_cache.invalidate_apartments([slug] if slug else []),
+        using=using,
+    )
+
+
+@receiver(post_delete, sender=ApartmentImage)
+def delete_apartment_image_files(sender, instance, using, **kwargs):
+    """
+    Deletes the stored files of a deleted image once the deletion commits.
+    """
+    from apps.apartments.tasks import delete_apartment_image_files
+
+    names = images.storage_names(instance)
+    transaction.on_commit(
+        lambda: delete_apartment_image_files.delay(names), using=using
+    )
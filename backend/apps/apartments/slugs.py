@@ -0,0 +1,52 @@
+import base64
+import secrets
+
+from django.utils.text import slugify
+
+SLUG_MAX_LENGTH = 50
+SUFFIX_BYTES = 5
+# Eight base32 characters carry 40 random bits.
+SUFFIX_LENGTH = 8
+FALLBACK_BASE = "apartment"
+# Inserts tried with a fresh slug before a slug collision is given up on.
+SLUG_ATTEMPTS = 5
+
+
+def _suffix():
+    return base64.b32encode(secrets.token_bytes(SUFFIX_BYTES)).decode().lower()
+
+
+def _base(name):
+    base = slugify(name)[: SLUG_MAX_LENGTH - SUFFIX_LENGTH - 1].strip("-")
+    return base or FALLBACK_BASE
+
+
+def allocate_slug(name):
+    """
+    Returns a unique slug for an apartment called `name`, without any query.
+
+    The slug is the slugified name followed by a random 40-bit suffix, e.g.
+    `cozy-studio-k3x9f2ab`. Apartments sharing a name no longer compete for
+    the same slug, so concurrent writers need not read the table first; two
+    identical names collide with a probability of about n² / 2⁴¹, and
+    `Apartment.save` retries with a new slug when the unique constraint
+    reports one.
+    """
+    return f"{_base(name)}-{_suffix()}"
+
+
+def allocate_slugs(names):
+    """
+    Returns one unique slug per name, for `bulk_create` and seeding paths.
+
+    Slugs are guaranteed to be distinct within the batch.
+    """
+    slugs = []
+    seen = set()
+    for name in names:
+        slug = allocate_slug(name)
+        while slug in seen:
+            slug = allocate_slug(name)
+        seen.add(slug)
+        slugs.append(slug)
+    return slugs
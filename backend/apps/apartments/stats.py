@@ -0,0 +1,224 @@
+import itertools
+import logging
+import operator
+import statistics
+from decimal import Decimal
+from functools import reduce
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.db.models import (
+    Aggregate,
+    Avg,
+    Count,
+    DecimalField,
+    F,
+    FloatField,
+    Max,
+    Min,
+    Q,
+)
+from django.utils import timezone
+
+from apps.apartments.models import Apartment, ApartmentStats
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "apartments:stats"
+# Fields an `ApartmentStats` row is grouped by.
+GROUP_FIELDS = ("number_of_rooms", "availability")
+STAT_FIELDS = (
+    "count",
+    "avg_price",
+    "median_price",
+    "min_price",
+    "max_price",
+    "avg_price_per_m2",
+)
+CENT = Decimal("0.01")
+
+
+class Median(Aggregate):
+    """
+    Median of a numeric expression, using PostgreSQL's ordered-set aggregate.
+    """
+
+    function = "PERCENTILE_CONT"
+    name = "Median"
+    template = "%(function)s(0.5) WITHIN GROUP (ORDER BY %(expressions)s)"
+    output_field = FloatField()
+
+
+def group_of(instance):
+    """
+    Returns the `(number_of_rooms, availability)` group of an apartment, or
+    None when one of the fields was not loaded.
+    """
+    values = instance.__dict__
+    if any(field not in values for field in GROUP_FIELDS):
+        return None
+    return tuple(values[field] for field in GROUP_FIELDS)
+
+
+def _groups_filter(groups):
+    return reduce(
+        operator.or_,
+        (Q(**dict(zip(GROUP_FIELDS, group))) for group in groups),
+        Q(pk__in=[]),
+    )
+
+
+def _round(value):
+    return None if value is None else Decimal(str(value)).quantize(CENT)
+
+
+def aggregate_groups(queryset):
+    """
+    Computes the statistics of `queryset` per `(number_of_rooms, availability)`.
+
+    Returns dicts with the `GROUP_FIELDS` and `STAT_FIELDS` keys, ordered by
+    group. Everything but the median is computed in one grouped query; the
+    median needs `PERCENTILE_CONT` on PostgreSQL and a second, ordered query
+    on other databases.
+    """
+    queryset = queryset.order_by()
+    aggregates = {
+        "count": Count("id"),
+        "avg_price": Avg("price"),
+        "min_price": Min("price"),
+        "max_price": Max("price"),
+        "avg_price_per_m2": Avg(
+            F("price") / F("square"),
+            output_field=DecimalField(max_digits=12, decimal_places=2),
+        ),
+    }
+    postgres = connections[queryset.db].vendor == "postgresql"
+    if postgres:
+        aggregates["median_price"] = Median("price")
+    rows = list(
+        queryset.values(*GROUP_FIELDS).annotate(**aggregates).order_by(*GROUP_FIELDS)
+    )
+
+    if not postgres:
+        medians = {
+            group: statistics.median(price for *_, price in prices)
+            for group, prices in itertools.groupby(
+                queryset.values_list(*GROUP_FIELDS, "price").order_by(
+                    *GROUP_FIELDS, "price"
+                ),
+                key=operator.itemgetter(0, 1),
+            )
+        }
+        for row in rows:
+            row["median_price"] = medians[tuple(row[field] for field in GROUP_FIELDS)]
+
+    for row in rows:
+        for field in STAT_FIELDS[1:]:
+            row[field] = _round(row[field])
+    return rows
+
+
+def summarize(rows):
+    """
+    Combines per-group statistics into totals over every group in `rows`.
+
+    The median cannot be derived from per-group medians and is left out.
+    """
+    count = sum(row["count"] for row in rows)
+    if not count:
+        return {field: None for field in GROUP_FIELDS + STAT_FIELDS} | {"count": 0}
+    return {
+        "number_of_rooms": None,
+        "availability": None,
+        "count": count,
+        "avg_price": _round(
+            sum(row["avg_price"] * row["count"] for row in rows) / count
+        ),
+        "median_price": None,
+        "min_price": min(row["min_price"] for row in rows),
+        "max_price": max(row["max_price"] for row in rows),
+        "avg_price_per_m2": _round(
+            sum(row["avg_price_per_m2"] * row["count"] for row in rows) / count
+        ),
+    }
+
+
+def refresh_stats(groups=None):
+    """
+    Recomputes the `ApartmentStats` rows of `groups`, or of every group.
+
+    Groups without apartments lose their row. Returns the number of groups
+    written.
+    """
+    queryset = Apartment.objects.all()
+    stats = ApartmentStats.objects.all()
+    if groups is not None:
+        groups = {tuple(group) for group in groups}
+        queryset = queryset.filter(_groups_filter(groups))
+        stats = stats.filter(_groups_filter(groups))
+
+    rows = aggregate_groups(queryset)
+    now = timezone.now()
+    with transaction.atomic():
+        computed = {tuple(row[field] for field in GROUP_FIELDS) for row in rows}
+        stale = set(stats.values_list(*GROUP_FIELDS)) - computed
+        if stale:
+            ApartmentStats.objects.filter(_groups_filter(stale)).delete()
+        ApartmentStats.objects.bulk_create(
+            [ApartmentStats(refreshed_at=now, **row) for row in rows],
+            update_conflicts=True,
+            unique_fields=GROUP_FIELDS,
+            update_fields=STAT_FIELDS + ("refreshed_at",),
+        )
+    return len(rows)
+
+
+def _pending_key(group):
+    suffix = "all" if group is None else ":".join(str(value) for value in group)
+    return f"{CACHE_PREFIX}:pending:{suffix}"
+
+
+def clear_pending(groups=None):
+    """
+    Forgets that `groups` are queued for a refresh, so that writes made while
+    they are being recomputed queue them again.
+    """
+    cache.delete_many([_pending_key(group) for group in groups or [None]])
+
+
+def schedule_refresh(groups=None, using=None):
+    """
+    Queues a refresh of `groups` (every group if None) once the current
+    transaction commits.
+
+    Refreshes run `APARTMENT_STATS_REFRESH_DELAY` seconds later in Celery, and
+    a group that is already queued is not queued again, so a burst of writes
+    costs one recomputation per touched group.
+    """
+    if groups is not None:
+        groups = sorted({tuple(group) for group in groups})
+        if not groups:
+            return
+    transaction.on_commit(lambda: _enqueue(groups), using=using)
+
+
+def _enqueue(groups):
+    from apps.apartments.tasks import refresh_apartment_stats
+
+    delay = settings.APARTMENT_STATS_REFRESH_DELAY
+    pending = [
+        group
+        for group in groups or [None]
+        if cache.add(_pending_key(group), True, timeout=delay + 60)
+    ]
+    if not pending:
+        return
+    try:
+        refresh_apartment_stats.apply_async(
+            kwargs={"groups": None if groups is None else pending}, countdown=delay
+        )
+    except Exception:
+        # The periodic refresh catches up if the broker is unavailable.
+        logger.exception("Could not queue the apartment stats refresh")
+        clear_pending(None if groups is None else pending)
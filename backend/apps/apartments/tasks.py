@@ -0,0 +1,98 @@
+import logging
+
+from celery import shared_task
+from django.conf import settings
+from django.core.files.storage import default_storage
+
+from apps.apartments import images, outbox, stats, warming
+from apps.apartments.models import ApartmentImage
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def refresh_apartment_stats(groups=None):
+    """
+    Recomputes the apartment stats summary of `groups` (lists of
+    `[number_of_rooms, availability]`), or of every group.
+
+    Queued after writes by `stats.schedule_refresh` and run for every group by
+    Celery beat (`CELERY_BEAT_SCHEDULE`).
+    """
+    stats.clear_pending(groups)
+    refreshed = stats.refresh_stats(groups)
+    logger.info(f"Refreshed apartment stats for {refreshed} groups")
+    return refreshed
+
+
+@shared_task
+def generate_apartment_thumbnails(image_id):
+    """
+    Generates the WebP thumbnails of an uploaded apartment image.
+
+    Queued by `images.schedule_thumbnails` after an upload commits. Images that
+    cannot be decoded are marked failed.
+    """
+    image = ApartmentImage.objects.filter(pk=image_id).first()
+    if image is None:
+        return None
+    try:
+        images.generate_thumbnails(image)
+    except Exception:
+        logger.exception(f"Could not generate thumbnails of apartment image {image_id}")
+        image.status = ApartmentImage.Status.FAILED
+        image.save(update_fields=["status"])
+        return image.status
+    return image.status
+
+
+@shared_task
+def delete_apartment_image_files(names):
+    """
+    Deletes the stored files of deleted apartment images.
+    """
+    for name in names:
+        default_storage.delete(name)
+
+
+@shared_task
+def relay_apartment_changes():
+    """
+    Publishes the apartment changes waiting in the outbox, in batches of
+    `APARTMENT_OUTBOX_BATCH_SIZE`.
+
+    Queued after writes by `outbox.record` and run periodically by Celery beat
+    (`CELERY_BEAT_SCHEDULE`) to catch up after failures.
+    """
+    outbox.clear_pending()
+    published = outbox.relay(max_batches=settings.APARTMENT_OUTBOX_MAX_BATCHES)
+    if published:
+        logger.info(f"Published {published} apartment changes")
+    return published
+
+
+@shared_task
+def prune_apartment_changes():
+    """
+    Deletes the published apartment changes older than
+    `APARTMENT_OUTBOX_RETENTION_DAYS`.
+    """
+    deleted = outbox.prune()
+    logger.info(f"Pruned {deleted} apartment changes")
+    return deleted
+
+
+@shared_task
+def warm_apartment_cache():
+    """
+    Fills the apartment response cache for the hottest list pages and details,
+    then decays the access statistics.
+
+    Queued after invalidations by `warming.schedule_warm` and run periodically
+    by Celery beat (`CELERY_BEAT_SCHEDULE`).
+    """
+    warming.clear_pending()
+    requests = warming.warm()
+    warming.decay()
+    logger.info(f"Warmed the apartment cache with {requests} requests")
+    return requests
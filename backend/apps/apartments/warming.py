@@ -0,0 +1,233 @@
+import contextlib
+import json
+import logging
+import random
+from contextvars import ContextVar
+from urllib.parse import urlsplit
+
+from asgiref.sync import async_to_sync, iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.test import RequestFactory
+from django.urls import resolve
+from rest_framework.utils.urls import remove_query_param
+
+logger = logging.getLogger(__name__)
+
+ACCESS_PREFIX = "apartments:access"
+ACCESS_KINDS = ("list", "detail")
+WARM_PENDING_KEY = "apartments:warm-pending"
+# Query parameters that select a page rather than a list; they are dropped
+# from the recorded list URLs, whose pages are reached by following `next`.
+PAGE_PARAMS = ("page", "cursor")
+
+_warming = ContextVar("apartment_cache_warming", default=False)
+
+
+def _access_key(kind):
+    return f"{ACCESS_PREFIX}:{kind}"
+
+
+def _redis():
+    """
+    Returns the Redis client of the default cache, or None if it is not a
+    django-redis cache.
+    """
+    if not settings.CACHES["default"]["BACKEND"].startswith("django_redis"):
+        return None
+    from django_redis import get_redis_connection
+
+    return get_redis_connection("default")
+
+
+def access_url(request, kind):
+    """
+    Returns the URL an access to an apartment list or detail is counted under:
+    the absolute URL of the request, without its page for lists.
+    """
+    url = request.build_absolute_uri()
+    if kind == "list" and any(param in request.GET for param in PAGE_PARAMS):
+        for param in PAGE_PARAMS:
+            url = remove_query_param(url, param)
+    return url
+
+
+def _sampled():
+    return (
+        not _warming.get()
+        and random.random() < settings.APARTMENT_CACHE_ACCESS_SAMPLE_RATE
+    )
+
+
+def _record(kind, url):
+    redis = _redis()
+    try:
+        if redis is not None:
+            redis.zincrby(_access_key(kind), 1, url)
+            return
+        counts = cache.get(_access_key(kind), {})
+        counts[url] = counts.get(url, 0) + 1
+        cache.set(_access_key(kind), counts, timeout=None)
+    except Exception:
+        # Access statistics must never fail a request.
+        logger.exception("Could not record an apartment cache access")
+
+
+def record_access(request, kind):
+    """
+    Counts an access to an apartment list or detail URL, for
+    `APARTMENT_CACHE_ACCESS_SAMPLE_RATE` of the requests.
+
+    Counts are kept in a Redis sorted set per kind, so the hottest URLs are
+    one `ZREVRANGE` away; other cache backends keep a plain dict, which is
+    good enough for development. Requests made by `warm` are not counted.
+    """
+    if _sampled():
+        _record(kind, access_url(request, kind))
+
+
+async def arecord_access(request, kind):
+    """
+    Async variant of `record_access`.
+    """
+    if _sampled():
+        await sync_to_async(_record)(kind, access_url(request, kind))
+
+
+def hottest(kind, limit):
+    """
+    Returns the `limit` most accessed URLs of `kind`, hottest first.
+    """
+    if limit <= 0:
+        return []
+    redis = _redis()
+    if redis is not None:
+        return [
+            url.decode() for url in redis.zrevrange(_access_key(kind), 0, limit - 1)
+        ]
+    counts = cache.get(_access_key(kind), {})
+    return sorted(counts, key=counts.get, reverse=True)[:limit]
+
+
+def decay():
+    """
+    Halves every access count and forgets all but the
+    `APARTMENT_CACHE_ACCESS_TRACKED` hottest URLs of each kind, so the
+    statistics follow recent traffic and stay small.
+    """
+    tracked = settings.APARTMENT_CACHE_ACCESS_TRACKED
+    redis = _redis()
+    for kind in ACCESS_KINDS:
+        key = _access_key(kind)
+        if redis is not None:
+            pipeline = redis.pipeline()
+            pipeline.zunionstore(key, {key: 0.5})
+            pipeline.zremrangebyrank(key, 0, -tracked - 1)
+            pipeline.execute()
+            continue
+        counts = cache.get(key, {})
+        hottest_urls = sorted(counts, key=counts.get, reverse=True)[:tracked]
+        cache.set(key, {url: counts[url] / 2 for url in hottest_urls}, timeout=None)
+
+
+@contextlib.contextmanager
+def warming():
+    """
+    Marks the requests made in the block as cache warming requests.
+    """
+    token = _warming.set(True)
+    try:
+        yield
+    finally:
+        _warming.reset(token)
+
+
+def fetch(url):
+    """
+    Runs the GET request of an absolute `url` through its view, in process,
+    and returns the response. The view caches the response data as it would
+    for a client.
+    """
+    parts = urlsplit(url)
+    match = resolve(parts.path)
+    request = RequestFactory().get(
+        f"{parts.path}?{parts.query}" if parts.query else parts.path,
+        secure=parts.scheme == "https",
+        HTTP_HOST=parts.netloc,
+    )
+    if iscoroutinefunction(match.func):
+        return async_to_sync(match.func)(request, *match.args, **match.kwargs)
+    return match.func(request, *match.args, **match.kwargs)
+
+
+def _next_url(response):
+    data = getattr(response, "data", None)
+    if data is None:
+        data = json.loads(response.content)
+    return data.get("next") if isinstance(data, dict) else None
+
+
+def warm(pages=None, lists=None, details=None, urls=()):
+    """
+    Fills the apartment response cache for the hottest requests.
+
+    Warms the first `pages` pages of the `lists` most accessed list URLs (plus
+    `APARTMENT_CACHE_WARM_URLS` and `urls`), following their `next` links as a
+    client would, and the `details` most accessed detail URLs. Responses that
+    are still cached cost one cache read each. Returns the number of requests
+    made.
+    """
+    pages = settings.APARTMENT_CACHE_WARM_PAGES if pages is None else pages
+    lists = settings.APARTMENT_CACHE_WARM_LISTS if lists is None else lists
+    details = settings.APARTMENT_CACHE_WARM_DETAILS if details is None else details
+
+    list_urls = dict.fromkeys(
+        [*settings.APARTMENT_CACHE_WARM_URLS, *urls, *hottest("list", lists)]
+    )
+    requests = 0
+    with warming():
+        for url in list_urls:
+            for _ in range(pages):
+                response = _fetch(url)
+                requests += 1
+                if response is None or response.status_code != 200:
+                    break
+                url = _next_url(response)
+                if not url:
+                    break
+        for url in hottest("detail", details):
+            _fetch(url)
+            requests += 1
+    return requests
+
+
+def _fetch(url):
+    try:
+        return fetch(url)
+    except Exception:
+        # A stale or malformed URL must not stop the run.
+        logger.exception(f"Could not warm the apartment cache for {url}")
+        return None
+
+
+def schedule_warm():
+    """
+    Queues a cache warming run `APARTMENT_CACHE_WARM_DELAY` seconds from now,
+    unless one is already queued, so a burst of invalidations is followed by
+    one warming run.
+    """
+    from apps.apartments.tasks import warm_apartment_cache
+
+    delay = settings.APARTMENT_CACHE_WARM_DELAY
+    if not cache.add(WARM_PENDING_KEY, True, timeout=delay + 60):
+        return
+    try:
+        warm_apartment_cache.apply_async(countdown=delay)
+    except Exception:
+        # The periodic run catches up if the broker is unavailable.
+        logger.exception("Could not queue the apartment cache warming")
+        clear_pending()
+
+
+def clear_pending():
+    cache.delete(WARM_PENDING_KEY)
@@ -1,7 +1,14 @@
 from django.contrib.auth import get_user_model
 
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+
+from apps.users import authentication, tokens
 
 User = get_user_model()
 
@@ -21,3 +28,33 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     def validate(self, attrs):
         attrs['username'] = attrs.get('email')
         return super().validate(attrs)
+
+
+class DenylistTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refreshes tokens against the cache denylist instead of the database.
+
+    With `ROTATE_REFRESH_TOKENS` on, the presented refresh token is revoked
+    and a new one is issued; a token can only be rotated once, so a replayed
+    (e.g. stolen) refresh token is rejected.
+    """
+
+    token_class = tokens.DenylistRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+        if user_id is not None and authentication.is_inactive(user_id):
+            raise AuthenticationFailed(
+                self.error_messages["no_active_account"], "no_active_account"
+            )
+
+        data = {"access": str(refresh.access_token)}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if not tokens.revoke(refresh):
+                raise InvalidToken("Refresh token was already used")
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data["refresh"] = str(refresh)
+        return data
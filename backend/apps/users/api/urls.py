@@ -1,7 +1,6 @@
 from django.urls import path, include
 
 from rest_framework.routers import DefaultRouter
-from rest_framework_simplejwt.views import TokenRefreshView
 
 from apps.users.api import views
 
@@ -12,5 +11,5 @@ router.register(r'users', views.AdminUserViewSet, basename='admin-users')
 urlpatterns = [
     path('', include(router.urls)),
     path('api/token/', views.CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
-    path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('api/token/refresh/', views.CustomTokenRefreshView.as_view(), name='token_refresh'),
 ]
\ No newline at end of file
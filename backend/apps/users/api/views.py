@@ -1,21 +1,40 @@
 from django.contrib.auth import get_user_model
 
 from rest_framework import viewsets, permissions
-from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from drf_spectacular.utils import (
     extend_schema,
     OpenApiParameter,
     OpenApiExample,
 )
 
-from apps.users.api import serializers
+from apps.users.api import serializers, views_auth
+from config import db_router
 
 User = get_user_model()
 
 class CustomTokenObtainPairView(TokenObtainPairView):
+    """
+    Issues a token pair for valid credentials, under the same failed-login
+    limits as `LoginView`.
+    """
     serializer_class = serializers.CustomTokenObtainPairSerializer
 
-class AdminUserViewSet(viewsets.ReadOnlyModelViewSet):
+    def post(self, request, *args, **kwargs):
+        with views_auth.login_attempt(request, request.data.get(User.USERNAME_FIELD)):
+            return super().post(request, *args, **kwargs)
+
+class CustomTokenRefreshView(TokenRefreshView):
+    """
+    Refreshes a token, under the same per-IP limit as `RefreshTokenView`.
+    """
+    serializer_class = serializers.DenylistTokenRefreshSerializer
+
+    def post(self, request, *args, **kwargs):
+        views_auth.check_refresh_limit(request)
+        return super().post(request, *args, **kwargs)
+
+class AdminUserViewSet(db_router.ReplicaReadsMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class = serializers.UserSerializer
     permission_classes = [permissions.IsAdminUser]
     queryset = User.objects.all().order_by('-date_joined')
@@ -2,14 +2,77 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions, exceptions
 from django.contrib.auth import authenticate
-from rest_framework_simplejwt.tokens import RefreshToken
-from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.tokens import Token
+from apps.users.api.serializers import (
+    CustomTokenObtainPairSerializer,
+    DenylistTokenRefreshSerializer,
+)
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework.throttling import BaseThrottle
+from apps.users import ratelimit, tokens
 from django.conf import settings
+import contextlib
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def client_ident(request):
+    """
+    Returns the client IP, honouring DRF's `NUM_PROXIES` setting.
+    """
+    return BaseThrottle().get_ident(request)
+
+
+def login_limits(request, email):
+    """
+    Returns the (limit, ident) pairs counting failed logins per IP and email.
+    """
+    return (
+        (ratelimit.Limit("login_ip"), client_ident(request)),
+        (ratelimit.Limit("login_email"), normalize_email(email)),
+    )
+
+
+def normalize_email(email):
+    return email.strip().lower() if isinstance(email, str) else None
+
+
+@contextlib.contextmanager
+def login_attempt(request, email):
+    """
+    Reserves a login attempt for `email` from the client of `request` under the
+    `login_limits` around the block checking the password.
+
+    The attempt is reserved atomically before the block runs, so a burst of
+    parallel attempts cannot all get through; it stays counted if the block
+    raises (a failed login) and is refunded if the block completes.
+
+    Raises:
+        Throttled: If there were too many failed attempts.
+    """
+    limits = login_limits(request, email)
+    result = ratelimit.attempt(*limits)
+    if not result.allowed:
+        logger.warning(f"Login attempt for {email} rejected by rate limit")
+        raise exceptions.Throttled(wait=result.retry_after)
+    yield
+    ratelimit.refund(result, limits[0])
+    ratelimit.reset(limits[1])
+
+
+def check_refresh_limit(request):
+    """
+    Counts a token refresh attempt from the client of `request`.
+
+    Raises:
+        Throttled: If the client made too many refresh attempts.
+    """
+    result = ratelimit.attempt((ratelimit.Limit("refresh_ip"), client_ident(request)))
+    if not result.allowed:
+        raise exceptions.Throttled(wait=result.retry_after)
+
+
 class LoginView(APIView):
     """
     API view for user login.
@@ -18,8 +81,13 @@ class LoginView(APIView):
     Upon successful authentication, it returns a response with a success message
     and sets HTTP-only cookies for access and refresh tokens.
 
+    Failed attempts are counted per client IP and per email; once either is
+    over its `AUTH_RATE_LIMITS` limit, attempts are rejected before the password
+    is hashed (see `login_attempt`).
+
     Raises:
         AuthenticationFailed: If the provided email or password is incorrect.
+        Throttled: If there were too many failed attempts.
     """
 
     permission_classes = [permissions.AllowAny]
@@ -28,12 +96,14 @@ class LoginView(APIView):
         email = request.data.get("email")
         password = request.data.get("password")
 
-        user = authenticate(request, email=email, password=password)
-        if not user:
-            logger.warning(f"Failed login attempt for {email}")
-            raise exceptions.AuthenticationFailed("Incorrect email or password")
+        with login_attempt(request, email):
+            user = authenticate(request, email=email, password=password)
+            if not user:
+                logger.warning(f"Failed login attempt for {email}")
+                raise exceptions.AuthenticationFailed("Incorrect email or password")
 
-        refresh = RefreshToken.for_user(user)
+        # Carries the email claim used by CachedJWTAuthentication.
+        refresh = CustomTokenObtainPairSerializer.get_token(user)
         response = Response({"message": "Successful login"})
 
         access_expiry = int(
@@ -68,8 +138,9 @@ class LogoutView(APIView):
     """
     API view for user logout.
 
-    Allows authenticated users to log out. It returns a response with a success
-    message and deletes the access and refresh token cookies.
+    Allows authenticated users to log out. It revokes the current access and
+    refresh tokens, returns a response with a success message and deletes the
+    access and refresh token cookies.
 
     Requires:
         Authentication: The user must be authenticated to access this view.
@@ -78,6 +149,15 @@ class LogoutView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request):
+        refresh_token = request.COOKIES.get("refresh_token")
+        if refresh_token:
+            try:
+                tokens.revoke(tokens.DenylistRefreshToken(refresh_token))
+            except TokenError:
+                pass
+        if isinstance(request.auth, Token):
+            tokens.revoke(request.auth)
+
         response = Response({"message": "Exit completed"})
         response.delete_cookie("access_token")
         response.delete_cookie("refresh_token")
@@ -114,27 +194,32 @@ class RefreshTokenView(APIView):
     API view to refresh the access token using a refresh token.
 
     Retrieves the refresh token from the HTTP-only cookies, validates it, and
-    returns a new access token as an HTTP-only cookie.
+    returns a new access token as an HTTP-only cookie. With
+    `ROTATE_REFRESH_TOKENS` on, the refresh token is revoked and a new one is
+    set as well, so each refresh token can be used once.
 
     Raises:
         AuthenticationFailed: If the refresh token is not found in the cookies.
         InvalidToken: If the refresh token is invalid or expired.
-
+        Throttled: If the client IP made too many refresh attempts.
     """
 
     permission_classes = [permissions.AllowAny]
 
     def post(self, request):
+        check_refresh_limit(request)
+
         refresh_token = request.COOKIES.get("refresh_token")
 
         if not refresh_token:
             raise exceptions.AuthenticationFailed("Refresh token not found")
 
+        serializer = DenylistTokenRefreshSerializer(data={"refresh": refresh_token})
         try:
-            refresh = RefreshToken(refresh_token)
-            access_token = str(refresh.access_token)
-        except Exception:
+            serializer.is_valid(raise_exception=True)
+        except TokenError:
             raise InvalidToken("Invalid refresh token")
+        tokens_data = serializer.validated_data
 
         response = Response({"message": "Token updated"})
 
@@ -144,10 +229,62 @@ class RefreshTokenView(APIView):
 
         response.set_cookie(
             key="access_token",
-            value=access_token,
+            value=tokens_data["access"],
             httponly=True,
             secure=False,
             samesite="Lax",
             max_age=access_expiry,
         )
+        if "refresh" in tokens_data:
+            refresh_expiry = int(
+                settings.SIMPLE_JWT["REFRESH_TOKEN_LIFETIME"].total_seconds()
+            )
+            response.set_cookie(
+                key="refresh_token",
+                value=tokens_data["refresh"],
+                httponly=True,
+                secure=False,
+                samesite="Lax",
+                max_age=refresh_expiry,
+            )
         return response
+
+
+class LoginLockoutView(APIView):
+    """
+    API view exposing and clearing login lockouts (for administrators only).
+
+    `GET` returns the rate limit state of the given `email` and `ip` query
+    parameters; `DELETE` clears it, e.g. after a support request.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get_entries(self, request):
+        email = normalize_email(request.query_params.get("email"))
+        ip = request.query_params.get("ip")
+        if not email and not ip:
+            raise exceptions.ValidationError("Pass an email or ip query parameter.")
+        entries = [
+            (ratelimit.Limit("login_ip"), ip),
+            (ratelimit.Limit("login_email"), email),
+            (ratelimit.Limit("refresh_ip"), ip),
+        ]
+        return [(limit, ident) for limit, ident in entries if ident]
+
+    def get(self, request):
+        return Response(
+            [
+                ratelimit.status(limit, ident)
+                for limit, ident in self.get_entries(request)
+            ]
+        )
+
+    def delete(self, request):
+        entries = self.get_entries(request)
+        ratelimit.reset(*entries)
+        logger.info(
+            f"Login lockout cleared by {request.user.email}: "
+            f"{', '.join(f'{limit.scope}={ident}' for limit, ident in entries)}"
+        )
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,192 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Model
+from django.utils.functional import LazyObject, empty
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from apps.users import tokens
+
+User = get_user_model()
+
+CACHE_PREFIX = "users"
+# Upper bound on the in-process user cache; it is emptied when exceeded.
+LOCAL_CACHE_MAX_SIZE = 10_000
+# Fields of the users kept in the shared cache, in model order. The password
+# hash is left out, and deferred on the cached users.
+CACHED_FIELDS = tuple(
+    field.attname for field in User._meta.concrete_fields if field.attname != "password"
+)
+
+_local_users = {}
+
+
+def _user_key(user_id):
+    # Not "user:", under which whole pickled users used to be cached.
+    return f"{CACHE_PREFIX}:user-fields:{user_id}"
+
+
+def _inactive_key(user_id):
+    return f"{CACHE_PREFIX}:inactive:{user_id}"
+
+
+def get_cached_user(user_id):
+    """
+    Returns the user with primary key `user_id`.
+
+    Looks in a short-lived in-process cache first, then in the shared cache,
+    and only then in the database. The shared cache holds the `CACHED_FIELDS`
+    of the user; its `password` is loaded from the database if accessed.
+
+    Raises:
+        User.DoesNotExist: If there is no such user.
+    """
+    now = time.monotonic()
+    entry = _local_users.get(user_id)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+
+    values = cache.get(_user_key(user_id))
+    if values is None:
+        values = User.objects.filter(pk=user_id).values(*CACHED_FIELDS).get()
+        cache.set(_user_key(user_id), values, settings.USER_CACHE_TIMEOUT)
+    user = User.from_db(DEFAULT_DB_ALIAS, list(values), list(values.values()))
+
+    if len(_local_users) >= LOCAL_CACHE_MAX_SIZE:
+        _local_users.clear()
+    _local_users[user_id] = (now + settings.USER_LOCAL_CACHE_TIMEOUT, user)
+    return user
+
+
+def forget_user(user_id):
+    """
+    Drops the cached copies of a user from this process and the shared cache.
+    """
+    _local_users.pop(user_id, None)
+    cache.delete(_user_key(user_id))
+
+
+def invalidate_user(user_id, is_active=True):
+    """
+    Drops the cached copies of a user after it was saved or deleted.
+
+    Inactive (or deleted) users are also recorded for the lifetime of an
+    access token, so tokens issued before the change stop authenticating.
+    Other processes drop their in-process copy within
+    `USER_LOCAL_CACHE_TIMEOUT` seconds.
+    """
+    forget_user(user_id)
+    if is_active:
+        cache.delete(_inactive_key(user_id))
+    else:
+        timeout = int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds())
+        cache.set(_inactive_key(user_id), True, timeout)
+
+
+def is_inactive(user_id):
+    return cache.get(_inactive_key(user_id)) is not None
+
+
+def clear_local_cache():
+    _local_users.clear()
+
+
+class TokenBackedUser(LazyObject):
+    """
+    User built from the claims of a validated access token.
+
+    `id`, `pk`, `email`, `is_authenticated`, truthiness, equality and hashing
+    are answered from the token. Any other attribute loads the full `User`
+    through `get_cached_user`, so read-only requests that only need the user
+    id never query the users table. Claims reflect the user as it was when the
+    token was issued.
+    """
+
+    def __init__(self, user_id, email=None):
+        super().__init__()
+        self.__dict__["_user_id"] = user_id
+        self.__dict__["_email"] = email
+
+    def _setup(self):
+        self._wrapped = get_cached_user(self._user_id)
+
+    @property
+    def id(self):
+        return self._user_id
+
+    pk = id
+
+    @property
+    def email(self):
+        if self._email is None:
+            if self._wrapped is empty:
+                self._setup()
+            return self._wrapped.email
+        return self._email
+
+    @property
+    def is_authenticated(self):
+        return True
+
+    @property
+    def is_anonymous(self):
+        return False
+
+    def __bool__(self):
+        return True
+
+    def __eq__(self, other):
+        if isinstance(other, TokenBackedUser):
+            return self._user_id == other._user_id
+        if isinstance(other, Model):
+            return isinstance(other, User) and other.pk == self._user_id
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self._user_id)
+
+    def __repr__(self):
+        return f"<TokenBackedUser: {self._user_id}>"
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that does not query the users table.
+
+    Returns a `TokenBackedUser` built from the `user_id` and `email` claims
+    (see `CustomTokenObtainPairSerializer.get_token`). Deactivated and deleted
+    users are rejected via a cache flag set by the user signals, and revoked
+    tokens via the denylist in `apps.users.tokens`, both in one cache lookup.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = User._meta.pk.to_python(
+                validated_token[api_settings.USER_ID_CLAIM]
+            )
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        inactive_key = _inactive_key(user_id)
+        flags = cache.get_many(
+            [
+                inactive_key,
+                tokens.revoked_key(validated_token.get(api_settings.JTI_CLAIM)),
+            ]
+        )
+        if inactive_key in flags:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if flags:
+            raise InvalidToken(_("Token is blacklisted"))
+        return TokenBackedUser(user_id, validated_token.get("email"))
+
+
+class CachedJWTAuthenticationScheme(SimpleJWTScheme):
+    target_class = "apps.users.authentication.CachedJWTAuthentication"
@@ -0,0 +1,106 @@
+import multiprocessing
+import os
+import time
+
+from django.contrib.auth.hashers import get_hasher, get_hashers
+from django.core.management.base import BaseCommand, CommandError
+
+PASSWORD = "correct horse battery staple"
+
+
+def hashes_per_second(algorithm, duration):
+    """
+    Returns how many passwords per second one core hashes with `algorithm`.
+    """
+    hasher = get_hasher(algorithm)
+    hasher.encode(PASSWORD, hasher.salt())
+    iterations = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < duration:
+        hasher.encode(PASSWORD, hasher.salt())
+        iterations += 1
+        elapsed = time.perf_counter() - start
+    return iterations / elapsed
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures password hashes per second, on one core and on all cores, "
+        "for the configured PASSWORD_HASHERS and their current cost parameters. "
+        "Use it to pick costs that fit the login latency budget."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hashers",
+            help="Comma-separated algorithms (default: every configured hasher).",
+        )
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=2.0,
+            help="Seconds spent on each measurement (default: 2.0).",
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Worker processes for the all-cores measurement (default: CPUs).",
+        )
+        parser.add_argument(
+            "--target-ms",
+            type=float,
+            default=100.0,
+            help="Hashing budget per login in milliseconds (default: 100).",
+        )
+
+    def handle(self, *args, **options):
+        configured = [hasher.algorithm for hasher in get_hashers()]
+        algorithms = options["hashers"].split(",") if options["hashers"] else configured
+        unknown = set(algorithms) - set(configured)
+        if unknown:
+            raise CommandError(
+                f"Not in PASSWORD_HASHERS: {', '.join(sorted(unknown))}. "
+                f"Configured: {', '.join(configured)}."
+            )
+
+        self.stdout.write(
+            f"Preferred hasher: {configured[0]}; "
+            f"{options['processes']} processes, target {options['target_ms']:.0f} ms"
+        )
+        self.stdout.write(
+            f"{'algorithm':<16} {'parameters':<36} {'ms/hash':>9} "
+            f"{'hashes/s/core':>14} {'hashes/s':>10}  verdict"
+        )
+        for algorithm in algorithms:
+            try:
+                per_core = hashes_per_second(algorithm, options["duration"])
+            except ValueError as e:
+                self.stdout.write(f"{algorithm:<16} skipped: {e}")
+                continue
+            total = self.all_cores(algorithm, options["duration"], options["processes"])
+            ms_per_hash = 1000 / per_core
+            verdict = "ok" if ms_per_hash <= options["target_ms"] else "over budget"
+            self.stdout.write(
+                f"{algorithm:<16} {self.parameters(algorithm):<36} {ms_per_hash:>9.1f} "
+                f"{total / options['processes']:>14.1f} {total:>10.1f}  {verdict}"
+            )
+
+    def all_cores(self, algorithm, duration, processes):
+        if processes <= 1:
+            return hashes_per_second(algorithm, duration)
+        # Forked workers inherit the configured Django settings.
+        with multiprocessing.get_context("fork").Pool(processes) as pool:
+            return sum(
+                pool.starmap(hashes_per_second, [(algorithm, duration)] * processes)
+            )
+
+    def parameters(self, algorithm):
+        hasher = get_hasher(algorithm)
+        decoded = hasher.decode(hasher.encode(PASSWORD, hasher.salt()))
+        return " ".join(
+            f"{name}={value}"
+            for name, value in decoded.items()
+            if name not in ("algorithm", "hash", "salt", "params")
+        )
@@ -0,0 +1,195 @@
+import hashlib
+import math
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+CACHE_PREFIX = "ratelimit"
+
+# Trims and counts every key's window, then records the attempt on all of them
+# when `mode` is "attempt" and no key is over its limit.
+# ARGV: now (ms), mode, member, then one (limit, window ms) pair per key.
+# Returns {allowed, highest count, milliseconds until allowed}.
+SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local mode = ARGV[2]
+local member = ARGV[3]
+local count = 0
+local retry = 0
+for i, key in ipairs(KEYS) do
+    local limit = tonumber(ARGV[2 + i * 2])
+    local window = tonumber(ARGV[3 + i * 2])
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+    local n = redis.call('ZCARD', key)
+    if n >= limit then
+        local edge = redis.call('ZRANGE', key, n - limit, n - limit, 'WITHSCORES')
+        retry = math.max(retry, tonumber(edge[2]) + window - now, 1)
+    end
+    count = math.max(count, n)
+end
+local allowed = retry == 0
+if mode == 'attempt' and allowed then
+    for i, key in ipairs(KEYS) do
+        redis.call('ZADD', key, now, member)
+        redis.call('PEXPIRE', key, tonumber(ARGV[3 + i * 2]))
+    end
+    count = count + 1
+end
+return {allowed and 1 or 0, count, retry}
+"""
+
+_script = None
+
+
+class Limit:
+    """
+    A sliding-window limit of `limit` attempts per `window` seconds, named by
+    `scope` in the `AUTH_RATE_LIMITS` setting.
+    """
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.limit, self.window = settings.AUTH_RATE_LIMITS[scope]
+
+    def key(self, ident):
+        digest = hashlib.md5(ident.encode()).hexdigest()
+        return f"{CACHE_PREFIX}:{self.scope}:{digest}"
+
+
+class Result:
+    """
+    Outcome of a limiter call: whether the attempt is allowed, the highest
+    attempt count among the checked keys and the seconds until it is allowed.
+    `member` identifies the recorded attempt, for `refund`.
+    """
+
+    def __init__(self, allowed, count, retry_after, member=None):
+        self.allowed = allowed
+        self.count = count
+        self.retry_after = retry_after
+        self.member = member
+
+
+def _uses_redis():
+    return settings.CACHES["default"]["BACKEND"].startswith("django_redis")
+
+
+def _run_redis(mode, entries, now):
+    global _script
+    if _script is None:
+        from django_redis import get_redis_connection
+
+        _script = get_redis_connection("default").register_script(SLIDING_WINDOW_SCRIPT)
+    member = f"{now}:{uuid.uuid4().hex}"
+    args = [now, mode, member]
+    for limit, _ in entries:
+        args.extend([limit.limit, limit.window * 1000])
+    allowed, count, retry = _script(
+        keys=[limit.key(ident) for limit, ident in entries], args=args
+    )
+    return Result(bool(allowed), count, math.ceil(retry / 1000), member)
+
+
+def _run_cache(mode, entries, now):
+    """
+    Non-atomic equivalent of the Lua script over the Django cache, for
+    deployments (and tests) without Redis.
+    """
+    windows = {}
+    count = retry = 0
+    for limit, ident in entries:
+        key = limit.key(ident)
+        window = limit.window * 1000
+        attempts = [at for at in cache.get(key, []) if at > now - window]
+        if len(attempts) >= limit.limit:
+            edge = attempts[len(attempts) - limit.limit]
+            retry = max(retry, edge + window - now, 1)
+        count = max(count, len(attempts))
+        windows[key] = (attempts, limit.window)
+    allowed = retry == 0
+    if mode == "attempt" and allowed:
+        for key, (attempts, timeout) in windows.items():
+            cache.set(key, attempts + [now], timeout)
+        count += 1
+    return Result(allowed, count, math.ceil(retry / 1000), now)
+
+
+def _run(mode, entries):
+    entries = [(limit, ident) for limit, ident in entries if ident]
+    if not entries:
+        return Result(True, 0, 0)
+    now = time.time_ns() // 1_000_000
+    if _uses_redis():
+        return _run_redis(mode, entries, now)
+    return _run_cache(mode, entries, now)
+
+
+def check(*entries):
+    """
+    Returns whether another attempt is allowed for every `(limit, ident)` pair,
+    without recording one.
+    """
+    return _run("check", entries)
+
+
+def attempt(*entries):
+    """
+    Records an attempt for every `(limit, ident)` pair unless one of them is
+    already over its limit, in a single round trip.
+
+    Reserving the attempt before the work it guards (e.g. hashing a password)
+    makes concurrent attempts count against each other: at most `limit` of a
+    burst get through, however many arrive at once.
+    """
+    return _run("attempt", entries)
+
+
+def refund(result, *entries):
+    """
+    Removes the attempt recorded by `attempt` (which returned `result`) from
+    every `(limit, ident)` pair, e.g. once it turned out to be successful.
+    """
+    entries = [(limit, ident) for limit, ident in entries if ident]
+    if result.member is None or not entries:
+        return
+    if _uses_redis():
+        from django_redis import get_redis_connection
+
+        connection = get_redis_connection("default")
+        for limit, ident in entries:
+            connection.zrem(limit.key(ident), result.member)
+        return
+    for limit, ident in entries:
+        key = limit.key(ident)
+        attempts = cache.get(key, [])
+        if result.member in attempts:
+            attempts.remove(result.member)
+            cache.set(key, attempts, limit.window)
+
+
+def reset(*entries):
+    cache_keys = [limit.key(ident) for limit, ident in entries if ident]
+    if _uses_redis():
+        from django_redis import get_redis_connection
+
+        if cache_keys:
+            get_redis_connection("default").delete(*cache_keys)
+    else:
+        cache.delete_many(cache_keys)
+
+
+def status(limit, ident):
+    """
+    Returns the lockout state of `ident` under `limit`.
+    """
+    result = check((limit, ident))
+    return {
+        "scope": limit.scope,
+        "attempts": result.count,
+        "limit": limit.limit,
+        "window": limit.window,
+        "locked": not result.allowed,
+        "retry_after": result.retry_after,
+    }
@@ -0,0 +1,36 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.users import authentication
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_cache(sender, instance, using, **kwargs):
+    """
+    Drops the cached user now and again once the write commits, flagging
+    inactive users.
+
+    The second drop discards a copy a concurrent request may have cached from
+    the old row before the commit.
+    """
+    user_id, is_active = instance.pk, instance.is_active
+    authentication.forget_user(user_id)
+    transaction.on_commit(
+        lambda: authentication.invalidate_user(user_id, is_active), using=using
+    )
+
+
+@receiver(post_delete, sender=User)
+def invalidate_deleted_user_cache(sender, instance, using, **kwargs):
+    """
+    Drops the cached user and rejects its tokens once the delete commits.
+    """
+    user_id = instance.pk
+    authentication.forget_user(user_id)
+    transaction.on_commit(
+        lambda: authentication.invalidate_user(user_id, is_active=False), using=using
+    )
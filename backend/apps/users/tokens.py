@@ -0,0 +1,46 @@
+import time
+
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+CACHE_PREFIX = "users"
+
+
+def revoked_key(jti):
+    return f"{CACHE_PREFIX}:revoked:{jti}"
+
+
+def revoke(token):
+    """
+    Adds the token's JTI to the denylist until the token expires.
+
+    Each revoked JTI is its own cache key whose TTL matches the token expiry,
+    so checks are a single O(1) lookup and the denylist empties itself.
+
+    Returns:
+        False if the token was already revoked, which makes revoking on
+        rotation an atomic single-use check.
+    """
+    timeout = max(int(token["exp"] - time.time()), 1)
+    return cache.add(revoked_key(token[api_settings.JTI_CLAIM]), True, timeout)
+
+
+def is_revoked(jti):
+    return cache.get(revoked_key(jti)) is not None
+
+
+class DenylistRefreshToken(RefreshToken):
+    """
+    Refresh token rejected once its JTI is on the cache denylist.
+
+    Replaces simplejwt's database blacklist, which needs a table write on
+    every rotation and a lookup on every refresh.
+    """
+
+    def verify(self):
+        super().verify()
+        if is_revoked(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
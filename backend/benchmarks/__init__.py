@@ -0,0 +1,12 @@
+"""
+In-repo benchmark suite for the REST API.
+
+Seeds a throwaway test database with the factories from `populate_db.py` and
+drives list, filter, search, retrieve, login and refresh traffic through the
+Django test client. Run it from the `backend` directory:
+
+    python -m benchmarks --users 20 --apartments-per-user 50 --output bench.json
+
+Set `DATABASE_URL` (e.g. `sqlite:////tmp/bench.sqlite3`) to benchmark against
+SQLite instead of the configured PostgreSQL server.
+"""
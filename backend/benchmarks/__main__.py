@@ -0,0 +1,126 @@
+import argparse
+import logging
+import os
+
+import django
+
+
+def parse_args(argv=None):
+    from benchmarks.scenarios import SCENARIOS
+
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="Benchmark the REST API."
+    )
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--apartments-per-user", type=int, default=25)
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Seed with the bulk mode of populate_db.py (for large datasets).",
+    )
+    parser.add_argument(
+        "--requests", type=int, default=200, help="Measured requests per scenario."
+    )
+    parser.add_argument(
+        "--warmup", type=int, default=10, help="Unmeasured requests per scenario."
+    )
+    parser.add_argument(
+        "--scenarios",
+        default=",".join(SCENARIOS),
+        help="Comma-separated scenarios to run (default: all).",
+    )
+    parser.add_argument(
+        "--cache",
+        choices=("cold", "warm"),
+        default="cold",
+        help="'cold' bypasses the cache, 'warm' uses the configured one.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        help="Comma-separated client counts; compares the sync and async "
+        "apartment endpoints under ASGI instead of running the scenarios.",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write JSON results to this file.")
+    parser.add_argument("--compare", help="Compare against a previous JSON result.")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    args.scenarios = [name.strip() for name in args.scenarios.split(",") if name]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    if args.concurrency:
+        try:
+            args.concurrency = [int(level) for level in args.concurrency.split(",")]
+        except ValueError:
+            parser.error("--concurrency expects comma-separated integers")
+        if min(args.concurrency) < 1:
+            parser.error("--concurrency levels must be positive")
+        if args.compare:
+            parser.error("--compare cannot be combined with --concurrency")
+    return args
+
+
+def main(argv=None):
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.dev")
+    django.setup()
+
+    from django.test.utils import (
+        setup_databases,
+        setup_test_environment,
+        teardown_databases,
+        teardown_test_environment,
+    )
+
+    from benchmarks import concurrency, runner
+
+    args = parse_args(argv)
+    if not args.verbose:
+        logging.disable(logging.INFO)
+
+    # Benchmarks run against a throwaway test database with DEBUG off, the same
+    # way the test runner does.
+    setup_test_environment(debug=False)
+    old_config = setup_databases(
+        verbosity=0, interactive=False, serialized_aliases=set()
+    )
+    try:
+        dataset = runner.seed_dataset(
+            args.users, args.apartments_per_user, args.seed, bulk=args.bulk
+        )
+        if args.concurrency:
+            document = concurrency.run_concurrency(
+                dataset,
+                args.concurrency,
+                args.requests,
+                warmup=args.warmup,
+                cache=args.cache,
+                seed=args.seed,
+            )
+        else:
+            document = runner.run_benchmarks(
+                dataset,
+                args.scenarios,
+                args.requests,
+                warmup=args.warmup,
+                cache=args.cache,
+                seed=args.seed,
+            )
+    finally:
+        teardown_databases(old_config, verbosity=0)
+        teardown_test_environment()
+
+    if args.concurrency:
+        print(concurrency.format_results(document))
+    else:
+        print(runner.format_results(document))
+    if args.compare:
+        print()
+        print(runner.compare_results(runner.read_results(args.compare), document))
+    if args.output:
+        runner.write_results(document, args.output)
+
+
+if __name__ == "__main__":
+    main()
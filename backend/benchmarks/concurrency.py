@@ -0,0 +1,156 @@
+import asyncio
+import datetime
+import platform
+import random
+import time
+
+import django
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+
+from benchmarks.runner import COLD_CACHES, summarize_latencies
+
+# Sync (`ApartmentViewSet`) and async URL names of each compared endpoint.
+ENDPOINTS = {
+    "list": ("apartments-list", "async-apartments-list"),
+    "retrieve": ("apartments-detail", "async-apartments-detail"),
+}
+MODES = ("sync", "async")
+
+
+def build_path(endpoint, url_name, dataset, rng):
+    if endpoint == "retrieve":
+        return reverse(url_name, kwargs={"slug": rng.choice(dataset["slugs"])})
+    return reverse(url_name)
+
+
+async def asgi_get(application, path):
+    """
+    Sends a GET request for `path` straight to the ASGI `application`, the way
+    an ASGI server does, and returns the response status.
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"testserver")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    request_sent = False
+    messages = []
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # The client stays connected until the handler is done.
+        await asyncio.Future()
+
+    async def send(message):
+        messages.append(message)
+
+    await application(scope, receive, send)
+    return messages[0]["status"]
+
+
+async def drive(application, paths, concurrency):
+    """
+    Replays `paths` with `concurrency` requests in flight at any time.
+
+    Returns the per-request latencies (seconds), the error count and the
+    elapsed wall-clock time.
+    """
+    pending = iter(paths)
+    latencies, errors = [], 0
+
+    async def client():
+        nonlocal errors
+        for path in pending:
+            started = time.perf_counter()
+            status = await asgi_get(application, path)
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - started
+
+
+def run_concurrency(dataset, levels, requests, warmup=0, cache="cold", seed=0):
+    """
+    Compares the sync and async apartment endpoints served by the ASGI handler
+    at each concurrency level in `levels`.
+
+    Sync views run in a worker thread per request, async views on the event
+    loop. Returns a JSON-serializable document with run metadata and the
+    results keyed by endpoint, mode and concurrency level.
+    """
+    application = ASGIHandler()
+    results = {}
+    caches = COLD_CACHES if cache == "cold" else settings.CACHES
+    with override_settings(CACHES=caches):
+        for endpoint, url_names in ENDPOINTS.items():
+            for mode, url_name in zip(MODES, url_names):
+                for level in levels:
+                    rng = random.Random(seed)
+                    paths = [
+                        build_path(endpoint, url_name, dataset, rng)
+                        for _ in range(warmup + requests)
+                    ]
+                    asyncio.run(drive(application, paths[:warmup], level))
+                    latencies, errors, elapsed = asyncio.run(
+                        drive(application, paths[warmup:], level)
+                    )
+                    results.setdefault(endpoint, {}).setdefault(mode, {})[
+                        str(level)
+                    ] = {
+                        "requests": requests,
+                        "errors": errors,
+                        "req_per_s": round(requests / elapsed, 2) if elapsed else 0.0,
+                        "latency_ms": summarize_latencies(latencies),
+                    }
+    return {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "database": connection.vendor,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "cache": cache,
+            "users": dataset["users"],
+            "apartments": dataset["apartments"],
+            "requests": requests,
+            "warmup": warmup,
+            "seed": seed,
+            "concurrency": list(levels),
+        },
+        "concurrency": results,
+    }
+
+
+def format_results(document):
+    lines = [
+        f"{'endpoint':<12}{'mode':<8}{'clients':>8}{'req/s':>10}{'p50 ms':>10}"
+        f"{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}"
+    ]
+    for endpoint, modes in document["concurrency"].items():
+        for mode, levels in modes.items():
+            for level, result in levels.items():
+                latency = result["latency_ms"]
+                lines.append(
+                    f"{endpoint:<12}{mode:<8}{level:>8}{result['req_per_s']:>10.1f}"
+                    f"{latency['p50']:>10.2f}{latency['p95']:>10.2f}"
+                    f"{latency['p99']:>10.2f}{result['errors']:>8}"
+                )
+    return "\n".join(lines)
@@ -0,0 +1,231 @@
+import datetime
+import json
+import math
+import platform
+import random
+import re
+import statistics
+import time
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from apps.apartments.models import Apartment
+from benchmarks.scenarios import PASSWORD, SCENARIOS
+
+User = get_user_model()
+
+# Apartment names sampled for search terms when seeding in bulk.
+SEARCH_TERM_SOURCES = 1000
+
+# Benchmarks replay far more logins and refreshes from one client than the auth
+# rate limits allow; the limiter still runs but never rejects.
+UNLIMITED_AUTH_RATE_LIMITS = {
+    "login_ip": (10**9, 60),
+    "login_email": (10**9, 60),
+    "refresh_ip": (10**9, 60),
+}
+
+# Replaces the configured cache so every request measures the uncached path.
+COLD_CACHES = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+
+
+def seed_dataset(num_users, apartments_per_user, seed=0, bulk=False):
+    """
+    Seeds users and apartments with the `populate_db.py` factories, or with its
+    bulk seeding mode when `bulk` is set.
+
+    Returns the emails, slugs and search terms the scenarios draw from.
+    """
+    import factory.random
+    from populate_db import (
+        ApartmentFactory,
+        UserFactory,
+        bulk_create_users_and_apartments,
+    )
+
+    if bulk:
+        bulk_create_users_and_apartments(
+            num_users, apartments_per_user, seed=seed, password=PASSWORD
+        )
+        emails = list(User.objects.order_by("pk").values_list("email", flat=True))
+        slugs = list(Apartment.objects.order_by("pk").values_list("slug", flat=True))
+        names = Apartment.objects.values_list("name", flat=True)[:SEARCH_TERM_SOURCES]
+    else:
+        factory.random.reseed_random(seed)
+        emails, slugs, names = [], [], []
+        for _ in range(num_users):
+            user = UserFactory(password=PASSWORD)
+            emails.append(user.email)
+            for apartment in ApartmentFactory.create_batch(
+                apartments_per_user, owner=user
+            ):
+                slugs.append(apartment.slug)
+                names.append(apartment.name)
+
+    words = sorted(
+        {word.lower() for name in names for word in re.findall(r"\w{4,}", name)}
+    )
+    return {
+        "emails": emails,
+        "slugs": slugs,
+        "search_terms": words or ["apartment"],
+        "users": num_users,
+        "apartments": len(slugs),
+    }
+
+
+def percentile(values, percent):
+    """
+    Returns the nearest-rank percentile of `values`.
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def summarize_latencies(latencies):
+    """
+    Returns the mean, percentiles and maximum of `latencies` (seconds) in ms.
+    """
+    latencies_ms = [latency * 1000 for latency in latencies]
+    return {
+        "mean": round(statistics.fmean(latencies_ms), 3) if latencies_ms else 0.0,
+        "p50": round(percentile(latencies_ms, 50), 3),
+        "p95": round(percentile(latencies_ms, 95), 3),
+        "p99": round(percentile(latencies_ms, 99), 3),
+        "max": round(max(latencies_ms, default=0.0), 3),
+    }
+
+
+def send(client, request):
+    if request["method"] == "GET":
+        return client.get(request["path"])
+    return client.post(
+        request["path"], request.get("data", {}), content_type="application/json"
+    )
+
+
+def run_scenario(scenario, dataset, requests, warmup=0, seed=0):
+    """
+    Replays `requests` requests of `scenario` and summarizes their timings.
+
+    Each scenario gets a fresh client, so cookies from one scenario never leak
+    into the next.
+    """
+    rng = random.Random(seed)
+    client = Client()
+    scenario.setup(client, dataset)
+    for _ in range(warmup):
+        send(client, scenario.build(dataset, rng))
+
+    latencies, query_counts, errors = [], [], 0
+    started = time.perf_counter()
+    for _ in range(requests):
+        request = scenario.build(dataset, rng)
+        with CaptureQueriesContext(connection) as queries:
+            request_started = time.perf_counter()
+            response = send(client, request)
+            latencies.append(time.perf_counter() - request_started)
+        query_counts.append(len(queries))
+        if response.status_code != scenario.expected_status:
+            errors += 1
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": requests,
+        "errors": errors,
+        "req_per_s": round(requests / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": summarize_latencies(latencies),
+        "queries": {
+            "mean": round(statistics.fmean(query_counts), 2) if query_counts else 0.0,
+            "max": max(query_counts, default=0),
+        },
+    }
+
+
+def run_benchmarks(dataset, scenarios, requests, warmup=0, cache="cold", seed=0):
+    """
+    Runs the named `scenarios` against the current database.
+
+    Returns a JSON-serializable document with run metadata and per-scenario
+    results.
+    """
+    results = {}
+    caches = COLD_CACHES if cache == "cold" else settings.CACHES
+    with override_settings(CACHES=caches, AUTH_RATE_LIMITS=UNLIMITED_AUTH_RATE_LIMITS):
+        for name in scenarios:
+            scenario = SCENARIOS[name]()
+            results[name] = run_scenario(scenario, dataset, requests, warmup, seed)
+    return {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "database": connection.vendor,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "cache": cache,
+            "users": dataset["users"],
+            "apartments": dataset["apartments"],
+            "requests": requests,
+            "warmup": warmup,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def format_results(document):
+    lines = [
+        f"{'scenario':<20}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}"
+        f"{'p99 ms':>10}{'queries':>10}{'errors':>8}"
+    ]
+    for name, result in document["results"].items():
+        latency = result["latency_ms"]
+        lines.append(
+            f"{name:<20}{result['req_per_s']:>10.1f}{latency['p50']:>10.2f}"
+            f"{latency['p95']:>10.2f}{latency['p99']:>10.2f}"
+            f"{result['queries']['mean']:>10.1f}{result['errors']:>8}"
+        )
+    return "\n".join(lines)
+
+
+def compare_results(previous, current):
+    """
+    Formats the change in req/s and p50/p95 latency against a previous run.
+    """
+    lines = [f"{'scenario':<20}{'req/s':>12}{'p50':>12}{'p95':>12}{'queries':>12}"]
+    for name, result in current["results"].items():
+        before = previous["results"].get(name)
+        if before is None:
+            continue
+        lines.append(
+            f"{name:<20}"
+            f"{_delta(before['req_per_s'], result['req_per_s']):>12}"
+            f"{_delta(before['latency_ms']['p50'], result['latency_ms']['p50']):>12}"
+            f"{_delta(before['latency_ms']['p95'], result['latency_ms']['p95']):>12}"
+            f"{_delta(before['queries']['mean'], result['queries']['mean']):>12}"
+        )
+    return "\n".join(lines)
+
+
+def _delta(before, after):
+    if not before:
+        return "n/a"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+def write_results(document, path):
+    with open(path, "w") as output:
+        json.dump(document, output, indent=2)
+        output.write("\n")
+
+
+def read_results(path):
+    with open(path) as source:
+        return json.load(source)
@@ -0,0 +1,132 @@
+from django.urls import reverse
+
+PASSWORD = "testpassword"
+
+
+class Scenario:
+    """
+    A named kind of request replayed by the benchmark runner.
+
+    `build` receives the seeded `dataset` and the run's `rng` and returns the
+    request to send, a dict with its `method`, `path` and, for POSTs, JSON
+    `data` (see `runner.send`); `setup` runs once with the client, unmeasured,
+    before the first request (e.g. to log in).
+    """
+
+    name = None
+    expected_status = 200
+
+    def setup(self, client, dataset):
+        pass
+
+    def build(self, dataset, rng):
+        raise NotImplementedError
+
+
+class ListScenario(Scenario):
+    name = "list"
+
+    def build(self, dataset, rng):
+        return {"method": "GET", "path": reverse("apartments-list")}
+
+
+class ListCursorScenario(Scenario):
+    name = "list_cursor"
+
+    def build(self, dataset, rng):
+        return {
+            "method": "GET",
+            "path": reverse("apartments-list") + "?pagination=cursor",
+        }
+
+
+class ListAuthenticatedScenario(Scenario):
+    """
+    Lists apartments with the access token cookie, which exercises
+    `JWTAuthenticationFromCookieMiddleware` and JWT authentication.
+    """
+
+    name = "list_authenticated"
+
+    def setup(self, client, dataset):
+        login(client, dataset)
+
+    def build(self, dataset, rng):
+        return {"method": "GET", "path": reverse("apartments-list")}
+
+
+class FilterScenario(Scenario):
+    name = "filter"
+
+    def build(self, dataset, rng):
+        price_min = rng.randrange(100, 5000)
+        query = (
+            f"?availability=true&number_of_rooms={rng.randint(1, 5)}"
+            f"&price_min={price_min}&price_max={price_min + 3000}"
+        )
+        return {"method": "GET", "path": reverse("apartments-list") + query}
+
+
+class SearchScenario(Scenario):
+    name = "search"
+
+    def build(self, dataset, rng):
+        term = rng.choice(dataset["search_terms"])
+        return {"method": "GET", "path": reverse("apartments-list") + f"?search={term}"}
+
+
+class RetrieveScenario(Scenario):
+    name = "retrieve"
+
+    def build(self, dataset, rng):
+        slug = rng.choice(dataset["slugs"])
+        return {
+            "method": "GET",
+            "path": reverse("apartments-detail", kwargs={"slug": slug}),
+        }
+
+
+class LoginScenario(Scenario):
+    name = "login"
+
+    def build(self, dataset, rng):
+        return {
+            "method": "POST",
+            "path": reverse("login"),
+            "data": {"email": rng.choice(dataset["emails"]), "password": PASSWORD},
+        }
+
+
+class RefreshScenario(Scenario):
+    name = "refresh"
+
+    def setup(self, client, dataset):
+        login(client, dataset)
+
+    def build(self, dataset, rng):
+        return {"method": "POST", "path": reverse("refresh")}
+
+
+def login(client, dataset):
+    response = client.post(
+        reverse("login"),
+        {"email": dataset["emails"][0], "password": PASSWORD},
+        content_type="application/json",
+    )
+    if response.status_code != 200:
+        raise RuntimeError(f"Benchmark login failed: {response.status_code}")
+
+
+SCENARIOS = {
+    scenario.name: scenario
+    for scenario in (
+        ListScenario,
+        ListCursorScenario,
+        ListAuthenticatedScenario,
+        FilterScenario,
+        SearchScenario,
+        RetrieveScenario,
+        LoginScenario,
+        RefreshScenario,
+    )
+}
@@ -0,0 +1,4 @@
+# Loads the Celery app with Django so that shared tasks use its configuration.
+from .celery import app as celery_app
+
+__all__ = ("celery_app",)
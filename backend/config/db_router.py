@@ -0,0 +1,135 @@
+import contextlib
+import contextvars
+import random
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.deprecation import MiddlewareMixin
+from rest_framework.permissions import SAFE_METHODS
+
+# Cookie pinning a client that just wrote to the primary database.
+PIN_COOKIE = "db_primary"
+
+_replica = contextvars.ContextVar("database_replica", default=None)
+
+
+def read_database(request):
+    """
+    Returns the replica alias the reads of `request` can be sent to, or None
+    if they must go to the primary.
+
+    Reads go to the primary when no replica is configured, for unsafe methods
+    and for clients that wrote in the last `DATABASE_REPLICA_PIN_SECONDS` (see
+    `ReplicaPinningMiddleware`), so writers see their own writes.
+    """
+    replicas = settings.DATABASE_REPLICAS
+    if not replicas or request.method not in SAFE_METHODS:
+        return None
+    if PIN_COOKIE in request.COOKIES:
+        return None
+    return random.choice(replicas)
+
+
+def fresh_reads(modified_at):
+    """
+    Sends the reads made in the block to the primary if the data was modified
+    (`modified_at`, a Unix timestamp) in the last
+    `DATABASE_REPLICA_PIN_SECONDS`, since replicas may still lag behind;
+    otherwise leaves their routing alone.
+
+    Meant for reads whose result is cached: a response cached under a new
+    version must not be built from a replica that has not caught up yet.
+    """
+    pin_seconds = settings.DATABASE_REPLICA_PIN_SECONDS
+    if modified_at is not None and time.time() - modified_at <= pin_seconds:
+        return replica_reads(None)
+    return contextlib.nullcontext()
+
+
+@contextlib.contextmanager
+def replica_reads(alias):
+    """
+    Sends the reads made in the block to the `alias` replica (the primary if
+    None). Writes always go to the primary.
+    """
+    token = _replica.set(alias)
+    try:
+        yield
+    finally:
+        _replica.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Database router sending reads to a replica inside `replica_reads`.
+
+    Outside of it, and for every write, queries go to the primary, so only
+    the views that opt in (see `ReplicaReadsMixin`) read from replicas.
+    Replicas are never migrated; they receive the schema from the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        return _replica.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+class ReplicaReadsMixin:
+    """
+    Viewset mixin sending the reads of the `replica_actions` to a replica (see
+    `read_database`).
+    """
+
+    replica_actions = ("list", "retrieve")
+
+    def dispatch(self, request, *args, **kwargs):
+        action = self.action_map.get(request.method.lower())
+        with replica_reads(self.get_read_database(request, action)):
+            return super().dispatch(request, *args, **kwargs)
+
+    def get_read_database(self, request, action):
+        """
+        Returns the replica alias to read from for `action`, or None.
+        """
+        if action not in self.replica_actions:
+            return None
+        return read_database(request)
+
+
+class ReplicaPinningMiddleware(MiddlewareMixin):
+    """
+    Middleware pinning a client to the primary database after it writes.
+
+    Successful unsafe requests set a cookie that expires after
+    `DATABASE_REPLICA_PIN_SECONDS`; while it is present, the client reads from
+    the primary and sees its own writes even if the replicas lag behind.
+    Does nothing when no replica is configured.
+    """
+
+    def process_response(self, request, response):
+        if (
+            settings.DATABASE_REPLICAS
+            and request.method not in SAFE_METHODS
+            and response.status_code < 400
+        ):
+            response.set_cookie(
+                PIN_COOKIE,
+                "1",
+                max_age=settings.DATABASE_REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
@@ -0,0 +1,225 @@
+import contextlib
+import contextvars
+import logging
+import random
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+_current = contextvars.ContextVar("request_metrics", default=None)
+
+
+class RequestMetrics:
+    """
+    Query count and timings collected for one sampled request.
+    """
+
+    __slots__ = ("queries", "db_time", "timings")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.timings = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        """
+        Database execute wrapper counting queries and the time spent in them.
+        """
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Database execute wrapper adding the query to the current request's metrics.
+
+    It is installed on every connection and looks the metrics up in a context
+    variable, so queries that async views run through `sync_to_async` in
+    another thread are counted too.
+    """
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+def install_query_recorder(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+connection_created.connect(install_query_recorder)
+
+
+@contextlib.contextmanager
+def measure(name):
+    """
+    Adds the time spent in the block to the current request's `name` timing.
+
+    Does nothing when the request is not sampled.
+    """
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.timings[name] = (
+            metrics.timings.get(name, 0.0) + time.perf_counter() - started
+        )
+
+
+class MetricsAggregator:
+    """
+    Thread-safe per-view totals, logged and reset every `interval` seconds.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._views = {}
+        self._flushed_at = time.monotonic()
+
+    def add(self, view, total, metrics):
+        with self._lock:
+            stats = self._views.setdefault(
+                view,
+                {"count": 0, "total": 0.0, "max": 0.0, "queries": 0, "db": 0.0},
+            )
+            stats["count"] += 1
+            stats["total"] += total
+            stats["max"] = max(stats["max"], total)
+            stats["queries"] += metrics.queries
+            stats["db"] += metrics.db_time
+            for name, value in metrics.timings.items():
+                stats[name] = stats.get(name, 0.0) + value
+
+            now = time.monotonic()
+            if now - self._flushed_at < self.interval:
+                return
+            views, self._views, self._flushed_at = self._views, {}, now
+        self.log(views)
+
+    def log(self, views):
+        for view, stats in sorted(views.items()):
+            count = stats["count"]
+            timings = " ".join(
+                f"{name}_ms={value / count * 1000:.2f}"
+                for name, value in stats.items()
+                if name not in ("count", "total", "max", "queries", "db")
+            )
+            logger.info(
+                f"request_metrics view={view} count={count} "
+                f"mean_ms={stats['total'] / count * 1000:.2f} "
+                f"max_ms={stats['max'] * 1000:.2f} "
+                f"queries={stats['queries'] / count:.1f} "
+                f"db_ms={stats['db'] / count * 1000:.2f} {timings}".rstrip()
+            )
+
+
+class RequestInstrumentationMiddleware:
+    """
+    Middleware recording per-view query count, DB time and latency.
+
+    A `REQUEST_METRICS_SAMPLE_RATE` fraction of requests is instrumented with
+    a database execute wrapper, so it works with `DEBUG` off. Sampled
+    responses get a `Server-Timing` header (unless `REQUEST_METRICS_SERVER_TIMING`
+    is off) and are aggregated per view into a log line written every
+    `REQUEST_METRICS_LOG_INTERVAL` seconds. Code inside a view can add its own
+    timings with `measure()`. Runs natively under both WSGI and ASGI.
+
+    Queries made while a streaming response is consumed are not counted.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        """Initializes the middleware."""
+        self.get_response = get_response
+        self.sample_rate = settings.REQUEST_METRICS_SAMPLE_RATE
+        self.server_timing = settings.REQUEST_METRICS_SERVER_TIMING
+        self.aggregator = MetricsAggregator(settings.REQUEST_METRICS_LOG_INTERVAL)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        """
+        Processes each request, instrumenting the sampled ones.
+        """
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.is_sampled():
+            return self.get_response(request)
+
+        metrics, token = self.start()
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, time.perf_counter() - started, metrics)
+
+    async def __acall__(self, request):
+        """
+        Async variant of `__call__`.
+        """
+        if not self.is_sampled():
+            return await self.get_response(request)
+
+        metrics, token = self.start()
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, time.perf_counter() - started, metrics)
+
+    def is_sampled(self):
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def start(self):
+        """
+        Starts collecting metrics for the current request.
+
+        Connections opened before this module was imported never sent
+        `connection_created` to `install_query_recorder`, so the recorder is
+        installed on this thread's connections here.
+        """
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(connection)
+        metrics = RequestMetrics()
+        return metrics, _current.set(metrics)
+
+    def finish(self, request, response, total, metrics):
+        self.aggregator.add(self.get_view_name(request), total, metrics)
+        if self.server_timing:
+            response["Server-Timing"] = self.format_server_timing(total, metrics)
+        return response
+
+    def get_view_name(self, request):
+        match = request.resolver_match
+        view = match.view_name if match else "unresolved"
+        return f"{request.method} {view}"
+
+    def format_server_timing(self, total, metrics):
+        entries = [
+            f'db;dur={metrics.db_time * 1000:.2f};desc="{metrics.queries} queries"'
+        ]
+        entries.extend(
+            f"{name};dur={value * 1000:.2f}" for name, value in metrics.timings.items()
+        )
+        entries.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(entries)
@@ -24,6 +24,7 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "whitenoise.runserver_nostatic",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # Third-party apps
     "rest_framework",
     "rest_framework_simplejwt",
@@ -35,8 +36,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "config.instrumentation_middleware.RequestInstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "config.static_middleware.AsyncWhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -45,6 +47,7 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "config.jwt_cookie_middleware.JWTAuthenticationFromCookieMiddleware",
+    "config.db_router.ReplicaPinningMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -68,16 +71,35 @@ TEMPLATES = [
 WSGI_APPLICATION = "config.wsgi.application"
 
 # Database
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.postgresql",
-        "NAME": env("POSTGRES_NAME"),
-        "USER": env("POSTGRES_USER"),
-        "PASSWORD": env("POSTGRES_PASSWORD"),
-        "HOST": env("POSTGRES_HOST"),
-        "PORT": env("POSTGRES_PORT"),
+# DATABASE_URL (e.g. sqlite:////tmp/bench.sqlite3) takes precedence over the
+# POSTGRES_* variables, which is handy for local benchmark and test runs.
+if env("DATABASE_URL", default=None):
+    DATABASES = {"default": env.db("DATABASE_URL")}
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": env("POSTGRES_NAME"),
+            "USER": env("POSTGRES_USER"),
+            "PASSWORD": env("POSTGRES_PASSWORD"),
+            "HOST": env("POSTGRES_HOST"),
+            "PORT": env("POSTGRES_PORT"),
+        }
     }
-}
+
+# Read replica: DATABASE_REPLICA_URL adds a "replica" database that the safe
+# reads of the apartment list/detail and admin user views are sent to (see
+# config.db_router). A client is pinned to the primary for
+# DATABASE_REPLICA_PIN_SECONDS after it writes, and responses cached for as
+# long after an apartment changes are computed from the primary; set it above
+# the replication lag.
+DATABASE_REPLICAS = []
+if env("DATABASE_REPLICA_URL", default=None):
+    DATABASES["replica"] = env.db("DATABASE_REPLICA_URL")
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+    DATABASE_REPLICAS.append("replica")
+DATABASE_ROUTERS = ["config.db_router.ReplicaRouter"]
+DATABASE_REPLICA_PIN_SECONDS = env.int("DATABASE_REPLICA_PIN_SECONDS", default=5)
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -95,6 +117,33 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing. New hashes use PASSWORD_HASHER ("argon2", "scrypt" or
+# "pbkdf2") with the cost parameters below; hashes made with another algorithm
+# or older parameters are upgraded on the user's next login. Measure the cost
+# with `manage.py bench_password_hashers`.
+PASSWORD_HASHER = env("PASSWORD_HASHER", default="argon2")
+_TUNED_PASSWORD_HASHERS = {
+    "argon2": "apps.users.hashers.TunedArgon2PasswordHasher",
+    "scrypt": "apps.users.hashers.TunedScryptPasswordHasher",
+    "pbkdf2": "apps.users.hashers.TunedPBKDF2PasswordHasher",
+}
+PASSWORD_HASHERS = [
+    _TUNED_PASSWORD_HASHERS[PASSWORD_HASHER],
+    *(
+        hasher
+        for name, hasher in _TUNED_PASSWORD_HASHERS.items()
+        if name != PASSWORD_HASHER
+    ),
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+]
+PASSWORD_ARGON2_TIME_COST = env.int("PASSWORD_ARGON2_TIME_COST", default=2)
+PASSWORD_ARGON2_MEMORY_COST = env.int("PASSWORD_ARGON2_MEMORY_COST", default=102400)
+PASSWORD_ARGON2_PARALLELISM = env.int("PASSWORD_ARGON2_PARALLELISM", default=8)
+PASSWORD_SCRYPT_WORK_FACTOR = env.int("PASSWORD_SCRYPT_WORK_FACTOR", default=2**14)
+PASSWORD_SCRYPT_BLOCK_SIZE = env.int("PASSWORD_SCRYPT_BLOCK_SIZE", default=8)
+PASSWORD_SCRYPT_PARALLELISM = env.int("PASSWORD_SCRYPT_PARALLELISM", default=5)
+PASSWORD_PBKDF2_ITERATIONS = env.int("PASSWORD_PBKDF2_ITERATIONS", default=1_000_000)
+
 # Internationalization
 LANGUAGE_CODE = "en-us"
 TIME_ZONE = "UTC"
@@ -113,6 +162,9 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # Media files
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
+# Stream every upload to a temporary file in chunks instead of buffering small
+# files in memory; FileSystemStorage then moves the file into place.
+FILE_UPLOAD_HANDLERS = ["django.core.files.uploadhandler.TemporaryFileUploadHandler"]
 
 # Custom user model
 AUTH_USER_MODEL = "users.User"
@@ -120,11 +172,15 @@ AUTH_USER_MODEL = "users.User"
 # REST Framework
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.users.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
+    # Reverse proxies in front of the app. Client IPs (e.g. for the auth rate
+    # limits) are read from X-Forwarded-For only behind that many proxies;
+    # otherwise the header is client-controlled and REMOTE_ADDR is used.
+    "NUM_PROXIES": env.int("NUM_PROXIES", default=0),
 }
 
 # DRF Spectacular
@@ -150,9 +206,139 @@ EMAIL_PORT = env("EMAIL_PORT", default=587)
 EMAIL_USE_TLS = env.bool("EMAIL_USE_TLS", True)
 DEFAULT_FROM_EMAIL = env("DEFAULT_FROM_EMAIL", default="rental-service@localhost")
 
+# Apartment API response cache (seconds). Entries are invalidated on write.
+APARTMENT_CACHE_TIMEOUT = env.int("APARTMENT_CACHE_TIMEOUT", default=60 * 60 * 6)
+
+# Concurrent misses of an apartment response wait up to APARTMENT_CACHE_LOCK_WAIT
+# seconds for the one computing it; the lock it holds expires after
+# APARTMENT_CACHE_LOCK_TIMEOUT seconds
+APARTMENT_CACHE_LOCK_TIMEOUT = env.int("APARTMENT_CACHE_LOCK_TIMEOUT", default=10)
+APARTMENT_CACHE_LOCK_WAIT = env.float("APARTMENT_CACHE_LOCK_WAIT", default=2)
+
+# Apartment cache warming: fraction of list/detail requests counted in the access
+# statistics and URLs kept per kind; pages of the hottest lists, hottest lists and
+# details, and extra absolute list URLs warmed per run; whether (and how many
+# seconds later) invalidations trigger a run, and interval (seconds) of the
+# Celery beat run
+APARTMENT_CACHE_ACCESS_SAMPLE_RATE = env.float(
+    "APARTMENT_CACHE_ACCESS_SAMPLE_RATE", default=0.1
+)
+APARTMENT_CACHE_ACCESS_TRACKED = env.int("APARTMENT_CACHE_ACCESS_TRACKED", default=1000)
+APARTMENT_CACHE_WARM_PAGES = env.int("APARTMENT_CACHE_WARM_PAGES", default=3)
+APARTMENT_CACHE_WARM_LISTS = env.int("APARTMENT_CACHE_WARM_LISTS", default=20)
+APARTMENT_CACHE_WARM_DETAILS = env.int("APARTMENT_CACHE_WARM_DETAILS", default=100)
+APARTMENT_CACHE_WARM_URLS = env.list("APARTMENT_CACHE_WARM_URLS", default=[])
+APARTMENT_CACHE_WARM_ON_INVALIDATE = env.bool(
+    "APARTMENT_CACHE_WARM_ON_INVALIDATE", default=True
+)
+APARTMENT_CACHE_WARM_DELAY = env.int("APARTMENT_CACHE_WARM_DELAY", default=5)
+APARTMENT_CACHE_WARM_INTERVAL = env.int("APARTMENT_CACHE_WARM_INTERVAL", default=60 * 5)
+
+# Render apartment responses with orjson when it is installed (optional dependency)
+APARTMENT_ORJSON_RENDERER = env.bool("APARTMENT_ORJSON_RENDERER", default=True)
+
+# Apartment full-text search
+APARTMENT_SEARCH_CONFIG = env("APARTMENT_SEARCH_CONFIG", default="english")
+APARTMENT_SEARCH_FUZZY = env.bool("APARTMENT_SEARCH_FUZZY", default=False)
+
+# Apartment bulk API
+APARTMENT_BULK_MAX_ROWS = env.int("APARTMENT_BULK_MAX_ROWS", default=5000)
+APARTMENT_BULK_CHUNK_SIZE = env.int("APARTMENT_BULK_CHUNK_SIZE", default=500)
+
+# Apartment export (rows fetched per server-side cursor round trip)
+APARTMENT_EXPORT_CHUNK_SIZE = env.int("APARTMENT_EXPORT_CHUNK_SIZE", default=2000)
+
+# Apartment stats summary: delay (seconds) before the groups touched by a write
+# are recomputed, and interval (seconds) of the full Celery beat refresh
+APARTMENT_STATS_REFRESH_DELAY = env.int("APARTMENT_STATS_REFRESH_DELAY", default=5)
+APARTMENT_STATS_REFRESH_INTERVAL = env.int(
+    "APARTMENT_STATS_REFRESH_INTERVAL", default=60 * 15
+)
+
+# Upper bounds of the price buckets counted by the apartment list `facets`
+# parameter; the last bucket has no upper bound
+APARTMENT_PRICE_FACET_BOUNDARIES = env.list(
+    "APARTMENT_PRICE_FACET_BOUNDARIES", cast=int, default=[500, 1000, 2000, 5000]
+)
+
+# Length (characters) the description is truncated to by the compact view of the
+# apartment list
+APARTMENT_COMPACT_DESCRIPTION_LENGTH = env.int(
+    "APARTMENT_COMPACT_DESCRIPTION_LENGTH", default=160
+)
+
+# Largest `radius` (km) accepted by the apartment geo search
+APARTMENT_GEO_MAX_RADIUS_KM = env.float("APARTMENT_GEO_MAX_RADIUS_KM", default=100)
+
+# Apartment images: upload limits, and the longest side (px) of each WebP
+# thumbnail size generated in the background
+APARTMENT_IMAGE_MAX_SIZE = env.int("APARTMENT_IMAGE_MAX_SIZE", default=10 * 1024 * 1024)
+APARTMENT_IMAGE_MAX_PIXELS = env.int("APARTMENT_IMAGE_MAX_PIXELS", default=40_000_000)
+APARTMENT_IMAGE_MAX_PER_APARTMENT = env.int(
+    "APARTMENT_IMAGE_MAX_PER_APARTMENT", default=20
+)
+APARTMENT_IMAGE_SIZES = {"small": 320, "medium": 800, "large": 1600}
+APARTMENT_IMAGE_WEBP_QUALITY = env.int("APARTMENT_IMAGE_WEBP_QUALITY", default=80)
+
+# Apartment change outbox: delay (seconds) before a write's changes are relayed,
+# changes per relay batch and batches per relay run, interval (seconds) of the
+# Celery beat relay, days published changes are kept, and the dotted paths of
+# the publishers each batch is handed to (see apps.apartments.outbox)
+APARTMENT_OUTBOX_RELAY_DELAY = env.int("APARTMENT_OUTBOX_RELAY_DELAY", default=1)
+APARTMENT_OUTBOX_BATCH_SIZE = env.int("APARTMENT_OUTBOX_BATCH_SIZE", default=500)
+APARTMENT_OUTBOX_MAX_BATCHES = env.int("APARTMENT_OUTBOX_MAX_BATCHES", default=20)
+APARTMENT_OUTBOX_RELAY_INTERVAL = env.int("APARTMENT_OUTBOX_RELAY_INTERVAL", default=30)
+APARTMENT_OUTBOX_RETENTION_DAYS = env.int("APARTMENT_OUTBOX_RETENTION_DAYS", default=7)
+APARTMENT_OUTBOX_PUBLISHERS = env.list("APARTMENT_OUTBOX_PUBLISHERS", default=[])
+APARTMENT_OUTBOX_STREAM_MAXLEN = env.int(
+    "APARTMENT_OUTBOX_STREAM_MAXLEN", default=100_000
+)
+# Default and largest `limit` of the apartment change feed
+APARTMENT_CHANGES_PAGE_SIZE = env.int("APARTMENT_CHANGES_PAGE_SIZE", default=100)
+APARTMENT_CHANGES_MAX_PAGE_SIZE = env.int(
+    "APARTMENT_CHANGES_MAX_PAGE_SIZE", default=1000
+)
+
+# Users loaded by CachedJWTAuthentication are cached in the shared cache and,
+# more briefly, in process (seconds)
+USER_CACHE_TIMEOUT = env.int("USER_CACHE_TIMEOUT", default=60)
+USER_LOCAL_CACHE_TIMEOUT = env.int("USER_LOCAL_CACHE_TIMEOUT", default=5)
+
+# Sliding-window limits for the auth endpoints: (max attempts, window seconds).
+# Login limits count failed attempts; the refresh limit counts every attempt.
+AUTH_RATE_LIMITS = {
+    "login_ip": (env.int("LOGIN_FAILURES_PER_IP", default=20), 15 * 60),
+    "login_email": (env.int("LOGIN_FAILURES_PER_EMAIL", default=5), 15 * 60),
+    "refresh_ip": (env.int("REFRESH_ATTEMPTS_PER_IP", default=60), 60),
+}
+
+# Request instrumentation: fraction of requests sampled, interval (seconds) of
+# the aggregated metrics log line, and whether to send Server-Timing headers
+REQUEST_METRICS_SAMPLE_RATE = env.float("REQUEST_METRICS_SAMPLE_RATE", default=0.05)
+REQUEST_METRICS_LOG_INTERVAL = env.int("REQUEST_METRICS_LOG_INTERVAL", default=60)
+REQUEST_METRICS_SERVER_TIMING = env.bool("REQUEST_METRICS_SERVER_TIMING", default=True)
+
 # Celery
 CELERY_BROKER_URL = env("CELERY_BROKER_URL", default="redis://localhost:6379/0")
 CELERY_RESULT_BACKEND = env("CELERY_RESULT_BACKEND", default="redis://localhost:6379/0")
 CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
+CELERY_BEAT_SCHEDULE = {
+    "refresh-apartment-stats": {
+        "task": "apps.apartments.tasks.refresh_apartment_stats",
+        "schedule": APARTMENT_STATS_REFRESH_INTERVAL,
+    },
+    "relay-apartment-changes": {
+        "task": "apps.apartments.tasks.relay_apartment_changes",
+        "schedule": APARTMENT_OUTBOX_RELAY_INTERVAL,
+    },
+    "warm-apartment-cache": {
+        "task": "apps.apartments.tasks.warm_apartment_cache",
+        "schedule": APARTMENT_CACHE_WARM_INTERVAL,
+    },
+    "prune-apartment-changes": {
+        "task": "apps.apartments.tasks.prune_apartment_changes",
+        "schedule": 60 * 60,
+    },
+}
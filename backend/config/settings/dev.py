@@ -78,8 +78,10 @@ SESSION_COOKIE_SAMESITE = "Lax"
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=15),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
-    "ROTATE_REFRESH_TOKENS": False,  # True - if refresh is updated every time
-    "BLACKLIST_AFTER_ROTATION": True,
+    "ROTATE_REFRESH_TOKENS": True,  # refresh is updated every time
+    # Used refresh tokens go to the cache denylist in apps.users.tokens
+    # instead of the token_blacklist tables.
+    "BLACKLIST_AFTER_ROTATION": False,
     "AUTH_HEADER_TYPES": ("Bearer",),  # for debugging/testing via Swagger
     "AUTH_TOKEN_CLASSES": ("rest_framework_simplejwt.tokens.AccessToken",),
 }
@@ -0,0 +1,4 @@
+from .dev import *
+
+# Password hashing dominates the run time of auth tests; never use outside tests.
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
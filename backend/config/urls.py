@@ -1,3 +1,5 @@
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, include
 
@@ -12,6 +14,7 @@ urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/v1/users/", include("apps.users.api.urls")),
     path("api/v1/apartments/", include("apps.apartments.api.urls")),
+    path("api/v1/async/apartments/", include("apps.apartments.api.async_urls")),
     path("api/v1/auth/", include("apps.users.api.urls_auth")),
     # Documentation
     path("api/v1/schema/", SpectacularAPIView.as_view(), name="schema"),
@@ -24,3 +27,7 @@ urlpatterns = [
         "api/v1/redoc/", SpectacularRedocView.as_view(url_name="schema"), name="redoc"
     ),
 ]
+
+# Serve uploaded apartment images in development; use the web server or the
+# storage backend in production.
+urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -1,4 +1,12 @@
+import argparse
+import csv
+import functools
+import io
+import multiprocessing
 import os
+import time
+from decimal import Decimal
+
 import django
 import logging
 
@@ -8,9 +16,16 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.dev")
 django.setup()
 
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection, connections, transaction
+from django.test import override_settings
+from apps.apartments import cache as apartment_cache
+from apps.apartments import geo, stats
 from apps.apartments.models import Apartment
+from apps.apartments.slugs import allocate_slugs
 from factory import Factory, Faker, SubFactory
 from factory.django import DjangoModelFactory
+from faker import Faker as FakerGenerator
 
 
 User = get_user_model()
@@ -41,7 +56,6 @@ class UserFactory(DjangoModelFactory):
         password = kwargs.pop("password", None)
         kwargs["first_name"] = kwargs.get("first_name", "")[:50]
         kwargs["last_name"] = kwargs.get("last_name", "")[:50]
-        kwargs["slug"] = kwargs.get("slug", "")[:50]
         obj = model_class(*args, **kwargs)
         if password:
             obj.set_password(password)
@@ -97,6 +111,292 @@ def create_users_and_apartments(
         logger.error(f"Error creating users and apartments: {e}")
 
 
+DEFAULT_PASSWORD = "testpassword"
+FAST_PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+# Names and descriptions are drawn from a pool of this many generated texts,
+# since generating fresh Faker text for every row dominates seeding.
+TEXT_POOL_SIZE = 1024
+# (south, west, north, east) box seeded apartments are located in.
+SEED_AREA = (50.35, 30.35, 50.55, 30.75)
+
+
+@functools.lru_cache(maxsize=None)
+def _text_pool(seed):
+    """
+    Returns the (names, descriptions) pool for `seed`, built once per process.
+    """
+    fake = FakerGenerator()
+    fake.seed_instance(seed)
+    names = [fake.sentence(nb_words=6)[:100] for _ in range(TEXT_POOL_SIZE)]
+    descriptions = [fake.text(max_nb_chars=200) for _ in range(TEXT_POOL_SIZE)]
+    return names, descriptions
+
+
+def _build_users(fake, start, stop, password_hash):
+    return [
+        User(
+            email=f"seed{index}.{fake.user_name()}@{fake.free_email_domain()}",
+            password=password_hash,
+            first_name=fake.first_name()[:50],
+            last_name=fake.last_name()[:50],
+            is_verified=fake.boolean(),
+        )
+        for index in range(start, stop)
+    ]
+
+
+def _random_location(rng):
+    south, west, north, east = SEED_AREA
+    latitude = Decimal(f"{rng.uniform(south, north):.6f}")
+    longitude = Decimal(f"{rng.uniform(west, east):.6f}")
+    return latitude, longitude
+
+
+def _build_apartments(fake, owner_ids, apartments_per_user, pool):
+    rng = fake.random
+    names, descriptions = pool
+    owners = [owner_id for owner_id in owner_ids for _ in range(apartments_per_user)]
+    apartment_names = [rng.choice(names) for _ in owners]
+    locations = [_random_location(rng) for _ in owners]
+    return [
+        Apartment(
+            owner_id=owner_id,
+            name=name,
+            slug=slug,
+            description=rng.choice(descriptions),
+            price=Decimal(rng.randrange(10000, 1000001)) / 100,
+            number_of_rooms=rng.randint(1, 5),
+            square=Decimal(rng.randrange(2000, 15001)) / 100,
+            availability=rng.random() < 0.5,
+            latitude=latitude,
+            longitude=longitude,
+            geo_cell=geo.cell_of(latitude, longitude),
+        )
+        for owner_id, name, slug, (latitude, longitude) in zip(
+            owners, apartment_names, allocate_slugs(apartment_names), locations
+        )
+    ]
+
+
+def _copy(objs):
+    """
+    Inserts model instances with PostgreSQL's COPY, bypassing per-row INSERTs.
+
+    Field defaults and `auto_now_add` values are resolved the same way
+    `bulk_create` resolves them.
+    """
+    model = type(objs[0])
+    fields = [field for field in model._meta.concrete_fields if not field.primary_key]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for obj in objs:
+        row = []
+        for field in fields:
+            value = field.get_db_prep_save(field.pre_save(obj, True), connection)
+            row.append("" if value is None else value)
+        writer.writerow(row)
+    buffer.seek(0)
+    columns = ", ".join(connection.ops.quote_name(field.column) for field in fields)
+    with connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {connection.ops.quote_name(model._meta.db_table)} ({columns}) "
+            "FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+
+
+def _insert_users(users, use_copy):
+    if not use_copy:
+        return [user.pk for user in User.objects.bulk_create(users)]
+    _copy(users)
+    ids = dict(
+        User.objects.filter(email__in=[user.email for user in users]).values_list(
+            "email", "id"
+        )
+    )
+    return [ids[user.email] for user in users]
+
+
+def _insert_apartments(apartments, use_copy):
+    if use_copy:
+        _copy(apartments)
+    else:
+        Apartment.objects.bulk_create(apartments)
+
+
+def seed_chunk(chunk, start, stop, apartments_per_user, seed, password_hash, use_copy):
+    """
+    Creates users `start` to `stop` and their apartments in one transaction.
+
+    Every chunk seeds its own Faker instance from `seed` and the chunk number,
+    so a run is reproducible regardless of how chunks are spread over workers.
+
+    Returns:
+        A (users, apartments) tuple with the number of rows created.
+    """
+    fake = FakerGenerator()
+    fake.seed_instance(seed * 1_000_003 + chunk)
+    with transaction.atomic():
+        users = _build_users(fake, start, stop, password_hash)
+        owner_ids = _insert_users(users, use_copy)
+        apartments = _build_apartments(
+            fake, owner_ids, apartments_per_user, _text_pool(seed)
+        )
+        if apartments:
+            _insert_apartments(apartments, use_copy)
+    return len(users), len(apartments)
+
+
+def _seed_chunk_args(args):
+    return seed_chunk(*args)
+
+
+def _init_worker():
+    # Forked workers must not share the parent's database connection.
+    connections.close_all()
+
+
+def bulk_create_users_and_apartments(
+    num_users: int,
+    apartments_per_user: int,
+    seed: int = 0,
+    chunk_size: int = 5000,
+    workers: int = 1,
+    use_copy: bool | None = None,
+    password: str = DEFAULT_PASSWORD,
+) -> dict:
+    """
+    Seeds users and apartments in bulk for load and benchmark datasets.
+
+    Unlike `create_users_and_apartments`, the password is hashed once and
+    shared by every user, rows are generated in chunks of about `chunk_size`
+    apartments and written with `bulk_create` (or COPY on PostgreSQL), and
+    `Apartment.save` is bypassed, so no per-row validation or cache
+    invalidation runs. Generated values always pass model validation; the
+    apartment cache is invalidated and the stats summary recomputed once at
+    the end.
+
+    Args:
+        num_users: The number of users to create.
+        apartments_per_user: The number of apartments to create for each user.
+        seed: Seed for the generated data.
+        chunk_size: Approximate number of apartments written per transaction.
+        workers: Number of worker processes; chunks are spread across them.
+        use_copy: Use COPY instead of `bulk_create`. Defaults to True on
+            PostgreSQL.
+        password: The password shared by every seeded user.
+
+    Returns:
+        A dict with the number of users and apartments created, the elapsed
+        seconds and the overall rows per second.
+    """
+    if use_copy is None:
+        use_copy = connection.vendor == "postgresql"
+    if use_copy and connection.vendor != "postgresql":
+        raise ValueError("COPY seeding requires PostgreSQL.")
+
+    password_hash = make_password(password)
+    offset = User.objects.count()
+    users_per_chunk = max(1, chunk_size // max(apartments_per_user, 1))
+    tasks = [
+        (
+            chunk,
+            offset + start,
+            offset + min(start + users_per_chunk, num_users),
+            apartments_per_user,
+            seed,
+            password_hash,
+            use_copy,
+        )
+        for chunk, start in enumerate(range(0, num_users, users_per_chunk))
+    ]
+
+    started = time.perf_counter()
+    users = apartments = 0
+    if workers > 1:
+        connections.close_all()
+        with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+            results = pool.imap_unordered(_seed_chunk_args, tasks)
+            for created_users, created_apartments in results:
+                users += created_users
+                apartments += created_apartments
+                _log_progress(users, apartments, started)
+    else:
+        for task in tasks:
+            created_users, created_apartments = seed_chunk(*task)
+            users += created_users
+            apartments += created_apartments
+            _log_progress(users, apartments, started)
+
+    apartment_cache.invalidate_apartments()
+    stats.refresh_stats()
+    elapsed = time.perf_counter() - started
+    rows_per_second = (users + apartments) / elapsed if elapsed else 0.0
+    logger.info(
+        f"Seeded {users} users and {apartments} apartments in {elapsed:.1f}s "
+        f"({rows_per_second:.0f} rows/s)"
+    )
+    return {
+        "users": users,
+        "apartments": apartments,
+        "seconds": elapsed,
+        "rows_per_second": rows_per_second,
+    }
+
+
+def _log_progress(users, apartments, started):
+    elapsed = time.perf_counter() - started
+    rate = (users + apartments) / elapsed if elapsed else 0.0
+    logger.info(f"  {users} users, {apartments} apartments ({rate:.0f} rows/s)")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Populate the database.")
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--apartments-per-user", type=int, default=3)
+    parser.add_argument(
+        "--bulk", action="store_true", help="Use the high-volume bulk seeding mode."
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument(
+        "--fast-hasher",
+        action="store_true",
+        help=(
+            "Hash passwords with the fast, insecure MD5 hasher (local and test "
+            "datasets only; logging in needs a settings module that lists it)."
+        ),
+    )
+    parser.add_argument(
+        "--no-copy",
+        dest="use_copy",
+        action="store_false",
+        default=None,
+        help="Use bulk_create instead of COPY on PostgreSQL.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(args):
+    if args.bulk:
+        bulk_create_users_and_apartments(
+            args.users,
+            args.apartments_per_user,
+            seed=args.seed,
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+            use_copy=args.use_copy,
+        )
+    else:
+        create_users_and_apartments(args.users, args.apartments_per_user)
+
+
 if __name__ == "__main__":
-    create_users_and_apartments()
+    args = parse_args()
+    if args.fast_hasher:
+        with override_settings(PASSWORD_HASHERS=FAST_PASSWORD_HASHERS):
+            main(args)
+    else:
+        main(args)
     logger.info("Successfully created users and apartments.")
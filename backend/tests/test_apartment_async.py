@@ -0,0 +1,113 @@
+import json
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.apartments.models import Apartment
+
+User = get_user_model()
+
+
+class AsyncApartmentViewTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        owner = User.objects.create_user(email="owner@example.com", password="pass")
+        for i in range(15):
+            Apartment.objects.create(
+                owner=owner,
+                slug=f"apt-{i}",
+                name=f"Apartment {i}",
+                description="Cozy place",
+                number_of_rooms=i % 3 + 1,
+                square=Decimal("40.00"),
+                price=Decimal(100 * (i + 1)),
+                availability=i % 2 == 0,
+            )
+        cls.list_url = reverse("apartments-list")
+        cls.async_list_url = reverse("async-apartments-list")
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def _get_both(self, params):
+        sync = self.client.get(self.list_url, params)
+        async_ = self.client.get(self.async_list_url, params)
+        self.assertEqual(async_.status_code, sync.status_code)
+        self.assertEqual(async_["Content-Type"], sync["Content-Type"])
+        return json.loads(sync.content), json.loads(async_.content)
+
+    def test_list_matches_sync_view(self):
+        """Test that the async list returns the same pages as the viewset."""
+        for params in (
+            {},
+            {"page": 2},
+            {"availability": "true", "number_of_rooms": 1, "price_min": 300},
+            {"search": "Apartment 1"},
+        ):
+            with self.subTest(params=params):
+                sync, async_ = self._get_both(params)
+                self.assertEqual(async_["count"], sync["count"])
+                self.assertEqual(async_["results"], sync["results"])
+                self.assertEqual(async_["next"] is None, sync["next"] is None)
+
+    def test_facets_match_sync_view(self):
+        """Test that the async list returns the same facet counts."""
+        params = {"facets": "number_of_rooms,availability,price", "price_min": 300}
+        sync, async_ = self._get_both(params)
+        self.assertEqual(async_["facets"], sync["facets"])
+        self.assertEqual(
+            sum(item["count"] for item in sync["facets"]["number_of_rooms"]), 13
+        )
+
+    def test_cursor_pages_match_sync_view(self):
+        """Test that async cursor pages follow the same keyset order."""
+        sync, async_ = self._get_both({"pagination": "cursor", "page_size": 4})
+        self.assertEqual(async_["results"], sync["results"])
+        async_next = self.client.get(async_["next"])
+        sync_next = self.client.get(sync["next"])
+        self.assertEqual(
+            json.loads(async_next.content)["results"],
+            json.loads(sync_next.content)["results"],
+        )
+
+    def test_list_errors_match_sync_view(self):
+        """Test that invalid filters and pages fail like the viewset."""
+        for params in ({"price_min": "cheap"}, {"page": 99}, {"cursor": "bm9wZQ=="}):
+            with self.subTest(params=params):
+                sync, async_ = self._get_both(params)
+                self.assertEqual(async_, sync)
+
+    def test_retrieve_matches_sync_view(self):
+        """Test that the async detail returns the viewset's representation."""
+        sync = self.client.get(reverse("apartments-detail", args=["apt-3"]))
+        async_ = self.client.get(reverse("async-apartments-detail", args=["apt-3"]))
+        self.assertEqual(async_.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(async_.content), json.loads(sync.content))
+
+        missing = self.client.get(reverse("async-apartments-detail", args=["nope"]))
+        self.assertEqual(missing.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_responses_are_cached(self):
+        """Test that repeated requests are served from the cache."""
+        url = reverse("async-apartments-detail", args=["apt-3"])
+        self.client.get(url)
+        Apartment.objects.filter(slug="apt-3").update(name="Changed")
+        response = self.client.get(url)
+        self.assertEqual(json.loads(response.content)["name"], "Apartment 3")
+
+    def test_only_safe_methods_are_allowed(self):
+        """Test that the async endpoints are read-only."""
+        response = self.client.post(self.async_list_url, {})
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    async def test_served_by_async_client(self):
+        """Test that the list is served natively through the ASGI handler."""
+        response = await self.async_client.get(self.async_list_url, {"page": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(json.loads(response.content)["results"]), 5)
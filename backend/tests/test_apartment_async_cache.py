@@ -0,0 +1,46 @@
+import asyncio
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from apps.apartments import async_cache
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django_redis.cache.RedisCache",
+            "LOCATION": "redis://localhost:6379/1",
+        }
+    }
+)
+class RedisAsyncCacheTests(SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.clients = []
+
+        def from_url(url):
+            client = mock.MagicMock()
+            client.aclose = mock.AsyncMock()
+            self.clients.append(client)
+            return client
+
+        patcher = mock.patch("redis.asyncio.Redis.from_url", side_effect=from_url)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_clients_are_closed_with_their_loop(self):
+        """Test that each event loop's client is reused, then closed with it."""
+        cache = async_cache.RedisAsyncCache()
+
+        async def use():
+            client = await cache._client()
+            self.assertIs(await cache._client(), client)
+            client.aclose.assert_not_awaited()
+
+        asyncio.run(use())
+        asyncio.run(use())
+        self.assertEqual(len(self.clients), 2)
+        for client in self.clients:
+            client.aclose.assert_awaited_once()
+        self.assertEqual(len(cache._clients), 0)
@@ -0,0 +1,122 @@
+import json
+from decimal import Decimal
+from django.core.cache import cache
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.apartments.models import Apartment
+
+User = get_user_model()
+
+
+class ApartmentBulkTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.owner = User.objects.create_user(
+            email="owner@example.com", password="ownerpass"
+        )
+        cls.other = User.objects.create_user(
+            email="other@example.com", password="otherpass"
+        )
+        cls.bulk_url = reverse("apartments-bulk")
+        cls.row = {
+            "description": "Cozy place",
+            "number_of_rooms": 2,
+            "square": "40.50",
+            "price": "1000.00",
+        }
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client.force_authenticate(self.owner)
+
+    def _create(self, slug, owner):
+        return Apartment.objects.create(
+            owner=owner,
+            slug=slug,
+            name=slug,
+            description="Cozy place",
+            number_of_rooms=1,
+            square=Decimal("30.00"),
+            price=Decimal("500.00"),
+        )
+
+    def test_bulk_create_reports_per_row_results(self):
+        """Test that valid rows are created and invalid rows are reported."""
+        rows = [
+            {**self.row, "name": "First flat"},
+            {**self.row, "name": "Broken flat", "square": "-1"},
+            {**self.row, "name": "Second flat"},
+        ]
+        response = self.client.post(self.bulk_url, rows, format="json")
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        statuses = [result["status"] for result in response.data["results"]]
+        self.assertEqual(statuses, ["created", "error", "created"])
+        self.assertIn("square", response.data["results"][1]["errors"])
+        self.assertEqual(
+            set(Apartment.objects.values_list("name", flat=True)),
+            {"First flat", "Second flat"},
+        )
+        self.assertTrue(
+            all(a.owner_id == self.owner.pk for a in Apartment.objects.all())
+        )
+
+    def test_bulk_create_from_ndjson(self):
+        """Test that an NDJSON body is accepted."""
+        body = "\n".join(
+            json.dumps({**self.row, "name": f"Flat {i}"}) for i in range(3)
+        )
+        response = self.client.post(
+            self.bulk_url, body, content_type="application/x-ndjson"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Apartment.objects.count(), 3)
+
+    def test_bulk_update_is_owner_scoped(self):
+        """Test that only the user's own apartments are updated."""
+        mine = self._create("mine", self.owner)
+        self._create("theirs", self.other)
+        rows = [
+            {"slug": "mine", "price": "750.00"},
+            {"slug": "theirs", "price": "1.00"},
+            {"slug": "missing", "price": "1.00"},
+        ]
+        response = self.client.patch(self.bulk_url, rows, format="json")
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        statuses = [result["status"] for result in response.data["results"]]
+        self.assertEqual(statuses, ["updated", "forbidden", "not_found"])
+        mine.refresh_from_db()
+        self.assertEqual(mine.price, Decimal("750.00"))
+        self.assertEqual(
+            Apartment.objects.get(slug="theirs").price, Decimal("500.00")
+        )
+
+    def test_bulk_delete_is_owner_scoped(self):
+        """Test that only the user's own apartments are deleted."""
+        self._create("mine", self.owner)
+        self._create("theirs", self.other)
+        response = self.client.delete(self.bulk_url, ["mine", "theirs"], format="json")
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(
+            list(Apartment.objects.values_list("slug", flat=True)), ["theirs"]
+        )
+
+    def test_bulk_requires_authentication(self):
+        """Test that anonymous users cannot use the bulk endpoint."""
+        self.client.force_authenticate(None)
+        response = self.client.post(self.bulk_url, [self.row], format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_bulk_create_allocates_unique_slugs_for_equal_names(self):
+        """Test that rows sharing a name get distinct slugs."""
+        rows = [{**self.row, "name": "Cozy studio"} for _ in range(3)]
+        response = self.client.post(self.bulk_url, rows, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        slugs = [result["slug"] for result in response.data["results"]]
+        self.assertEqual(len(set(slugs)), 3)
+        self.assertTrue(all(slug.startswith("cozy-studio-") for slug in slugs))
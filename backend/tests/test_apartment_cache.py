@@ -0,0 +1,72 @@
+from decimal import Decimal
+from django.core.cache import cache
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.apartments import cache as apartment_cache
+from apps.apartments.models import Apartment
+
+User = get_user_model()
+
+
+class ApartmentCacheTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.owner = User.objects.create_user(
+            email="owner@example.com", password="ownerpass"
+        )
+        cls.apartment = Apartment.objects.create(
+            owner=cls.owner,
+            slug="cached-apt",
+            name="Cached Apartment",
+            description="Cozy place",
+            number_of_rooms=2,
+            square=Decimal("40.50"),
+            price=Decimal("1000.00"),
+        )
+        cls.list_url = reverse("apartments-list")
+        cls.detail_url = reverse("apartments-detail", kwargs={"slug": "cached-apt"})
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client.force_authenticate(self.owner)
+
+    def test_repeated_list_is_served_from_cache(self):
+        """Test that the second identical list request is a cache hit."""
+        self.client.get(self.list_url)
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["slug"], "cached-apt")
+        stats = apartment_cache.get_stats()["list"]
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_update_invalidates_list_and_detail(self):
+        """Test that cached responses reflect an update right after it commits."""
+        self.client.get(self.list_url)
+        self.client.get(self.detail_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                self.detail_url, {"name": "Renamed"}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(
+            self.client.get(self.list_url).data["results"][0]["name"], "Renamed"
+        )
+        self.assertEqual(self.client.get(self.detail_url).data["name"], "Renamed")
+
+    def test_delete_invalidates_list(self):
+        """Test that a deleted apartment disappears from the cached list."""
+        self.assertEqual(self.client.get(self.list_url).data["count"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        self.assertEqual(self.client.get(self.list_url).data["count"], 0)
@@ -0,0 +1,247 @@
+import threading
+import time
+from decimal import Decimal
+from importlib.util import find_spec
+from io import StringIO
+from unittest import mock, skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from apps.apartments import async_cache
+from apps.apartments import cache as apartment_cache
+from apps.apartments import warming
+from apps.apartments.models import Apartment
+
+User = get_user_model()
+
+
+@override_settings(APARTMENT_CACHE_ACCESS_SAMPLE_RATE=1)
+class ApartmentCacheWarmingTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.owner = User.objects.create_user(
+            email="owner@example.com", password="ownerpass"
+        )
+        for index in range(5):
+            Apartment.objects.create(
+                owner=cls.owner,
+                slug=f"apt-{index}",
+                name=f"Apartment {index}",
+                description="Cozy place",
+                number_of_rooms=2,
+                square=Decimal("40.00"),
+                price=Decimal("1000.00"),
+            )
+        cls.list_url = reverse("apartments-list")
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def assertServedFromCache(self, *urls):
+        def misses():
+            return sum(kind["misses"] for kind in apartment_cache.get_stats().values())
+
+        before = misses()
+        responses = [self.client.get(url) for url in urls]
+        self.assertEqual(misses(), before)
+        return responses
+
+    def test_accesses_are_counted_per_list_and_detail(self):
+        """Test that list accesses are counted without their page."""
+        for _ in range(2):
+            self.client.get(self.list_url, {"number_of_rooms": 2, "page": 2})
+        self.client.get(self.list_url)
+        self.client.get(reverse("apartments-detail", kwargs={"slug": "apt-1"}))
+
+        self.assertEqual(
+            warming.hottest("list", 10),
+            [
+                "http://testserver/api/v1/apartments/?number_of_rooms=2",
+                "http://testserver/api/v1/apartments/",
+            ],
+        )
+        self.assertEqual(
+            warming.hottest("detail", 10),
+            ["http://testserver/api/v1/apartments/apt-1/"],
+        )
+
+    def test_warm_fills_the_first_pages_of_hot_lists(self):
+        """Test that warming caches the pages a client would follow."""
+        params = {"pagination": "cursor", "page_size": 2}
+        first = self.client.get(self.list_url, params).data
+        second_url = first["next"]
+        self.client.get(reverse("apartments-detail", kwargs={"slug": "apt-3"}))
+        with self.settings(APARTMENT_CACHE_WARM_ON_INVALIDATE=False):
+            apartment_cache.invalidate_apartments(["apt-3"])
+
+        self.assertEqual(warming.warm(pages=2), 3)
+        responses = self.assertServedFromCache(
+            f"{self.list_url}?pagination=cursor&page_size=2",
+            second_url,
+            reverse("apartments-detail", kwargs={"slug": "apt-3"}),
+        )
+        self.assertEqual(responses[0].data, first)
+
+    def test_warming_requests_are_not_counted(self):
+        """Test that the requests made by `warm` leave the statistics alone."""
+        self.client.get(self.list_url)
+        warming.warm(urls=["http://testserver/api/v1/apartments/?availability=true"])
+        self.assertEqual(
+            warming.hottest("list", 10), ["http://testserver/api/v1/apartments/"]
+        )
+
+    def test_invalidation_triggers_warming(self):
+        """Test that lists are warm again right after a write commits."""
+        self.client.get(self.list_url)
+        self.client.force_authenticate(self.owner)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                reverse("apartments-detail", kwargs={"slug": "apt-0"}),
+                {"price": "900.00"},
+                format="json",
+            )
+        self.client.force_authenticate(None)
+        (response,) = self.assertServedFromCache(self.list_url)
+        prices = {item["slug"]: item["price"] for item in response.data["results"]}
+        self.assertEqual(prices["apt-0"], "900.00")
+
+    def test_command_warms_given_urls(self):
+        """Test that the management command warms the URLs it is given."""
+        out = StringIO()
+        call_command(
+            "warm_apartment_cache",
+            url=["http://testserver/api/v1/apartments/"],
+            pages=1,
+            stdout=out,
+        )
+        self.assertIn("1 requests", out.getvalue())
+        self.assertServedFromCache(self.list_url)
+
+
+class SingleFlightTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_concurrent_misses_compute_once(self):
+        """Test that concurrent misses of one key share one computation."""
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return {"value": 1}
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    apartment_cache.single_flight("key", compute)
+                )
+            )
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"value": 1}] * 5)
+        self.assertEqual(cache.get("key"), {"value": 1})
+        self.assertIsNone(cache.get("key:lock"))
+
+    @override_settings(APARTMENT_CACHE_LOCK_WAIT=0.1)
+    def test_waiters_compute_when_the_holder_stalls(self):
+        """Test that a waiter gives up on a stalled lock holder."""
+        cache.add("key:lock", "other", timeout=60)
+        self.assertEqual(apartment_cache.single_flight("key", lambda: 2), 2)
+        self.assertEqual(cache.get("key:lock"), "other")
+
+    def test_errors_release_the_lock(self):
+        """Test that a failed computation lets the next miss try again."""
+        with self.assertRaises(ZeroDivisionError):
+            apartment_cache.single_flight("key", lambda: 1 / 0)
+        self.assertEqual(apartment_cache.single_flight("key", lambda: 3), 3)
+
+    def test_data_stored_meanwhile_is_not_recomputed(self):
+        """Test that the lock winner reuses data stored before it got the lock."""
+        add = cache.add
+
+        def add_after_previous_holder(*args, **kwargs):
+            cache.set("key", 1)
+            return add(*args, **kwargs)
+
+        with mock.patch.object(cache, "add", side_effect=add_after_previous_holder):
+            self.assertEqual(apartment_cache.single_flight("key", lambda: 1 / 0), 1)
+        self.assertIsNone(cache.get("key:lock"))
+
+    def test_taken_over_lock_is_kept(self):
+        """Test that a holder whose lock expired leaves the new holder's lock."""
+
+        def compute():
+            cache.set("key:lock", "other")
+            return 1
+
+        self.assertEqual(apartment_cache.single_flight("key", compute), 1)
+        self.assertEqual(cache.get("key:lock"), "other")
+
+    async def test_async_taken_over_lock_is_kept(self):
+        async def compute():
+            await async_cache.get_cache().aset("key:lock", "other", timeout=60)
+            return 1
+
+        self.assertEqual(await apartment_cache.asingle_flight("key", compute), 1)
+        self.assertEqual(await async_cache.get_cache().aget("key:lock"), "other")
+        await async_cache.get_cache().adelete("key:lock")
+        self.assertEqual(await apartment_cache.asingle_flight("key", compute), 1)
+        self.assertIsNone(await async_cache.get_cache().aget("key:lock"))
+
+
+@skipUnless(find_spec("fakeredis") and find_spec("lupa"), "Needs fakeredis[lua]")
+class RedisSingleFlightTests(SingleFlightTests):
+    """
+    Runs the single-flight tests through the Redis lock scripts, on an
+    in-process Redis server.
+    """
+
+    def setUp(self):
+        import fakeredis
+
+        caches = {
+            "default": {
+                "BACKEND": "django_redis.cache.RedisCache",
+                "LOCATION": "redis://localhost:6379/1",
+                "OPTIONS": {
+                    "CONNECTION_POOL_KWARGS": {
+                        "connection_class": fakeredis.FakeConnection
+                    }
+                },
+            }
+        }
+        for context in (
+            self.settings(CACHES=caches),
+            mock.patch.object(apartment_cache, "_release_script", None),
+            mock.patch(
+                "redis.asyncio.Redis.from_url",
+                side_effect=lambda url: fakeredis.FakeAsyncRedis(
+                    host="localhost", port=6379, db=1
+                ),
+            ),
+        ):
+            self.enterContext(context)
+        super().setUp()
+
+    def test_locks_are_released_by_the_script(self):
+        with mock.patch.object(cache, "delete", side_effect=AssertionError):
+            self.assertEqual(apartment_cache.single_flight("key", lambda: 1), 1)
+        self.assertIsNotNone(apartment_cache._release_script)
+        self.assertIsNone(cache.get("key:lock"))
@@ -0,0 +1,175 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.apartments import outbox
+from apps.apartments.models import Apartment, ApartmentChange
+
+User = get_user_model()
+
+published = []
+
+
+def collect(changes):
+    published.extend(change.sequence for change in changes)
+
+
+def fail(changes):
+    raise ConnectionError("broker down")
+
+
+class ApartmentChangeFeedTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.owner = User.objects.create_user(
+            email="owner@example.com", password="ownerpass"
+        )
+        cls.changes_url = reverse("apartments-changes")
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        published.clear()
+        self.client.force_authenticate(self.owner)
+
+    def _payload(self, name="Flat"):
+        return {
+            "name": name,
+            "description": "Cozy place",
+            "price": "500.00",
+            "number_of_rooms": 1,
+            "square": "30.00",
+        }
+
+    def _write(self, method, url, data=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            return getattr(self.client, method)(url, data, format="json")
+
+    def _feed(self, **params):
+        response = self.client.get(self.changes_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_writes_are_published_to_the_feed(self):
+        """Test that create, update and delete show up in the feed in order."""
+        slug = self._write("post", reverse("apartments-list"), self._payload()).data[
+            "slug"
+        ]
+        detail_url = reverse("apartments-detail", kwargs={"slug": slug})
+        self._write("patch", detail_url, {"price": "650.00"})
+        self._write("delete", detail_url)
+
+        feed = self._feed()
+        self.assertEqual(
+            [(change["sequence"], change["action"]) for change in feed["results"]],
+            [(1, "created"), (2, "updated"), (3, "deleted")],
+        )
+        self.assertEqual(feed["next"], 3)
+        self.assertFalse(feed["has_more"])
+        self.assertEqual(feed["results"][0]["slug"], slug)
+        self.assertEqual(feed["results"][1]["payload"]["price"], "650.00")
+        self.assertIsNone(feed["results"][2]["payload"])
+
+    def test_feed_returns_only_deltas(self):
+        """Test that `since` and `limit` page through the feed."""
+        for name in ("One", "Two", "Three"):
+            self._write("post", reverse("apartments-list"), self._payload(name))
+
+        feed = self._feed(limit=2)
+        self.assertEqual([change["sequence"] for change in feed["results"]], [1, 2])
+        self.assertTrue(feed["has_more"])
+        feed = self._feed(since=feed["next"], limit=2)
+        self.assertEqual([change["sequence"] for change in feed["results"]], [3])
+        self.assertFalse(feed["has_more"])
+        feed = self._feed(since=feed["next"])
+        self.assertEqual(feed["results"], [])
+        self.assertEqual(feed["next"], 3)
+
+    def test_since_latest_starts_at_the_current_position(self):
+        """Test that `since=latest` skips the existing changes."""
+        self._write("post", reverse("apartments-list"), self._payload())
+        feed = self._feed(since="latest")
+        self.assertEqual(feed, {"results": [], "next": 1, "has_more": False})
+
+    def test_rolled_back_writes_leave_no_change(self):
+        """Test that changes are written in the transaction of the write."""
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            Apartment.objects.create(owner=self.owner, **self._payload())
+            raise RuntimeError
+        self.assertFalse(ApartmentChange.objects.exists())
+
+    def test_bulk_writes_record_changes(self):
+        """Test that bulk creates, updates and deletes write changes."""
+        url = reverse("apartments-bulk")
+        results = self._write(
+            "post", url, [self._payload("One"), self._payload("Two")]
+        ).data["results"]
+        slugs = [result["slug"] for result in results]
+        self._write("patch", url, [{"slug": slugs[0], "availability": False}])
+        self._write("delete", url, [slugs[1]])
+
+        self.assertEqual(
+            [(change["action"], change["slug"]) for change in self._feed()["results"]],
+            [
+                ("created", slugs[0]),
+                ("created", slugs[1]),
+                ("updated", slugs[0]),
+                ("deleted", slugs[1]),
+            ],
+        )
+
+    @override_settings(APARTMENT_OUTBOX_PUBLISHERS=[f"{__name__}.collect"])
+    def test_relay_publishes_in_batches(self):
+        """Test that the relay hands consecutive batches to the publishers."""
+        apartments = [
+            Apartment.objects.create(owner=self.owner, **self._payload(name))
+            for name in ("One", "Two", "Three")
+        ]
+        self.assertFalse(ApartmentChange.objects.filter(sequence__isnull=False))
+        with override_settings(APARTMENT_OUTBOX_BATCH_SIZE=2):
+            with mock.patch.object(
+                outbox, "relay_batch", wraps=outbox.relay_batch
+            ) as relay_batch:
+                self.assertEqual(outbox.relay(), len(apartments))
+        self.assertEqual(relay_batch.call_count, 2)
+        self.assertEqual(published, [1, 2, 3])
+
+    @override_settings(APARTMENT_OUTBOX_PUBLISHERS=[f"{__name__}.fail"])
+    def test_failed_publish_is_retried(self):
+        """Test that a publisher error leaves the batch unpublished."""
+        Apartment.objects.create(owner=self.owner, **self._payload())
+        with self.assertRaises(ConnectionError):
+            outbox.relay()
+        self.assertFalse(ApartmentChange.objects.filter(sequence__isnull=False))
+        with override_settings(APARTMENT_OUTBOX_PUBLISHERS=[]):
+            self.assertEqual(outbox.relay(), 1)
+
+    def test_pruned_positions_return_gone(self):
+        """Test that positions older than the retention return 410."""
+        for name in ("One", "Two"):
+            self._write("post", reverse("apartments-list"), self._payload(name))
+        ApartmentChange.objects.filter(sequence=1).update(
+            published_at=timezone.now() - timedelta(days=30)
+        )
+        self.assertEqual(outbox.prune(), 1)
+
+        response = self.client.get(self.changes_url, {"since": 0})
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+        self.assertEqual(len(self._feed(since=1)["results"]), 1)
+
+    def test_invalid_parameters_are_rejected(self):
+        """Test that malformed `since` and `limit` values return 400."""
+        for params in ({"since": "abc"}, {"since": -1}, {"limit": 0}):
+            with self.subTest(params=params):
+                response = self.client.get(self.changes_url, params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,133 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.apartments.api.serializers import (
+    ApartmentRowSerializer,
+    ApartmentSerializer,
+)
+from apps.apartments.models import Apartment
+
+User = get_user_model()
+
+
+class ApartmentConditionalRequestTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.owner = User.objects.create_user(
+            email="owner@example.com", password="ownerpass"
+        )
+        Apartment.objects.create(
+            owner=cls.owner,
+            slug="flat",
+            name="Flat",
+            description="Cozy place",
+            number_of_rooms=1,
+            square=Decimal("30.00"),
+            price=Decimal("500.00"),
+        )
+        cls.list_url = reverse("apartments-list")
+        cls.detail_url = reverse("apartments-detail", kwargs={"slug": "flat"})
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def _patch(self, data, user=None, **headers):
+        self.client.force_authenticate(user or self.owner)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                self.detail_url, data, format="json", headers=headers
+            )
+        self.client.force_authenticate(None)
+        return response
+
+    def test_list_not_modified_skips_serialization(self):
+        """Test that a matching `If-None-Match` on the list returns 304."""
+        response = self.client.get(self.list_url)
+        etag = response["ETag"]
+        self.assertTrue(response.has_header("Last-Modified"))
+
+        with mock.patch.object(ApartmentRowSerializer, "serialize_many") as serialize:
+            response = self.client.get(self.list_url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+        serialize.assert_not_called()
+
+    def test_list_validators_change_after_writes(self):
+        """Test that a write makes the list's old ETag stale."""
+        etag = self.client.get(self.list_url)["ETag"]
+        self.assertNotEqual(
+            self.client.get(self.list_url, {"availability": "true"})["ETag"], etag
+        )
+        self._patch({"price": "650.00"})
+
+        response = self.client.get(self.list_url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_list_if_modified_since(self):
+        """Test that `If-Modified-Since` is honoured without an ETag."""
+        last_modified = self.client.get(self.list_url)["Last-Modified"]
+        response = self.client.get(
+            self.list_url, headers={"If-Modified-Since": last_modified}
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_detail_not_modified_skips_serialization(self):
+        """Test that a detail 304 needs neither the cache nor the serializer."""
+        etag = self.client.get(self.detail_url)["ETag"]
+        cache.clear()
+        with mock.patch.object(ApartmentSerializer, "to_representation") as serialize:
+            response = self.client.get(self.detail_url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        serialize.assert_not_called()
+
+    def test_update_with_current_etag(self):
+        """Test that `If-Match` with the current ETag lets the update through."""
+        etag = self.client.get(self.detail_url)["ETag"]
+        response = self._patch({"price": "650.00"}, **{"If-Match": etag})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(self.client.get(self.detail_url)["ETag"], response["ETag"])
+
+    def test_update_with_stale_etag_fails(self):
+        """Test that `If-Match` with a stale ETag returns 412."""
+        etag = self.client.get(self.detail_url)["ETag"]
+        self._patch({"price": "650.00"})
+
+        response = self._patch({"price": "700.00"}, **{"If-Match": etag})
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertEqual(Apartment.objects.get(slug="flat").price, Decimal("650.00"))
+
+    def test_preconditions_are_checked_after_permissions(self):
+        """Test that non-owners get 403 whether or not their ETag matches."""
+        other = User.objects.create_user(
+            email="other@example.com", password="otherpass"
+        )
+        etag = self.client.get(self.detail_url)["ETag"]
+        for if_match in (etag, '"stale"'):
+            with self.subTest(if_match=if_match):
+                response = self._patch(
+                    {"price": "700.00"}, user=other, **{"If-Match": if_match}
+                )
+                self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_async_endpoints_support_conditional_requests(self):
+        """Test that the async list and detail return 304 as well."""
+        for url in (
+            reverse("async-apartments-list"),
+            reverse("async-apartments-detail", kwargs={"slug": "flat"}),
+        ):
+            with self.subTest(url=url):
+                etag = self.client.get(url)["ETag"]
+                response = self.client.get(url, headers={"If-None-Match": etag})
+                self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
@@ -0,0 +1,85 @@
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+from decimal import Decimal
+from django.core.management import call_command
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.apartments.models import Apartment
+
+User = get_user_model()
+
+
+class ApartmentExportTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.owner = User.objects.create_user(
+            email="owner@example.com", password="ownerpass"
+        )
+        for i in range(5):
+            Apartment.objects.create(
+                owner=cls.owner,
+                slug=f"apt-{i}",
+                name=f"Apartment {i}",
+                description="Cozy, quiet \"place\"",
+                number_of_rooms=i + 1,
+                square=Decimal("40.00"),
+                price=Decimal(100 * (i + 1)),
+                availability=i % 2 == 0,
+            )
+        cls.export_url = reverse("apartments-export")
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.owner)
+
+    def _content(self, response):
+        return b"".join(response.streaming_content)
+
+    def test_export_ndjson_applies_filters(self):
+        """Test that the NDJSON export streams the filtered rows."""
+        response = self.client.get(
+            self.export_url, {"availability": "true", "price_min": 200}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in self._content(response).splitlines()]
+        self.assertEqual([row["slug"] for row in rows], ["apt-2", "apt-4"])
+        self.assertEqual(rows[0]["price"], "300.00")
+        self.assertEqual(rows[0]["owner_email"], self.owner.email)
+
+    def test_export_gzipped_csv(self):
+        """Test that the CSV export can be gzipped."""
+        response = self.client.get(self.export_url, {"type": "csv", "gzip": "true"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        text = gzip.decompress(self._content(response)).decode()
+        rows = list(csv.DictReader(io.StringIO(text)))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]["description"], 'Cozy, quiet "place"')
+
+    def test_export_requires_authentication(self):
+        """Test that anonymous users cannot export the catalogue."""
+        self.client.force_authenticate(None)
+        response = self.client.get(self.export_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_export_command_writes_file(self):
+        """Test that the management command exports filtered rows to a file."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "apartments.ndjson")
+            call_command(
+                "export_apartments",
+                "--number-of-rooms=3",
+                f"--output={path}",
+                "--chunk-size=2",
+            )
+            with open(path) as output:
+                rows = [json.loads(line) for line in output]
+        self.assertEqual([row["slug"] for row in rows], ["apt-2"])
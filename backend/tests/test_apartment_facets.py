@@ -0,0 +1,109 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.apartments.models import Apartment
+
+User = get_user_model()
+
+
+@override_settings(APARTMENT_PRICE_FACET_BOUNDARIES=[1000, 2000])
+class ApartmentFacetTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        owner = User.objects.create_user(email="owner@example.com", password="pass")
+        for slug, rooms, price, availability in (
+            ("one", 1, "500.00", True),
+            ("two", 2, "1000.00", True),
+            ("three", 2, "1500.00", False),
+            ("four", 3, "2500.00", True),
+        ):
+            Apartment.objects.create(
+                owner=owner,
+                slug=slug,
+                name=slug,
+                description="Cozy place",
+                number_of_rooms=rooms,
+                square=Decimal("40.00"),
+                price=Decimal(price),
+                availability=availability,
+            )
+        cls.list_url = reverse("apartments-list")
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_list_without_facets_is_unchanged(self):
+        """Test that facets are only computed when requested."""
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("facets", response.data)
+
+    def test_facet_counts(self):
+        """Test the counts per number of rooms, availability and price bucket."""
+        response = self.client.get(
+            self.list_url, {"facets": "price,number_of_rooms,availability"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        facets = response.data["facets"]
+        self.assertEqual(list(facets), ["number_of_rooms", "availability", "price"])
+        self.assertEqual(
+            facets["number_of_rooms"],
+            [
+                {"value": 1, "count": 1},
+                {"value": 2, "count": 2},
+                {"value": 3, "count": 1},
+            ],
+        )
+        self.assertEqual(
+            facets["availability"],
+            [{"value": False, "count": 1}, {"value": True, "count": 3}],
+        )
+        self.assertEqual(
+            facets["price"],
+            [
+                {"min": None, "max": 1000, "count": 1},
+                {"min": 1000, "max": 2000, "count": 2},
+                {"min": 2000, "max": None, "count": 1},
+            ],
+        )
+
+    def test_facets_follow_filters(self):
+        """Test that facets count the filtered apartments only."""
+        response = self.client.get(
+            self.list_url, {"facets": "price", "availability": "true"}
+        )
+        self.assertEqual(
+            [bucket["count"] for bucket in response.data["facets"]["price"]],
+            [1, 1, 1],
+        )
+        self.assertNotIn("number_of_rooms", response.data["facets"])
+
+    def test_facets_cost_one_query(self):
+        """Test that every facet is counted by a single grouped query."""
+        self.client.get(self.list_url)
+        cache.clear()
+        with CaptureQueriesContext(connection) as without_facets:
+            self.client.get(self.list_url)
+        cache.clear()
+        with CaptureQueriesContext(connection) as with_facets:
+            self.client.get(
+                self.list_url, {"facets": "number_of_rooms,availability,price"}
+            )
+        self.assertEqual(len(with_facets), len(without_facets) + 1)
+
+    def test_unknown_facet_is_rejected(self):
+        """Test that unknown facet names return 400."""
+        response = self.client.get(self.list_url, {"facets": "rooms"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("facets", response.data)
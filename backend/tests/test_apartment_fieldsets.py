@@ -0,0 +1,109 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.apartments.models import Apartment
+
+User = get_user_model()
+
+
+@override_settings(APARTMENT_COMPACT_DESCRIPTION_LENGTH=20)
+class ApartmentFieldsetTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.owner = User.objects.create_user(
+            email="owner@example.com", password="ownerpass"
+        )
+        for index, description in enumerate(["Short", "A long description " * 5]):
+            Apartment.objects.create(
+                owner=cls.owner,
+                slug=f"apt-{index}",
+                name=f"Apartment {index}",
+                description=description,
+                number_of_rooms=2,
+                square=Decimal("40.00"),
+                price=Decimal("1000.00"),
+            )
+        cls.list_url = reverse("apartments-list")
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def _list(self, url=None, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url or self.list_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        selects = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith("SELECT")
+        ]
+        return response.json()["results"], selects
+
+    def test_fields_trim_output_and_columns(self):
+        """Test that `fields` limits both the items and the columns read."""
+        results, selects = self._list(fields="slug,price")
+        self.assertEqual(results[0], {"slug": "apt-1", "price": "1000.00"})
+        page_query = selects[-1]
+        self.assertNotIn('"description"', page_query)
+        self.assertNotIn("users_user", page_query)
+        self.assertFalse(any("apartments_apartmentimage" in sql for sql in selects))
+
+    def test_omit_removes_fields(self):
+        """Test that `omit` drops fields from the full representation."""
+        results, selects = self._list(omit="description,owner_email,images")
+        self.assertNotIn("description", results[0])
+        self.assertNotIn("owner_email", results[0])
+        self.assertNotIn("images", results[0])
+        self.assertIn("created_at", results[0])
+        self.assertFalse(any('"description"' in sql for sql in selects))
+
+    def test_images_without_id(self):
+        """Test that images are attached even when `id` is not selected."""
+        results, _ = self._list(fields="slug,images")
+        self.assertEqual(results[0], {"slug": "apt-1", "images": []})
+
+    def test_compact_view_truncates_description_in_sql(self):
+        """Test that the compact view returns a card with a short description."""
+        results, selects = self._list(view="compact")
+        items = {item["slug"]: item for item in results}
+        self.assertEqual(items["apt-0"]["description"], "Short")
+        self.assertEqual(items["apt-1"]["description"], "A long description…")
+        self.assertNotIn("owner_email", items["apt-1"])
+        self.assertNotIn("created_at", items["apt-1"])
+        self.assertIn("images", items["apt-1"])
+        self.assertFalse(any("users_user" in sql for sql in selects))
+
+    def test_cursor_pages_with_sparse_fields(self):
+        """Test that cursor pages work when the ordering fields are omitted."""
+        params = {"pagination": "cursor", "page_size": 1, "fields": "slug"}
+        response = self.client.get(self.list_url, params)
+        self.assertEqual(response.data["results"], [{"slug": "apt-1"}])
+        response = self.client.get(response.data["next"])
+        self.assertEqual(response.data["results"], [{"slug": "apt-0"}])
+
+    def test_async_list_supports_fieldsets(self):
+        """Test that the async list returns the same trimmed items."""
+        url = reverse("async-apartments-list")
+        params = {"view": "compact", "omit": "images"}
+        self.assertEqual(
+            self._list(url, **params)[0], self._list(self.list_url, **params)[0]
+        )
+
+    def test_unknown_names_are_rejected(self):
+        """Test that unknown views and fields return 400."""
+        for params in ({"fields": "slug,secret"}, {"omit": "secret"}, {"view": "x"}):
+            with self.subTest(params=params):
+                response = self.client.get(self.list_url, params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn(next(iter(params)), response.data)
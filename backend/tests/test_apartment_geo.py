@@ -0,0 +1,175 @@
+import json
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.apartments import geo
+from apps.apartments.models import Apartment
+
+User = get_user_model()
+
+CENTER = (50.45, 30.52)
+
+
+class GeoHelperTests(SimpleTestCase):
+    def test_nearby_points_share_a_cell(self):
+        """Test that points in the same grid cell get the same id."""
+        self.assertEqual(geo.cell_of(50.451, 30.521), geo.cell_of(50.459, 30.529))
+        self.assertNotEqual(geo.cell_of(50.451, 30.521), geo.cell_of(50.551, 30.521))
+        self.assertIsNone(geo.cell_of(None, 30.5))
+
+    def test_box_cells_contain_points_inside(self):
+        """Test that the cells of a box cover every point inside it."""
+        cells = set(geo.cells_in_box(50.3, 30.3, 50.6, 30.7))
+        for latitude, longitude in ((50.3, 30.3), (50.45, 30.52), (50.6, 30.7)):
+            self.assertIn(geo.cell_of(latitude, longitude), cells)
+
+    def test_bounding_box_crosses_antimeridian(self):
+        """Test that a box around the antimeridian wraps west > east."""
+        south, west, north, east = geo.bounding_box(0, 179.99, 10)
+        self.assertGreater(west, east)
+        cells = set(geo.cells_in_box(south, west, north, east))
+        self.assertIn(geo.cell_of(0, -179.99), cells)
+        self.assertIn(geo.cell_of(0, 179.95), cells)
+
+    def test_bounding_box_near_pole_spans_all_longitudes(self):
+        """Test that a circle around a pole covers every longitude."""
+        self.assertEqual(geo.bounding_box(89.99, 10, 50)[1::2], (-180, 180))
+
+    def test_large_boxes_skip_the_cell_lookup(self):
+        """Test that boxes with too many cells return None."""
+        self.assertIsNone(geo.cells_in_box(-60, -120, 60, 120))
+
+
+class ApartmentGeoSearchTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.owner = User.objects.create_user(
+            email="owner@example.com", password="ownerpass"
+        )
+        # About 0.6, 1.1, 2.2, 3.3 and 11 km north of the center.
+        for index, offset in enumerate(("0.03", "0.005", "0.02", "0.01", "0.1")):
+            cls._create(f"apt-{index}", Decimal(str(CENTER[0])) + Decimal(offset))
+        cls._create("nowhere", None)
+        cls.list_url = reverse("apartments-list")
+
+    @classmethod
+    def _create(cls, slug, latitude):
+        return Apartment.objects.create(
+            owner=cls.owner,
+            slug=slug,
+            name=slug,
+            description="Cozy place",
+            number_of_rooms=1,
+            square=Decimal("30.00"),
+            price=Decimal("500.00"),
+            latitude=latitude,
+            longitude=None if latitude is None else Decimal(str(CENTER[1])),
+        )
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def _near(self, **params):
+        return {"lat": CENTER[0], "lon": CENTER[1], "radius": 5, **params}
+
+    def test_save_sets_geo_cell(self):
+        """Test that saving an apartment stores the cell of its coordinates."""
+        apartment = Apartment.objects.get(slug="apt-0")
+        self.assertEqual(
+            apartment.geo_cell, geo.cell_of(apartment.latitude, apartment.longitude)
+        )
+        apartment.latitude = Decimal("10.000000")
+        apartment.save(update_fields=["latitude"])
+        apartment.refresh_from_db()
+        self.assertEqual(apartment.geo_cell, geo.cell_of(10, CENTER[1]))
+        self.assertIsNone(Apartment.objects.get(slug="nowhere").geo_cell)
+
+    def test_coordinates_must_be_set_together(self):
+        """Test that a latitude without a longitude is rejected."""
+        apartment = Apartment.objects.get(slug="nowhere")
+        apartment.latitude = Decimal("50.000000")
+        with self.assertRaises(ValidationError):
+            apartment.full_clean()
+
+    def test_radius_search_sorts_by_distance(self):
+        """Test that a radius search lists nearby apartments nearest first."""
+        response = self.client.get(self.list_url, self._near())
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data["results"]
+        self.assertEqual(
+            [result["slug"] for result in results], ["apt-1", "apt-3", "apt-2", "apt-0"]
+        )
+        distances = [result["distance_km"] for result in results]
+        self.assertEqual(distances, sorted(distances))
+        self.assertAlmostEqual(distances[0], 0.556, places=2)
+
+    def test_bounding_box_filter(self):
+        """Test that `bbox` keeps apartments inside the box only."""
+        response = self.client.get(
+            self.list_url, {"bbox": "50.46,30.5,50.49,30.6", "page_size": 10}
+        )
+        self.assertEqual(
+            sorted(result["slug"] for result in response.data["results"]),
+            ["apt-0", "apt-2", "apt-3"],
+        )
+        self.assertNotIn("distance_km", response.data["results"][0])
+
+    def test_cursor_pages_seek_on_distance(self):
+        """Test that cursor pages of a radius search follow the distance order."""
+        params = self._near(pagination="cursor", page_size=3, radius=20)
+        response = self.client.get(self.list_url, params)
+        slugs = [result["slug"] for result in response.data["results"]]
+        self.assertEqual(slugs, ["apt-1", "apt-3", "apt-2"])
+
+        response = self.client.get(response.data["next"])
+        self.assertEqual(
+            [result["slug"] for result in response.data["results"]], ["apt-0", "apt-4"]
+        )
+        self.assertIsNone(response.data["next"])
+
+        response = self.client.get(response.data["previous"])
+        self.assertEqual([result["slug"] for result in response.data["results"]], slugs)
+
+    def test_async_radius_search_matches_sync_view(self):
+        """Test that the async list returns the same radius search results."""
+        sync = self.client.get(self.list_url, self._near())
+        async_ = self.client.get(reverse("async-apartments-list"), self._near())
+        self.assertEqual(
+            json.loads(async_.content)["results"], json.loads(sync.content)["results"]
+        )
+
+    def test_invalid_geo_parameters_are_rejected(self):
+        """Test that incomplete or out-of-range geo parameters return 400."""
+        for params in (
+            {"lat": CENTER[0], "lon": CENTER[1]},
+            self._near(radius=10_000),
+            self._near(lat=91),
+            {"bbox": "50,30,51"},
+            {"bbox": "51,30,50,31"},
+        ):
+            with self.subTest(params=params):
+                response = self.client.get(self.list_url, params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_update_moves_geo_cell(self):
+        """Test that bulk updates of the coordinates update the grid cell."""
+        self.client.force_authenticate(self.owner)
+        response = self.client.patch(
+            reverse("apartments-bulk"),
+            [{"slug": "apt-4", "latitude": "10.000000", "longitude": "10.000000"}],
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            Apartment.objects.get(slug="apt-4").geo_cell, geo.cell_of(10, 10)
+        )
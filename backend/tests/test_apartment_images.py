@@ -0,0 +1,231 @@
+import io
+import shutil
+import tempfile
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.apartments.models import Apartment, ApartmentImage
+
+User = get_user_model()
+
+
+def make_upload(name="photo.jpg", size=(2000, 1000), image_format="JPEG"):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (200, 120, 40)).save(buffer, image_format)
+    return SimpleUploadedFile(name, buffer.getvalue())
+
+
+class ApartmentImageTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.owner = User.objects.create_user(
+            email="owner@example.com", password="ownerpass"
+        )
+        cls.other = User.objects.create_user(
+            email="other@example.com", password="otherpass"
+        )
+        cls.apartment = cls._create("flat")
+        cls.images_url = reverse("apartments-images", kwargs={"slug": "flat"})
+
+    @classmethod
+    def _create(cls, slug):
+        return Apartment.objects.create(
+            owner=cls.owner,
+            slug=slug,
+            name=slug,
+            description="Cozy place",
+            number_of_rooms=1,
+            square=Decimal("30.00"),
+            price=Decimal("500.00"),
+        )
+
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client.force_authenticate(self.owner)
+
+    def _upload(self, upload=None, slug="flat"):
+        url = reverse("apartments-images", kwargs={"slug": slug})
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                url, {"image": upload or make_upload()}, format="multipart"
+            )
+
+    def test_upload_generates_webp_thumbnails(self):
+        """Test that an upload is accepted and thumbnailed in the background."""
+        response = self._upload()
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["status"], "pending")
+
+        image = ApartmentImage.objects.get(pk=response.data["id"])
+        self.assertEqual(image.status, ApartmentImage.Status.READY)
+        self.assertEqual((image.width, image.height), (2000, 1000))
+        self.assertEqual(set(image.thumbnails), {"small", "medium", "large"})
+        for size, bound in (("small", 320), ("medium", 800), ("large", 1600)):
+            with default_storage.open(image.thumbnails[size]) as file:
+                with Image.open(file) as thumbnail:
+                    self.assertEqual(thumbnail.format, "WEBP")
+                    self.assertEqual(thumbnail.size, (bound, bound // 2))
+
+        response = self.client.get(self.images_url)
+        self.assertEqual(response.data[0]["status"], "ready")
+        self.assertEqual(set(response.data[0]["thumbnails"]), set(image.thumbnails))
+
+    def test_small_images_are_not_upscaled(self):
+        """Test that thumbnails never exceed the original size."""
+        response = self._upload(make_upload(size=(400, 300), image_format="PNG"))
+        image = ApartmentImage.objects.get(pk=response.data["id"])
+        with default_storage.open(image.thumbnails["large"]) as file:
+            with Image.open(file) as thumbnail:
+                self.assertEqual(thumbnail.size, (400, 300))
+
+    def test_list_and_detail_include_thumbnail_urls(self):
+        """Test that list and detail responses embed the ready images."""
+        self._upload()
+        response = self.client.get(reverse("apartments-list"))
+        images = response.data["results"][0]["images"]
+        self.assertEqual(len(images), 1)
+        self.assertTrue(
+            images[0]["thumbnails"]["small"].startswith("http://testserver/media/")
+        )
+        response = self.client.get(
+            reverse("apartments-detail", kwargs={"slug": "flat"})
+        )
+        self.assertEqual(response.data["images"], images)
+
+    def test_list_images_cost_one_query(self):
+        """Test that thumbnails are fetched in one query for the whole page."""
+        self._upload()
+        cache.clear()
+        with CaptureQueriesContext(connection) as one:
+            self.client.get(reverse("apartments-list"))
+        for slug in ("second", "third"):
+            self._create(slug)
+            self._upload(slug=slug)
+        cache.clear()
+        with CaptureQueriesContext(connection) as three:
+            response = self.client.get(reverse("apartments-list"))
+        self.assertEqual(len(three), len(one))
+        self.assertTrue(all(item["images"] for item in response.data["results"]))
+
+    def test_only_the_owner_can_upload(self):
+        """Test that other users cannot add images to an apartment."""
+        self.client.force_authenticate(self.other)
+        response = self._upload()
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(ApartmentImage.objects.exists())
+
+    def test_invalid_uploads_are_rejected(self):
+        """Test that non-images and unsupported formats return 400."""
+        for upload in (
+            SimpleUploadedFile("notes.jpg", b"not an image"),
+            make_upload("anim.gif", image_format="GIF"),
+        ):
+            with self.subTest(name=upload.name):
+                response = self._upload(upload)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn("image", response.data)
+
+    @override_settings(APARTMENT_IMAGE_MAX_PIXELS=1000)
+    def test_oversized_images_are_rejected(self):
+        """Test that images above the pixel limit are rejected before decoding."""
+        response = self._upload()
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_delete_removes_files(self):
+        """Test that deleting an image deletes its stored files."""
+        image = ApartmentImage.objects.get(pk=self._upload().data["id"])
+        names = [image.original.name, *image.thumbnails.values()]
+        url = reverse("apartments-image", kwargs={"slug": "flat", "image_id": image.pk})
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(ApartmentImage.objects.exists())
+        for name in names:
+            self.assertFalse(default_storage.exists(name))
+
+
+class ApartmentImageAdminTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.admin = User.objects.create_superuser(
+            email="admin@example.com", password="adminpass"
+        )
+        cls.apartment = Apartment.objects.create(
+            owner=cls.admin,
+            slug="flat",
+            name="flat",
+            description="Cozy place",
+            number_of_rooms=1,
+            square=Decimal("30.00"),
+            price=Decimal("500.00"),
+        )
+
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+        self.client.force_login(self.admin)
+
+    def _save(self, images):
+        """Submits the admin change form of the apartment with `images` rows."""
+        data = {
+            "name": "flat",
+            "description": "Cozy place",
+            "price": "500.00",
+            "number_of_rooms": 1,
+            "square": "30.00",
+            "availability": "on",
+            "owner": self.admin.pk,
+            "images-TOTAL_FORMS": len(images),
+            "images-INITIAL_FORMS": sum("id" in image for image in images),
+        }
+        for index, image in enumerate(images):
+            data.update(
+                {f"images-{index}-{name}": value for name, value in image.items()}
+            )
+            data[f"images-{index}-apartment"] = self.apartment.pk
+        url = reverse("admin:apartments_apartment_change", args=[self.apartment.pk])
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url, data)
+        self.assertEqual(response.status_code, 302)
+
+    def test_uploads_are_thumbnailed(self):
+        """Test that images uploaded in the admin get thumbnails."""
+        self._save([{"original": make_upload(), "position": 0}])
+        image = ApartmentImage.objects.get()
+        self.assertEqual(image.status, ApartmentImage.Status.READY)
+        self.assertEqual(set(image.thumbnails), {"small", "medium", "large"})
+
+        self._save(
+            [
+                {
+                    "id": image.pk,
+                    "original": make_upload(size=(400, 300)),
+                    "position": 0,
+                }
+            ]
+        )
+        image.refresh_from_db()
+        self.assertEqual((image.width, image.height), (400, 300))
+        self.assertEqual(image.status, ApartmentImage.Status.READY)
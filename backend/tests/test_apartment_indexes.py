@@ -0,0 +1,48 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+
+from apps.apartments.models import Apartment
+
+
+class ExplainApartmentQueriesTests(TestCase):
+    def test_reports_plan_and_indexes_per_shape(self):
+        """Test that every query shape is explained with the indexes it uses."""
+        out = StringIO()
+        call_command("explain_apartment_queries", stdout=out, no_color=True)
+        output = out.getvalue()
+        for shape in (
+            "list unfiltered",
+            "count available + rooms + price",
+            "cursor available + price",
+            "detail",
+        ):
+            self.assertIn(f"{shape}\n", output)
+        self.assertIn("available_rooms_created_idx", output)
+        self.assertIn("Indexes not used by any shape:", output)
+
+    def test_analyze_requires_postgres(self):
+        """Test that --analyze is rejected on other databases."""
+        if connection.vendor == "postgresql":
+            self.skipTest("EXPLAIN ANALYZE is supported on PostgreSQL.")
+        with self.assertRaises(CommandError):
+            call_command("explain_apartment_queries", analyze=True, stdout=StringIO())
+
+    def test_redundant_indexes_are_dropped(self):
+        """Test that the single-column and duplicate slug indexes are gone."""
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, Apartment._meta.db_table
+            )
+        indexed = {
+            tuple(constraint["columns"])
+            for constraint in constraints.values()
+            if constraint["index"] and not constraint["unique"]
+        }
+        for columns in (("name",), ("number_of_rooms",), ("availability",)):
+            self.assertNotIn(columns, indexed)
+        self.assertNotIn("slug_idx", constraints)
+        self.assertNotIn("price_availability_idx", constraints)
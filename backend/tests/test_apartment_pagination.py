@@ -0,0 +1,97 @@
+from decimal import Decimal
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.apartments.models import Apartment
+
+User = get_user_model()
+
+
+class ApartmentCursorPaginationTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.owner = User.objects.create_user(
+            email="owner@example.com", password="ownerpass"
+        )
+        for i in range(25):
+            Apartment.objects.create(
+                owner=cls.owner,
+                slug=f"apt-{i}",
+                name=f"Apartment {i}",
+                description="Cozy place",
+                number_of_rooms=i % 3 + 1,
+                square=Decimal("40.00"),
+                price=Decimal(100 * (i + 1)),
+                availability=i % 2 == 0,
+            )
+        # Force ties on created_at so the id tie-breaker is exercised.
+        Apartment.objects.filter(slug__in=["apt-3", "apt-4", "apt-5"]).update(
+            created_at=timezone.now()
+        )
+        cls.list_url = reverse("apartments-list")
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def _walk(self, url, params):
+        slugs = []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.data)
+            slugs.extend(row["slug"] for row in response.data["results"])
+            if not response.data["next"]:
+                return slugs, response
+            response = self.client.get(response.data["next"])
+
+    def test_walks_all_pages_in_created_at_id_order(self):
+        """Test that following `next` visits every row once, newest first."""
+        slugs, _ = self._walk(self.list_url, {"pagination": "cursor", "page_size": 4})
+        expected = list(
+            Apartment.objects.order_by("-created_at", "-id").values_list(
+                "slug", flat=True
+            )
+        )
+        self.assertEqual(slugs, expected)
+
+    def test_previous_link_returns_previous_page(self):
+        """Test that `previous` on the second page returns the first page."""
+        first = self.client.get(self.list_url, {"pagination": "cursor", "page_size": 5})
+        second = self.client.get(first.data["next"])
+        back = self.client.get(second.data["previous"])
+        self.assertEqual(back.data["results"], first.data["results"])
+
+    def test_cursor_pagination_respects_filters(self):
+        """Test that cursor pages combine with the list filters."""
+        params = {
+            "pagination": "cursor",
+            "page_size": 2,
+            "availability": "true",
+            "number_of_rooms": 1,
+            "price_min": 500,
+            "price_max": 2500,
+        }
+        slugs, _ = self._walk(self.list_url, params)
+        expected = list(
+            Apartment.objects.filter(
+                availability=True,
+                number_of_rooms=1,
+                price__gte=500,
+                price__lte=2500,
+            )
+            .order_by("-created_at", "-id")
+            .values_list("slug", flat=True)
+        )
+        self.assertEqual(slugs, expected)
+
+    def test_invalid_cursor(self):
+        """Test that a malformed cursor returns 404."""
+        response = self.client.get(self.list_url, {"cursor": "bm9wZQ=="})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
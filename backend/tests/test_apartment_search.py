@@ -0,0 +1,67 @@
+from decimal import Decimal
+from unittest import skipUnless
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase
+
+from apps.apartments.models import Apartment
+
+User = get_user_model()
+
+
+class ApartmentSearchTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.owner = User.objects.create_user(
+            email="owner@example.com", password="ownerpass"
+        )
+        for slug, name, description in [
+            ("loft", "Sunny loft", "Bright loft near the river"),
+            ("studio", "Quiet studio", "A studio with a sunny balcony"),
+            ("house", "Family house", "Garden and garage"),
+        ]:
+            Apartment.objects.create(
+                owner=cls.owner,
+                slug=slug,
+                name=name,
+                description=description,
+                number_of_rooms=2,
+                square=Decimal("40.00"),
+                price=Decimal("1000.00"),
+            )
+        cls.list_url = reverse("apartments-list")
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def _search(self, **params):
+        response = self.client.get(self.list_url, params)
+        return [row["slug"] for row in response.data["results"]]
+
+    def test_search_matches_name_and_description(self):
+        """Test that search finds terms in both the name and the description."""
+        self.assertCountEqual(self._search(search="sunny"), ["loft", "studio"])
+        self.assertEqual(self._search(search="garage"), ["house"])
+
+    @skipUnless(connection.vendor == "postgresql", "Full-text search needs PostgreSQL")
+    def test_search_ranks_name_matches_first(self):
+        """Test that a match in the name outranks a match in the description."""
+        self.assertEqual(self._search(search="sunny"), ["loft", "studio"])
+
+    @skipUnless(connection.vendor == "postgresql", "Full-text search needs PostgreSQL")
+    def test_fuzzy_fallback(self):
+        """Test that a misspelt name only matches with the trigram fallback."""
+        self.assertEqual(self._search(search="studi"), [])
+        self.assertEqual(self._search(search="studi", fuzzy="true"), ["studio"])
+
+    @skipUnless(connection.vendor != "postgresql", "Checks the non-PostgreSQL path")
+    def test_backfill_requires_postgresql(self):
+        """Test that the backfill command refuses to run without PostgreSQL."""
+        with self.assertRaises(CommandError):
+            call_command("backfill_search_vector")
@@ -0,0 +1,63 @@
+from decimal import Decimal
+from io import StringIO
+from unittest import skipIf
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+
+from apps.apartments.api.renderers import ORJSONRenderer, orjson
+from apps.apartments.api.serializers import ApartmentRowSerializer, ApartmentSerializer
+from apps.apartments.models import Apartment
+
+User = get_user_model()
+
+
+class ApartmentRowSerializerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        owner = User.objects.create_user(email="owner@example.com", password="pass")
+        for i, (name, price) in enumerate(
+            [
+                ("Plain flat", Decimal("1000")),
+                ("Квартира   \"quoted\"", Decimal("999.5")),
+                ("Tiny flat", Decimal("0.01")),
+            ]
+        ):
+            Apartment.objects.create(
+                owner=owner,
+                slug=f"apt-{i}",
+                name=name,
+                description="Line one\nline two\u2028\u2029 emoji 🏠",
+                number_of_rooms=i + 1,
+                square=Decimal("33.3"),
+                price=price,
+                availability=bool(i % 2),
+            )
+
+    def test_output_is_byte_identical_to_model_serializer(self):
+        """Test that the row serializer renders exactly like ApartmentSerializer."""
+        serializer = ApartmentRowSerializer()
+        instances = Apartment.objects.select_related("owner").order_by("id")
+        rows = Apartment.objects.order_by("id").values(*serializer.columns)
+
+        expected = JSONRenderer().render(ApartmentSerializer(instances, many=True).data)
+        self.assertEqual(JSONRenderer().render(serializer.serialize_many(rows)), expected)
+
+    @skipIf(orjson is None, "orjson is not installed")
+    def test_orjson_renderer_is_byte_identical(self):
+        """Test that the orjson renderer matches JSONRenderer byte for byte."""
+        serializer = ApartmentRowSerializer()
+        data = serializer.serialize_many(
+            Apartment.objects.order_by("id").values(*serializer.columns)
+        )
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_benchmark_command_runs(self):
+        """Test that the serializer benchmark runs and checks output equality."""
+        out = StringIO()
+        call_command(
+            "bench_list_serializer", "--page-sizes=5", "--duration=0.01", stdout=out
+        )
+        self.assertIn("ApartmentRowSerializer", out.getvalue())
@@ -0,0 +1,83 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError
+from django.test import SimpleTestCase, TestCase
+
+from apps.apartments.models import Apartment
+from apps.apartments.slugs import (
+    SLUG_ATTEMPTS,
+    SLUG_MAX_LENGTH,
+    allocate_slug,
+    allocate_slugs,
+)
+
+User = get_user_model()
+
+
+class SlugAllocatorTests(SimpleTestCase):
+    def test_slug_keeps_slugified_name(self):
+        """Test that the slug starts with the slugified name."""
+        slug = allocate_slug("Cozy Studio!")
+        self.assertRegex(slug, r"^cozy-studio-[a-z2-7]{8}$")
+
+    def test_long_names_fit_the_slug_field(self):
+        """Test that slugs of long names stay within the field length."""
+        slug = allocate_slug("word " * 40)
+        self.assertLessEqual(len(slug), SLUG_MAX_LENGTH)
+        self.assertNotIn("--", slug)
+
+    def test_name_without_slug_characters(self):
+        """Test that names with no slug characters still get a slug."""
+        self.assertTrue(allocate_slug("!!!").startswith("apartment-"))
+
+    def test_batch_slugs_are_unique(self):
+        """Test that a batch of equal names yields distinct slugs."""
+        slugs = allocate_slugs(["Same name"] * 1000)
+        self.assertEqual(len(set(slugs)), 1000)
+
+
+class SlugCollisionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.owner = User.objects.create_user(
+            email="owner@example.com", password="ownerpass"
+        )
+        cls._create(slug="flat-aaaaaaaa")
+
+    @classmethod
+    def _create(cls, **kwargs):
+        return Apartment.objects.create(
+            owner=cls.owner,
+            name="Flat",
+            description="Cozy place",
+            number_of_rooms=1,
+            square=Decimal("30.00"),
+            price=Decimal("500.00"),
+            **kwargs,
+        )
+
+    def test_colliding_slug_is_replaced(self):
+        """Test that an allocated slug already taken is retried with a new one."""
+        with mock.patch(
+            "apps.apartments.models.allocate_slug",
+            side_effect=["flat-aaaaaaaa", "flat-bbbbbbbb"],
+        ):
+            apartment = self._create()
+        self.assertEqual(apartment.slug, "flat-bbbbbbbb")
+        self.assertTrue(Apartment.objects.filter(slug="flat-bbbbbbbb").exists())
+
+    def test_collisions_are_retried_a_few_times(self):
+        with mock.patch(
+            "apps.apartments.models.allocate_slug", return_value="flat-aaaaaaaa"
+        ) as allocate, self.assertRaises(IntegrityError):
+            self._create()
+        self.assertEqual(allocate.call_count, SLUG_ATTEMPTS)
+
+    def test_given_slugs_are_validated(self):
+        """Test that a slug passed by the caller is still checked for uniqueness."""
+        with self.assertRaises(ValidationError):
+            self._create(slug="flat-aaaaaaaa")
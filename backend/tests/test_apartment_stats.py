@@ -0,0 +1,170 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.apartments import stats
+from apps.apartments.models import Apartment, ApartmentStats
+
+User = get_user_model()
+
+
+class ApartmentStatsTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.owner = User.objects.create_user(
+            email="owner@example.com", password="ownerpass"
+        )
+        cls.stats_url = reverse("apartments-stats")
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def _create(self, slug, rooms, price, square="50.00", availability=True):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Apartment.objects.create(
+                owner=self.owner,
+                slug=slug,
+                name=slug,
+                description="Cozy place",
+                number_of_rooms=rooms,
+                square=Decimal(square),
+                price=Decimal(price),
+                availability=availability,
+            )
+
+    def _groups(self, response):
+        return {
+            (group["number_of_rooms"], group["availability"]): group
+            for group in response.data["groups"]
+        }
+
+    def test_summary_is_refreshed_after_writes(self):
+        """Test that the summary reflects created apartments per group."""
+        self._create("one", 2, "1000.00")
+        self._create("two", 2, "2000.00")
+        self._create("three", 2, "6000.00")
+        self._create("four", 3, "3000.00", availability=False)
+
+        response = self.client.get(self.stats_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["source"], "summary")
+        self.assertIsNotNone(response.data["refreshed_at"])
+        groups = self._groups(response)
+        self.assertEqual(set(groups), {(2, True), (3, False)})
+        self.assertEqual(groups[(2, True)]["count"], 3)
+        self.assertEqual(groups[(2, True)]["avg_price"], "3000.00")
+        self.assertEqual(groups[(2, True)]["median_price"], "2000.00")
+        self.assertEqual(groups[(2, True)]["min_price"], "1000.00")
+        self.assertEqual(groups[(2, True)]["max_price"], "6000.00")
+        self.assertEqual(groups[(2, True)]["avg_price_per_m2"], "60.00")
+
+        total = response.data["total"]
+        self.assertEqual(total["count"], 4)
+        self.assertEqual(total["avg_price"], "3000.00")
+        self.assertIsNone(total["median_price"])
+        self.assertIsNone(total["number_of_rooms"])
+        self.assertEqual(total["max_price"], "6000.00")
+
+    def test_summary_filters(self):
+        """Test that availability and room filters select summary groups."""
+        self._create("one", 2, "1000.00")
+        self._create("two", 3, "2000.00")
+        self._create("three", 3, "4000.00", availability=False)
+
+        response = self.client.get(
+            self.stats_url, {"number_of_rooms": 3, "availability": "true"}
+        )
+        self.assertEqual(response.data["source"], "summary")
+        self.assertEqual(list(self._groups(response)), [(3, True)])
+        self.assertEqual(response.data["total"]["count"], 1)
+
+    def test_price_filters_are_aggregated_live(self):
+        """Test that price filters fall back to a live aggregate."""
+        self._create("one", 2, "1000.00")
+        self._create("two", 2, "2000.00")
+        self._create("three", 2, "3000.00")
+
+        response = self.client.get(self.stats_url, {"price_min": "1500"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["source"], "live")
+        group = self._groups(response)[(2, True)]
+        self.assertEqual(group["count"], 2)
+        self.assertEqual(group["median_price"], "2500.00")
+
+    def test_update_moves_apartment_between_groups(self):
+        """Test that an update refreshes the old and the new group."""
+        apartment = self._create("one", 2, "1000.00")
+        self._create("two", 2, "3000.00")
+
+        apartment = Apartment.objects.get(pk=apartment.pk)
+        apartment.number_of_rooms = 4
+        with self.captureOnCommitCallbacks(execute=True):
+            apartment.save()
+
+        groups = self._groups(self.client.get(self.stats_url))
+        self.assertEqual(groups[(2, True)]["count"], 1)
+        self.assertEqual(groups[(2, True)]["avg_price"], "3000.00")
+        self.assertEqual(groups[(4, True)]["count"], 1)
+
+    def test_delete_removes_empty_group(self):
+        """Test that deleting the last apartment of a group drops its row."""
+        apartment = self._create("one", 2, "1000.00")
+        self._create("two", 3, "3000.00")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            apartment.delete()
+
+        self.assertEqual(
+            list(self._groups(self.client.get(self.stats_url))), [(3, True)]
+        )
+        self.assertFalse(ApartmentStats.objects.filter(number_of_rooms=2).exists())
+
+    def test_invalid_filter_is_rejected(self):
+        """Test that invalid filter values return 400."""
+        response = self.client.get(self.stats_url, {"number_of_rooms": "many"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_create_refreshes_stats(self):
+        """Test that the bulk endpoint, which sends no signals, refreshes stats."""
+        self.client.force_authenticate(self.owner)
+        rows = [
+            {
+                "name": f"Flat {index}",
+                "description": "Cozy place",
+                "number_of_rooms": 1,
+                "square": "20.00",
+                "price": "800.00",
+            }
+            for index in range(3)
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse("apartments-bulk"), rows, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        groups = self._groups(self.client.get(self.stats_url))
+        self.assertEqual(groups[(1, True)]["count"], 3)
+
+    def test_refresh_command_rebuilds_summary(self):
+        """Test that the management command recomputes every group."""
+        self._create("one", 2, "1000.00")
+        ApartmentStats.objects.all().delete()
+
+        call_command("refresh_apartment_stats", verbosity=0)
+
+        self.assertEqual(ApartmentStats.objects.get().count, 1)
+
+    def test_burst_of_writes_queues_one_refresh(self):
+        """Test that a queued group is not queued again before it refreshes."""
+        with self.captureOnCommitCallbacks() as callbacks:
+            stats.schedule_refresh([(2, True)])
+        cache.add(stats._pending_key((2, True)), True)
+        callbacks[0]()
+        self.assertFalse(ApartmentStats.objects.exists())
@@ -176,3 +176,13 @@ class ApartmentTests(APITestCase):
         response = self.client.delete(detail_url)
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertEqual(Apartment.objects.count(), 0)
+
+    def test_create_apartments_with_same_name(self):
+        """Test that apartments sharing a name get distinct slugs."""
+        for _ in range(2):
+            response = self.client.post(
+                self.apartment_list_url, self.apartment_data, format="json"
+            )
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        slugs = set(Apartment.objects.values_list("slug", flat=True))
+        self.assertEqual(len(slugs), 2)
@@ -0,0 +1,110 @@
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.apartments.models import Apartment
+from apps.users import authentication
+
+User = get_user_model()
+
+
+class CachedJWTAuthenticationTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.password = "pass1234"
+        cls.user = User.objects.create_user(
+            email="owner@example.com", password=cls.password, first_name="Olga"
+        )
+        cls.other = User.objects.create_user(
+            email="other@example.com", password=cls.password
+        )
+        cls.apartment = Apartment.objects.create(
+            owner=cls.user,
+            name="Sunny flat",
+            description="Bright",
+            number_of_rooms=2,
+            square=Decimal("40.00"),
+            price=Decimal("1200.00"),
+        )
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        authentication.clear_local_cache()
+        self.addCleanup(cache.clear)
+        self.addCleanup(authentication.clear_local_cache)
+
+    def _login(self, user):
+        response = self.client.post(
+            reverse("login"), {"email": user.email, "password": self.password}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def _user_queries(self, queries):
+        return [query for query in queries if 'FROM "users_user"' in query["sql"]]
+
+    def test_read_path_runs_no_user_queries(self):
+        """Test that authenticated reads never query the users table."""
+        self._login(self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("apartments-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._user_queries(queries), [])
+
+    def test_full_user_is_loaded_once_and_cached(self):
+        """Test that attributes outside the token load the user once."""
+        self._login(self.user)
+        with CaptureQueriesContext(connection) as queries:
+            first = self.client.get(reverse("me"))
+            second = self.client.get(reverse("me"))
+        self.assertEqual(first.data["first_name"], "Olga")
+        self.assertEqual(second.data["email"], self.user.email)
+        self.assertEqual(len(self._user_queries(queries)), 1)
+
+    def test_password_hash_is_not_cached(self):
+        """Test that the shared cache holds no password hash."""
+        user = authentication.get_cached_user(self.user.pk)
+        cached = cache.get(authentication._user_key(self.user.pk))
+        self.assertNotIn("password", cached)
+        self.assertNotIn(self.user.password, str(cached))
+        self.assertEqual(user.first_name, "Olga")
+        self.assertEqual(user.get_deferred_fields(), {"password"})
+        self.assertTrue(user.check_password(self.password))
+
+    def test_owner_permission_uses_token_user_id(self):
+        """Test that object permissions compare owners without loading users."""
+        url = reverse("apartments-detail", kwargs={"slug": self.apartment.slug})
+        self._login(self.other)
+        response = self.client.patch(url, {"name": "Taken"})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self._login(self.user)
+        response = self.client.patch(url, {"name": "Renamed"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["owner_email"], self.user.email)
+
+    def test_deactivated_user_is_rejected(self):
+        """Test that tokens of a deactivated user stop authenticating."""
+        self._login(self.user)
+        self.assertEqual(self.client.get(reverse("me")).status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        response = self.client.get(reverse("me"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_saved_user_is_reloaded(self):
+        """Test that saving a user drops its cached copy."""
+        self._login(self.user)
+        self.client.get(reverse("me"))
+        User.objects.filter(pk=self.user.pk).update(first_name="Changed")
+        self.user.refresh_from_db()
+        self.user.save()
+        self.assertEqual(self.client.get(reverse("me")).data["first_name"], "Changed")
@@ -0,0 +1,43 @@
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+
+from benchmarks import concurrency, runner
+
+
+class BenchmarkRunnerTests(TestCase):
+    def test_run_benchmarks_reports_every_scenario(self):
+        """Test that a small benchmark run succeeds and reports each scenario."""
+        dataset = runner.seed_dataset(2, 3, seed=1)
+        scenarios = ["list", "filter", "search", "retrieve", "login", "refresh"]
+        document = runner.run_benchmarks(dataset, scenarios, requests=3)
+
+        self.assertEqual(document["meta"]["apartments"], 6)
+        self.assertEqual(list(document["results"]), scenarios)
+        for result in document["results"].values():
+            self.assertEqual(result["errors"], 0)
+            self.assertGreater(result["queries"]["mean"], 0)
+        self.assertIn("retrieve", runner.format_results(document))
+        self.assertIn("+0.0%", runner.compare_results(document, document))
+
+
+class PercentileTests(SimpleTestCase):
+    def test_nearest_rank_percentile(self):
+        """Test the nearest-rank percentile used for latency reports."""
+        values = list(range(1, 101))
+        self.assertEqual(runner.percentile(values, 50), 50)
+        self.assertEqual(runner.percentile(values, 99), 99)
+        self.assertEqual(runner.percentile([7], 95), 7)
+        self.assertEqual(runner.percentile([], 50), 0.0)
+
+
+class ConcurrencyBenchmarkTests(TransactionTestCase):
+    def test_run_concurrency_compares_sync_and_async(self):
+        """Test that both endpoint modes are driven through the ASGI handler."""
+        dataset = runner.seed_dataset(1, 3, seed=1)
+        document = concurrency.run_concurrency(dataset, [1, 2], requests=4)
+
+        for endpoint in concurrency.ENDPOINTS:
+            for mode in concurrency.MODES:
+                for result in document["concurrency"][endpoint][mode].values():
+                    self.assertEqual(result["errors"], 0)
+                    self.assertGreater(result["req_per_s"], 0)
+        self.assertIn("async", concurrency.format_results(document))
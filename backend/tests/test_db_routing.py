@@ -0,0 +1,229 @@
+import time
+from decimal import Decimal
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connections
+from django.test import RequestFactory, SimpleTestCase, TransactionTestCase
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from apps.apartments import cache as apartment_cache
+from apps.apartments.models import Apartment
+from config import db_router
+
+User = get_user_model()
+
+# The primary stands in for the replica, so routed queries can run.
+REPLICA = "default"
+
+
+class ReplicaRouterTests(SimpleTestCase):
+    def test_reads_follow_the_block(self):
+        """Test that only reads inside `replica_reads` go to the replica."""
+        router = db_router.ReplicaRouter()
+        self.assertIsNone(router.db_for_read(Apartment))
+        with db_router.replica_reads("replica"):
+            self.assertEqual(router.db_for_read(Apartment), "replica")
+            self.assertEqual(router.db_for_write(Apartment), "default")
+        self.assertIsNone(router.db_for_read(Apartment))
+
+    @override_settings(DATABASE_REPLICAS=["replica"])
+    def test_replicas_are_not_migrated(self):
+        router = db_router.ReplicaRouter()
+        self.assertFalse(router.allow_migrate("replica", "apartments"))
+        self.assertIsNone(router.allow_migrate("default", "apartments"))
+
+    @override_settings(DATABASE_REPLICAS=["replica"])
+    def test_read_database(self):
+        """Test that unsafe and pinned reads use the primary."""
+        factory = RequestFactory()
+        self.assertEqual(db_router.read_database(factory.get("/")), "replica")
+        self.assertIsNone(db_router.read_database(factory.post("/")))
+        pinned = factory.get("/")
+        pinned.COOKIES[db_router.PIN_COOKIE] = "1"
+        self.assertIsNone(db_router.read_database(pinned))
+        with self.settings(DATABASE_REPLICAS=[]):
+            self.assertIsNone(db_router.read_database(factory.get("/")))
+
+    @override_settings(DATABASE_REPLICA_PIN_SECONDS=5)
+    def test_fresh_reads(self):
+        """Test that reads of recently modified data go to the primary."""
+        router = db_router.ReplicaRouter()
+        with db_router.replica_reads("replica"):
+            with db_router.fresh_reads(time.time()):
+                self.assertIsNone(router.db_for_read(Apartment))
+            with db_router.fresh_reads(time.time() - 60):
+                self.assertEqual(router.db_for_read(Apartment), "replica")
+            self.assertEqual(router.db_for_read(Apartment), "replica")
+
+
+@override_settings(DATABASE_REPLICAS=[REPLICA], DATABASE_REPLICA_PIN_SECONDS=5)
+class ReplicaRoutingViewTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.owner = User.objects.create_user(
+            email="owner@example.com", password="ownerpass"
+        )
+        cls.admin = User.objects.create_superuser(
+            email="admin@example.com", password="adminpass"
+        )
+        Apartment.objects.create(
+            owner=cls.owner,
+            slug="flat",
+            name="Flat",
+            description="Cozy place",
+            number_of_rooms=1,
+            square=Decimal("30.00"),
+            price=Decimal("500.00"),
+        )
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self._settle()
+
+    def _settle(self):
+        """Makes the last apartment change older than the pin window."""
+        cache.set(
+            apartment_cache.COLLECTION_MODIFIED_KEY,
+            int(time.time()) - 60,
+            timeout=None,
+        )
+
+    def _read_databases(self, url):
+        """
+        Returns the response to a GET of `url` and the databases its reads
+        were routed to (None for the primary).
+        """
+        databases = set()
+        db_for_read = db_router.ReplicaRouter.db_for_read
+
+        def spy(router, model, **hints):
+            database = db_for_read(router, model, **hints)
+            databases.add(database)
+            return database
+
+        with mock.patch.object(db_router.ReplicaRouter, "db_for_read", spy):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response, databases
+
+    def test_apartment_reads_use_the_replica(self):
+        """Test that the sync and async list and detail read from the replica."""
+        for name in ("apartments-list", "async-apartments-list"):
+            with self.subTest(name=name):
+                self.assertEqual(self._read_databases(reverse(name))[1], {REPLICA})
+        for name in ("apartments-detail", "async-apartments-detail"):
+            with self.subTest(name=name):
+                url = reverse(name, kwargs={"slug": "flat"})
+                self.assertEqual(self._read_databases(url)[1], {REPLICA})
+
+    def test_other_actions_use_the_primary(self):
+        """Test that actions outside `replica_actions` read from the primary."""
+        _, databases = self._read_databases(reverse("apartments-changes"))
+        self.assertEqual(databases, {None})
+
+    def test_admin_user_reads_use_the_replica(self):
+        self.client.force_authenticate(self.admin)
+        _, databases = self._read_databases(reverse("admin-users-list"))
+        self.assertEqual(databases, {REPLICA})
+
+    def test_writers_are_pinned_to_the_primary(self):
+        """Test that a client reads its own writes from the primary."""
+        self.client.force_authenticate(self.owner)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                reverse("apartments-detail", kwargs={"slug": "flat"}),
+                {"price": "650.00"},
+                format="json",
+            )
+        cookie = response.cookies[db_router.PIN_COOKIE]
+        self.assertEqual(cookie["max-age"], 5)
+
+        url = reverse("apartments-detail", kwargs={"slug": "flat"})
+        response, databases = self._read_databases(url)
+        self.assertEqual(databases, {None})
+        self.assertEqual(response.data["price"], "650.00")
+
+    def test_recent_changes_are_cached_from_the_primary(self):
+        """Test that no client caches responses built from a lagging replica."""
+        apartment_cache.bump_collection_version()
+        for name in ("apartments-list", "async-apartments-list"):
+            with self.subTest(name=name):
+                self.assertEqual(self._read_databases(reverse(name))[1], {None})
+        for name in ("apartments-detail", "async-apartments-detail"):
+            with self.subTest(name=name):
+                cache.clear()
+                apartment_cache.bump_collection_version()
+                url = reverse(name, kwargs={"slug": "flat"})
+                # Only the validator lookup runs before the cache is filled.
+                self.assertEqual(self._read_databases(url)[1], {REPLICA, None})
+        self._settle()
+        _, databases = self._read_databases(
+            reverse("apartments-list") + "?availability=true"
+        )
+        self.assertEqual(databases, {REPLICA})
+
+    def test_reads_set_no_pin(self):
+        response = self.client.get(reverse("apartments-list"))
+        self.assertNotIn(db_router.PIN_COOKIE, response.cookies)
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_nothing_is_routed_without_replicas(self):
+        self.client.force_authenticate(self.owner)
+        response = self.client.patch(
+            reverse("apartments-detail", kwargs={"slug": "flat"}),
+            {"price": "650.00"},
+            format="json",
+        )
+        self.assertNotIn(db_router.PIN_COOKIE, response.cookies)
+        self.assertEqual(self._read_databases(reverse("apartments-list"))[1], {None})
+
+
+@skipUnless("replica" in settings.DATABASES, "Needs DATABASE_REPLICA_URL")
+class ReplicaDatabaseTests(TransactionTestCase):
+    """
+    Runs against a real replica database, e.g. with
+    `DATABASE_URL=sqlite:////tmp/primary.sqlite3` and
+    `DATABASE_REPLICA_URL=sqlite:////tmp/primary.sqlite3` (the test database
+    of the replica mirrors the primary's).
+    """
+
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_list_queries_run_on_the_replica(self):
+        owner = User.objects.create_user(email="owner@example.com", password="x")
+        Apartment.objects.create(
+            owner=owner,
+            slug="flat",
+            name="Flat",
+            description="Cozy place",
+            number_of_rooms=1,
+            square=Decimal("30.00"),
+            price=Decimal("500.00"),
+        )
+        cache.set(
+            apartment_cache.COLLECTION_MODIFIED_KEY,
+            int(time.time()) - 60,
+            timeout=None,
+        )
+        with CaptureQueriesContext(connections["default"]) as primary:
+            with self.assertNumQueries(3, using="replica"):
+                response = self.client.get(reverse("apartments-list"))
+        self.assertEqual(response.data["count"], 1)
+        # Only the request transaction of ATOMIC_REQUESTS runs on the primary.
+        self.assertFalse(
+            [query for query in primary if query["sql"].startswith("SELECT")]
+        )
@@ -0,0 +1,79 @@
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.apartments.models import Apartment
+
+User = get_user_model()
+
+
+@override_settings(REQUEST_METRICS_SAMPLE_RATE=1.0, REQUEST_METRICS_LOG_INTERVAL=3600)
+class RequestInstrumentationTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        owner = User.objects.create_user(email="owner@example.com", password="pass")
+        cls.apartment = Apartment.objects.create(
+            owner=owner,
+            name="Sunny flat",
+            description="Bright",
+            number_of_rooms=2,
+            square=Decimal("40.00"),
+            price=Decimal("1200.00"),
+        )
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def _timings(self, response):
+        entries = {}
+        for entry in response["Server-Timing"].split(", "):
+            name, *params = entry.split(";")
+            entries[name] = dict(param.split("=", 1) for param in params)
+        return entries
+
+    def test_sampled_response_has_server_timing(self):
+        """Test that sampled responses report DB, serializer and total time."""
+        response = self.client.get(reverse("apartments-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        timings = self._timings(response)
+        self.assertEqual(set(timings), {"db", "cache", "serializer", "total"})
+        self.assertNotEqual(timings["db"]["desc"], '"0 queries"')
+        self.assertGreaterEqual(
+            float(timings["total"]["dur"]), float(timings["db"]["dur"])
+        )
+
+    def test_cached_response_skips_serializer(self):
+        """Test that a cache hit runs no serializer and fewer queries."""
+        url = reverse("apartments-detail", kwargs={"slug": self.apartment.slug})
+        first = self._timings(self.client.get(url))
+        second = self._timings(self.client.get(url))
+        self.assertIn("serializer", first)
+        self.assertNotIn("serializer", second)
+
+    @override_settings(REQUEST_METRICS_SAMPLE_RATE=0)
+    def test_unsampled_response_has_no_server_timing(self):
+        """Test that requests outside the sample are not instrumented."""
+        response = self.client.get(reverse("apartments-list"))
+        self.assertNotIn("Server-Timing", response)
+
+    @override_settings(REQUEST_METRICS_LOG_INTERVAL=0)
+    def test_metrics_are_logged_per_view(self):
+        """Test that aggregated metrics are logged with the view name."""
+        with self.assertLogs("config.instrumentation_middleware", "INFO") as logs:
+            self.client.get(reverse("apartments-list"))
+        self.assertIn("view=GET apartments-list count=1", logs.output[0])
+        self.assertIn("serializer_ms=", logs.output[0])
+
+    async def test_async_view_queries_are_counted(self):
+        """Test that queries run by async views in worker threads are counted."""
+        response = await self.async_client.get(reverse("async-apartments-list"))
+        timings = self._timings(response)
+        self.assertNotEqual(timings["db"]["desc"], '"0 queries"')
+        self.assertIn("serializer", timings)
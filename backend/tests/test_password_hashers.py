@@ -0,0 +1,77 @@
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+User = get_user_model()
+
+PASSWORD_HASHERS = [
+    "apps.users.hashers.TunedPBKDF2PasswordHasher",
+    "apps.users.hashers.TunedArgon2PasswordHasher",
+    "apps.users.hashers.TunedScryptPasswordHasher",
+    "django.contrib.auth.hashers.MD5PasswordHasher",
+]
+
+
+@override_settings(
+    PASSWORD_HASHERS=PASSWORD_HASHERS,
+    PASSWORD_PBKDF2_ITERATIONS=1000,
+    PASSWORD_ARGON2_TIME_COST=1,
+    PASSWORD_ARGON2_MEMORY_COST=1024,
+    PASSWORD_ARGON2_PARALLELISM=1,
+)
+class PasswordHashUpgradeTests(APITestCase):
+    password = "pass1234"
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def _create_user(self, hasher):
+        user = User.objects.create_user(email="user@example.com")
+        user.password = make_password(self.password, hasher=hasher)
+        user.save()
+        return user
+
+    def _login(self, user):
+        response = self.client.post(
+            reverse("login"), {"email": user.email, "password": self.password}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        user.refresh_from_db()
+        return user.password
+
+    def test_login_upgrades_hash_to_preferred_hasher(self):
+        """Test that logging in re-hashes a password with the preferred hasher."""
+        user = self._create_user("md5")
+        self.assertTrue(self._login(user).startswith("pbkdf2_sha256$1000$"))
+
+    def test_login_upgrades_hash_after_cost_change(self):
+        """Test that raising the configured cost re-hashes on the next login."""
+        user = self._create_user("pbkdf2_sha256")
+        with self.settings(PASSWORD_PBKDF2_ITERATIONS=2000):
+            self.assertTrue(self._login(user).startswith("pbkdf2_sha256$2000$"))
+
+    def test_tuned_argon2_parameters(self):
+        """Test that the Argon2 hasher encodes with the configured costs."""
+        encoded = make_password(self.password, hasher="argon2")
+        self.assertIn("$m=1024,t=1,p=1$", encoded)
+
+    def test_benchmark_command_reports_hashers(self):
+        """Test that the hasher benchmark reports each requested hasher."""
+        out = StringIO()
+        call_command(
+            "bench_password_hashers",
+            "--hashers=pbkdf2_sha256,md5",
+            "--duration=0.01",
+            "--processes=1",
+            stdout=out,
+        )
+        self.assertIn("iterations=1000", out.getvalue())
+        self.assertIn("md5", out.getvalue())
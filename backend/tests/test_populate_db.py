@@ -0,0 +1,50 @@
+from unittest import skipUnless
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+
+from apps.apartments.models import Apartment
+from populate_db import bulk_create_users_and_apartments
+
+User = get_user_model()
+
+
+class BulkSeedingTests(TestCase):
+    def test_bulk_seeding_creates_valid_rows(self):
+        """Test that bulk seeding creates users and valid apartments."""
+        stats = bulk_create_users_and_apartments(
+            4, 3, seed=7, chunk_size=5, use_copy=False, password="secret"
+        )
+
+        self.assertEqual((stats["users"], stats["apartments"]), (4, 12))
+        self.assertGreater(stats["rows_per_second"], 0)
+        self.assertEqual(User.objects.count(), 4)
+        self.assertEqual(Apartment.objects.values("slug").distinct().count(), 12)
+        user = User.objects.first()
+        self.assertTrue(user.check_password("secret"))
+        self.assertEqual(user.apartments.count(), 3)
+        for apartment in Apartment.objects.all():
+            apartment.full_clean()
+
+    def test_bulk_seeding_is_reproducible(self):
+        """Test that the same seed generates the same rows."""
+        bulk_create_users_and_apartments(2, 2, seed=3, use_copy=False)
+        first = list(User.objects.order_by("pk").values_list("first_name", flat=True))
+        User.objects.all().delete()
+
+        bulk_create_users_and_apartments(2, 2, seed=3, use_copy=False)
+        second = list(User.objects.order_by("pk").values_list("first_name", flat=True))
+        self.assertEqual(first, second)
+
+    @skipUnless(connection.vendor == "postgresql", "COPY needs PostgreSQL")
+    def test_bulk_seeding_with_copy(self):
+        """Test that COPY seeding creates rows with their search vectors."""
+        bulk_create_users_and_apartments(2, 3, use_copy=True)
+        self.assertEqual(Apartment.objects.count(), 6)
+        self.assertFalse(Apartment.objects.filter(search_vector=None).exists())
+
+    @skipUnless(connection.vendor != "postgresql", "Checks the non-PostgreSQL path")
+    def test_copy_requires_postgresql(self):
+        """Test that COPY seeding is refused on other databases."""
+        with self.assertRaises(ValueError):
+            bulk_create_users_and_apartments(1, 1, use_copy=True)
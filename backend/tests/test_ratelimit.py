@@ -0,0 +1,197 @@
+from importlib.util import find_spec
+from unittest import mock, skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.users import ratelimit
+
+User = get_user_model()
+
+
+@override_settings(
+    AUTH_RATE_LIMITS={
+        "login_ip": (3, 60),
+        "login_email": (2, 60),
+        "refresh_ip": (2, 60),
+    }
+)
+class LoginRateLimitTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.password = "pass1234"
+        cls.user = User.objects.create_user(
+            email="user@example.com", password=cls.password
+        )
+        cls.admin = User.objects.create_user(
+            email="admin@example.com", password=cls.password, is_staff=True
+        )
+        cls.login_url = reverse("login")
+        cls.lockout_url = reverse("login-lockout")
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def _login(self, email, password, ip="10.0.0.1", **extra):
+        return self.client.post(
+            self.login_url,
+            {"email": email, "password": password},
+            REMOTE_ADDR=ip,
+            **extra,
+        )
+
+    def test_email_is_locked_after_failures(self):
+        """Test that an email is locked out before the password is checked."""
+        for _ in range(2):
+            response = self._login("User@example.com", "wrong")
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        with mock.patch("apps.users.api.views_auth.authenticate") as authenticate:
+            response = self._login(self.user.email, self.password, ip="10.0.0.2")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertGreater(int(response["Retry-After"]), 0)
+        authenticate.assert_not_called()
+
+    def test_ip_is_locked_after_failures(self):
+        """Test that an IP is locked out after failures across emails."""
+        for i in range(3):
+            self._login(f"nobody{i}@example.com", "wrong")
+        response = self._login(self.user.email, self.password)
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        response = self._login(self.user.email, self.password, ip="10.0.0.2")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_forwarded_for_header_does_not_change_the_ip(self):
+        """Test that rotating X-Forwarded-For does not evade the IP limit."""
+        for i in range(3):
+            self._login(
+                f"nobody{i}@example.com", "wrong", HTTP_X_FORWARDED_FOR=f"192.0.2.{i}"
+            )
+        response = self._login(
+            self.user.email, self.password, HTTP_X_FORWARDED_FOR="192.0.2.9"
+        )
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_token_endpoint_shares_the_login_limits(self):
+        """Test that the token pair endpoint counts and honours login failures."""
+        url = reverse("token_obtain_pair")
+        data = {"email": self.user.email, "password": "wrong"}
+        self.assertEqual(self.client.post(url, data).status_code, 401)
+        self._login(self.user.email, "wrong")
+        with mock.patch("rest_framework_simplejwt.serializers.authenticate") as authenticate:
+            response = self.client.post(url, {**data, "password": self.password})
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        authenticate.assert_not_called()
+
+    def test_token_endpoint_success_is_refunded(self):
+        url = reverse("token_obtain_pair")
+        data = {"email": self.user.email, "password": self.password}
+        for _ in range(4):
+            self.assertEqual(self.client.post(url, data).status_code, 200)
+
+    def test_token_refresh_endpoint_is_limited_per_ip(self):
+        url = reverse("token_refresh")
+        for _ in range(2):
+            response = self.client.post(url, {"refresh": "invalid"})
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.post(url, {"refresh": "invalid"})
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_successful_login_resets_email_failures(self):
+        """Test that logging in clears the email's failure count."""
+        self._login(self.user.email, "wrong")
+        self.assertEqual(self._login(self.user.email, self.password).status_code, 200)
+        self._login(self.user.email, "wrong")
+        self.assertEqual(self._login(self.user.email, self.password).status_code, 200)
+
+    def test_parallel_attempts_are_limited_before_hashing(self):
+        """Test that attempts arriving while passwords are hashed are counted."""
+        statuses = []
+
+        def authenticate(request, **credentials):
+            # Another attempt for the email arrives while this one is hashed.
+            if hashed.call_count < 4:
+                statuses.append(self._login(self.user.email, "wrong").status_code)
+            return None
+
+        with mock.patch(
+            "apps.users.api.views_auth.authenticate", side_effect=authenticate
+        ) as hashed:
+            response = self._login(self.user.email, "wrong")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(hashed.call_count, 2)
+        self.assertEqual(statuses, [429, 401])
+
+    def test_refresh_is_limited_per_ip(self):
+        """Test that refresh attempts are limited per IP."""
+        self._login(self.user.email, self.password)
+        for _ in range(2):
+            response = self.client.post(reverse("refresh"), REMOTE_ADDR="10.0.0.1")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.post(reverse("refresh"), REMOTE_ADDR="10.0.0.1")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_admin_can_inspect_and_clear_lockout(self):
+        """Test that administrators can see and clear a lockout."""
+        for _ in range(2):
+            self._login(self.user.email, "wrong")
+        self.client.force_authenticate(self.admin)
+
+        response = self.client.get(self.lockout_url, {"email": self.user.email})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]["scope"], "login_email")
+        self.assertTrue(response.data[0]["locked"])
+
+        response = self.client.delete(
+            self.lockout_url + f"?email={self.user.email}&ip=10.0.0.1"
+        )
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.client.force_authenticate(None)
+        self.assertEqual(self._login(self.user.email, self.password).status_code, 200)
+
+    def test_lockout_requires_admin(self):
+        """Test that regular users cannot see lockouts."""
+        self.client.force_authenticate(self.user)
+        response = self.client.get(self.lockout_url, {"email": self.user.email})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+@skipUnless(find_spec("fakeredis") and find_spec("lupa"), "Needs fakeredis[lua]")
+class RedisLoginRateLimitTests(LoginRateLimitTests):
+    """
+    Runs the login rate limit tests through the Lua sliding-window script, on
+    an in-process Redis server.
+    """
+
+    def setUp(self):
+        super().setUp()
+        import fakeredis
+
+        connection = fakeredis.FakeRedis()
+        for patcher in (
+            mock.patch.object(ratelimit, "_uses_redis", return_value=True),
+            mock.patch.object(ratelimit, "_script", None),
+            mock.patch("django_redis.get_redis_connection", return_value=connection),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_attempts_run_the_script(self):
+        """Test that attempts are recorded in the Redis sorted sets."""
+        with mock.patch.object(
+            ratelimit, "_run_cache", side_effect=AssertionError
+        ), mock.patch.object(
+            ratelimit, "_run_redis", wraps=ratelimit._run_redis
+        ) as run:
+            self._login(self.user.email, "wrong")
+        run.assert_called_once()
+        connection = ratelimit._script.registered_client
+        key = ratelimit.Limit("login_email").key(self.user.email)
+        self.assertEqual(connection.zcard(key), 1)
@@ -0,0 +1,83 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.users.authentication import clear_local_cache
+
+User = get_user_model()
+
+
+class RefreshTokenRotationTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.password = "pass1234"
+        cls.user = User.objects.create_user(
+            email="user@example.com", password=cls.password
+        )
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        clear_local_cache()
+        self.addCleanup(cache.clear)
+        response = self.client.post(
+            reverse("login"), {"email": self.user.email, "password": self.password}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.refresh_token = response.cookies["refresh_token"].value
+
+    def _refresh(self, refresh_token):
+        self.client.cookies["refresh_token"] = refresh_token
+        return self.client.post(reverse("refresh"))
+
+    def test_refresh_rotates_refresh_token(self):
+        """Test that refreshing sets a new access and refresh token."""
+        response = self._refresh(self.refresh_token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("access_token", response.cookies)
+        rotated = response.cookies["refresh_token"].value
+        self.assertNotEqual(rotated, self.refresh_token)
+
+        response = self._refresh(rotated)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_used_refresh_token_is_rejected(self):
+        """Test that a refresh token cannot be used twice."""
+        self.assertEqual(
+            self._refresh(self.refresh_token).status_code, status.HTTP_200_OK
+        )
+        response = self._refresh(self.refresh_token)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_logout_revokes_tokens(self):
+        """Test that logging out revokes the refresh and access tokens."""
+        access_token = self.client.cookies["access_token"].value
+        response = self.client.post(reverse("logout"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self._refresh(self.refresh_token)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.cookies["access_token"] = access_token
+        response = self.client.get(reverse("me"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_token_refresh_endpoint_rotates(self):
+        """Test that the token refresh API also rotates and rejects reuse."""
+        url = reverse("token_refresh")
+        response = self.client.post(url, {"refresh": self.refresh_token})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("refresh", response.data)
+
+        response = self.client.post(url, {"refresh": self.refresh_token})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_inactive_user_cannot_refresh(self):
+        """Test that deactivated users cannot refresh their tokens."""
+        self.user.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        response = self._refresh(self.refresh_token)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)